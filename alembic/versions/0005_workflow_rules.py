@@ -0,0 +1,38 @@
+"""add workflow rules
+
+Revision ID: 0005_workflow_rules
+Revises: 0004_template_fields
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_workflow_rules"
+down_revision = "0004_template_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workflow_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="100"),
+        sa.Column("enabled", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("stop_processing", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("conditions", sa.JSON(), nullable=False),
+        sa.Column("actions", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_workflow_rules_id", "workflow_rules", ["id"])
+    op.create_index("ix_workflow_rules_company_id", "workflow_rules", ["company_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_workflow_rules_company_id", table_name="workflow_rules")
+    op.drop_index("ix_workflow_rules_id", table_name="workflow_rules")
+    op.drop_table("workflow_rules")
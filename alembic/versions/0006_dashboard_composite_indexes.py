@@ -0,0 +1,47 @@
+"""add composite indexes for dashboard and list queries
+
+Revision ID: 0006_dashboard_composite_indexes
+Revises: 0005_workflow_rules
+Create Date: 2026-10-19 00:00:01.000000
+"""
+
+from alembic import op
+
+revision = "0006_dashboard_composite_indexes"
+down_revision = "0005_workflow_rules"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_leads_company_id_created_at", "leads", ["company_id", "created_at"]),
+    ("ix_leads_company_id_status_created_at", "leads", ["company_id", "status", "created_at"]),
+    ("ix_email_messages_company_id_received_at", "email_messages", ["company_id", "received_at"]),
+    ("ix_email_messages_lead_id_received_at", "email_messages", ["lead_id", "received_at"]),
+    (
+        "ix_email_replies_email_id_send_status_created_at",
+        "email_replies",
+        ["email_id", "send_status", "created_at"],
+    ),
+    ("ix_activity_logs_company_id_created_at", "activity_logs", ["company_id", "created_at"]),
+    (
+        "ix_auto_reply_templates_company_id_trigger_type_created_at",
+        "auto_reply_templates",
+        ["company_id", "trigger_type", "created_at"],
+    ),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Build without blocking writes on large tables; CONCURRENTLY cannot run in a transaction.
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+        return
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
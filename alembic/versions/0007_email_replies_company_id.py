@@ -0,0 +1,58 @@
+"""denormalize company_id onto email_replies
+
+Revision ID: 0007_email_replies_company_id
+Revises: 0006_dashboard_composite_indexes
+Create Date: 2026-10-19 00:00:02.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_email_replies_company_id"
+down_revision = "0006_dashboard_composite_indexes"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_email_replies_company_id_send_status_created_at"
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("email_replies") as batch_op:
+        batch_op.add_column(sa.Column("company_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_email_replies_company_id", "companies", ["company_id"], ["id"]
+        )
+
+    # Backfill in id ranges so a large table is not rewritten in one long transaction.
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text("SELECT MAX(id) FROM email_replies")).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+        bind.execute(
+            sa.text(
+                """
+                UPDATE email_replies
+                SET company_id = (
+                    SELECT email_messages.company_id
+                    FROM email_messages
+                    WHERE email_messages.id = email_replies.email_id
+                )
+                WHERE company_id IS NULL AND id >= :start AND id < :stop
+                """
+            ),
+            {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+        )
+
+    columns = ["company_id", "send_status", "created_at"]
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(INDEX_NAME, "email_replies", columns, postgresql_concurrently=True)
+    else:
+        op.create_index(INDEX_NAME, "email_replies", columns)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="email_replies")
+    with op.batch_alter_table("email_replies") as batch_op:
+        batch_op.drop_constraint("fk_email_replies_company_id", type_="foreignkey")
+        batch_op.drop_column("company_id")
@@ -0,0 +1,33 @@
+"""add daily company stats rollup
+
+Revision ID: 0008_daily_company_stats
+Revises: 0007_email_replies_company_id
+Create Date: 2026-10-19 00:00:00.000000
+
+The table starts empty; run ``app.tasks.rebuild_daily_stats_task`` once after
+upgrading to backfill it from the raw tables.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_daily_company_stats"
+down_revision = "0007_email_replies_company_id"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_company_stats",
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("metric", sa.String(), nullable=False),
+        sa.Column("dimension", sa.String(), nullable=False, server_default=""),
+        sa.Column("value", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("company_id", "day", "metric", "dimension"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_company_stats")
@@ -0,0 +1,136 @@
+"""partition activity logs by month on postgres
+
+Revision ID: 0009_partition_activity_logs
+Revises: 0008_daily_company_stats
+Create Date: 2026-10-19 00:00:00.000000
+
+Postgres only: ``activity_logs`` becomes a table range-partitioned on
+``created_at`` with one partition per month (``activity_logs_yYYYYmMM``) plus a
+default partition. Existing rows are copied into the new layout. SQLite keeps
+the single table and archives by ``created_at`` range instead.
+"""
+
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_partition_activity_logs"
+down_revision = "0008_daily_company_stats"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, action, entity_type, entity_id, description, user_id, company_id, created_at"
+PARTITIONS_AHEAD = 2
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitioned_table() -> None:
+    op.execute(
+        """
+        CREATE TABLE activity_logs (
+            id INTEGER NOT NULL DEFAULT nextval('activity_logs_id_seq'),
+            action VARCHAR NOT NULL,
+            entity_type VARCHAR NOT NULL,
+            entity_id INTEGER,
+            description TEXT,
+            user_id INTEGER REFERENCES users (id),
+            company_id INTEGER NOT NULL REFERENCES companies (id),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE INDEX ix_activity_logs_id ON activity_logs (id)")
+    op.execute(
+        "CREATE INDEX ix_activity_logs_company_id_created_at "
+        "ON activity_logs (company_id, created_at)"
+    )
+    op.execute("CREATE TABLE activity_logs_default PARTITION OF activity_logs DEFAULT")
+
+
+def _create_month_partitions(first: date, last: date) -> None:
+    month = first
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE activity_logs_y{month.year:04d}m{month.month:02d} "
+            f"PARTITION OF activity_logs FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    today = datetime.utcnow().date()
+    current_month = date(today.year, today.month, 1)
+    if not sa.inspect(bind).has_table("activity_logs"):
+        op.execute("CREATE SEQUENCE activity_logs_id_seq")
+        _create_partitioned_table()
+        _create_month_partitions(current_month, _add_months(current_month, PARTITIONS_AHEAD))
+        op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY activity_logs.id")
+        return
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM activity_logs")).scalar()
+    first_month = date(oldest.year, oldest.month, 1) if oldest else current_month
+    op.execute("ALTER TABLE activity_logs RENAME TO activity_logs_legacy")
+    op.execute(
+        "ALTER TABLE activity_logs_legacy "
+        "RENAME CONSTRAINT activity_logs_pkey TO activity_logs_legacy_pkey"
+    )
+    op.execute("ALTER INDEX IF EXISTS ix_activity_logs_id RENAME TO ix_activity_logs_legacy_id")
+    op.execute(
+        "ALTER INDEX IF EXISTS ix_activity_logs_company_id_created_at "
+        "RENAME TO ix_activity_logs_legacy_company_id_created_at"
+    )
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY NONE")
+    _create_partitioned_table()
+    _create_month_partitions(
+        min(first_month, current_month), _add_months(current_month, PARTITIONS_AHEAD)
+    )
+    op.execute(f"INSERT INTO activity_logs ({COLUMNS}) SELECT {COLUMNS} FROM activity_logs_legacy")
+    op.execute("DROP TABLE activity_logs_legacy")
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY activity_logs.id")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE activity_logs RENAME TO activity_logs_partitioned")
+    op.execute("ALTER INDEX ix_activity_logs_id RENAME TO ix_activity_logs_partitioned_id")
+    op.execute(
+        "ALTER INDEX ix_activity_logs_company_id_created_at "
+        "RENAME TO ix_activity_logs_partitioned_company_id_created_at"
+    )
+    op.create_table(
+        "activity_logs",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            primary_key=True,
+            server_default=sa.text("nextval('activity_logs_id_seq')"),
+        ),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_activity_logs_id", "activity_logs", ["id"])
+    op.create_index(
+        "ix_activity_logs_company_id_created_at", "activity_logs", ["company_id", "created_at"]
+    )
+    op.execute(
+        f"INSERT INTO activity_logs ({COLUMNS}) SELECT {COLUMNS} FROM activity_logs_partitioned"
+    )
+    op.execute("DROP TABLE activity_logs_partitioned")
+    op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY activity_logs.id")
@@ -0,0 +1,75 @@
+"""add full-text search index for leads
+
+Revision ID: 0010_lead_search_index
+Revises: 0009_partition_activity_logs
+Create Date: 2026-10-19 00:00:00.000000
+
+PostgreSQL gets a generated, weighted ``search_vector`` column and a GIN index;
+SQLite gets an external-content FTS5 table kept in sync by triggers. Both match
+the objects ``app/models/lead.py`` creates on fresh databases.
+"""
+
+from alembic import op
+
+revision = "0010_lead_search_index"
+down_revision = "0009_partition_activity_logs"
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = "name, email, phone, message, tags, conversation_summary, company_id"
+NEW_VALUES = ", ".join(f"new.{name.strip()}" for name in SEARCH_COLUMNS.split(","))
+OLD_VALUES = ", ".join(f"old.{name.strip()}" for name in SEARCH_COLUMNS.split(","))
+
+POSTGRES_SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(email, '') || ' '
+        || translate(coalesce(email, ''), '@.', '  ')), 'A')
+    || setweight(to_tsvector('simple', coalesce(tags, '') || ' ' || coalesce(phone, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(message, '')), 'C')
+    || setweight(to_tsvector('simple', coalesce(conversation_summary, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Adding a stored generated column rewrites ``leads`` once; the index build does not block.
+        op.execute(
+            "ALTER TABLE leads ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({POSTGRES_SEARCH_VECTOR}) STORED"
+        )
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_leads_search_vector "
+                "ON leads USING gin (search_vector)"
+            )
+        return
+    op.execute(
+        f"CREATE VIRTUAL TABLE leads_fts USING fts5({SEARCH_COLUMNS}, "
+        "content='leads', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER leads_fts_ai AFTER INSERT ON leads BEGIN "
+        f"INSERT INTO leads_fts(rowid, {SEARCH_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+    )
+    op.execute(
+        "CREATE TRIGGER leads_fts_ad AFTER DELETE ON leads BEGIN "
+        f"INSERT INTO leads_fts(leads_fts, rowid, {SEARCH_COLUMNS}) "
+        f"VALUES ('delete', old.id, {OLD_VALUES}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER leads_fts_au AFTER UPDATE OF {SEARCH_COLUMNS} ON leads BEGIN "
+        f"INSERT INTO leads_fts(leads_fts, rowid, {SEARCH_COLUMNS}) "
+        f"VALUES ('delete', old.id, {OLD_VALUES}); "
+        f"INSERT INTO leads_fts(rowid, {SEARCH_COLUMNS}) VALUES (new.id, {NEW_VALUES}); END"
+    )
+    op.execute("INSERT INTO leads_fts(leads_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_leads_search_vector")
+        op.execute("ALTER TABLE leads DROP COLUMN IF EXISTS search_vector")
+        return
+    for trigger in ("leads_fts_ai", "leads_fts_ad", "leads_fts_au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS leads_fts")
@@ -0,0 +1,137 @@
+"""add stored classification and full-text search index for emails
+
+Revision ID: 0011_email_search_index
+Revises: 0010_lead_search_index
+Create Date: 2026-10-19 00:00:00.000000
+
+``email_messages`` gains ``category`` and ``priority`` (set by ``receive_email``
+from now on, backfilled here) with per-company indexes for inbox filters.
+PostgreSQL gets a generated, weighted ``search_vector`` column and a GIN index;
+SQLite gets an external-content FTS5 table kept in sync by triggers.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.email_analysis_service import classify_category, classify_priority
+
+revision = "0011_email_search_index"
+down_revision = "0010_lead_search_index"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+INDEXES = [
+    (
+        "ix_email_messages_company_id_category_received_at",
+        ["company_id", "category", "received_at"],
+    ),
+    (
+        "ix_email_messages_company_id_priority_received_at",
+        ["company_id", "priority", "received_at"],
+    ),
+]
+SEARCH_COLUMNS = "subject, body, from_email, company_id"
+NEW_VALUES = ", ".join(f"new.{name.strip()}" for name in SEARCH_COLUMNS.split(","))
+OLD_VALUES = ", ".join(f"old.{name.strip()}" for name in SEARCH_COLUMNS.split(","))
+
+POSTGRES_SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(subject, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(from_email, '') || ' '
+        || translate(coalesce(from_email, ''), '@.', '  ')), 'A')
+    || setweight(to_tsvector('simple', left(coalesce(body, ''), 100000)), 'B')
+"""
+
+
+def _backfill_classification(bind) -> None:
+    # Classification rules live in Python, so rows are classified in id-ordered batches.
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, subject, body FROM email_messages "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            sa.text(
+                "UPDATE email_messages SET category = :category, priority = :priority "
+                "WHERE id = :id"
+            ),
+            [
+                {
+                    "id": row.id,
+                    "category": classify_category(row.subject, row.body)[0],
+                    "priority": classify_priority(row.subject, row.body),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("email_messages") as batch_op:
+        batch_op.add_column(sa.Column("category", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("priority", sa.String(), nullable=True))
+    bind = op.get_bind()
+    _backfill_classification(bind)
+
+    if bind.dialect.name == "postgresql":
+        # Adding a stored generated column rewrites the table once; index builds do not block.
+        op.execute(
+            "ALTER TABLE email_messages ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({POSTGRES_SEARCH_VECTOR}) STORED"
+        )
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, "email_messages", columns, postgresql_concurrently=True)
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_email_messages_search_vector "
+                "ON email_messages USING gin (search_vector)"
+            )
+        return
+
+    for name, columns in INDEXES:
+        op.create_index(name, "email_messages", columns)
+    op.execute(
+        f"CREATE VIRTUAL TABLE email_messages_fts USING fts5({SEARCH_COLUMNS}, "
+        "content='email_messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER email_messages_fts_ai AFTER INSERT ON email_messages BEGIN "
+        f"INSERT INTO email_messages_fts(rowid, {SEARCH_COLUMNS}) "
+        f"VALUES (new.id, {NEW_VALUES}); END"
+    )
+    op.execute(
+        "CREATE TRIGGER email_messages_fts_ad AFTER DELETE ON email_messages BEGIN "
+        f"INSERT INTO email_messages_fts(email_messages_fts, rowid, {SEARCH_COLUMNS}) "
+        f"VALUES ('delete', old.id, {OLD_VALUES}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER email_messages_fts_au AFTER UPDATE OF {SEARCH_COLUMNS} "
+        "ON email_messages BEGIN "
+        f"INSERT INTO email_messages_fts(email_messages_fts, rowid, {SEARCH_COLUMNS}) "
+        f"VALUES ('delete', old.id, {OLD_VALUES}); "
+        f"INSERT INTO email_messages_fts(rowid, {SEARCH_COLUMNS}) "
+        f"VALUES (new.id, {NEW_VALUES}); END"
+    )
+    op.execute("INSERT INTO email_messages_fts(email_messages_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_email_messages_search_vector")
+        op.execute("ALTER TABLE email_messages DROP COLUMN IF EXISTS search_vector")
+    else:
+        for trigger in ("email_messages_fts_ai", "email_messages_fts_ad", "email_messages_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS email_messages_fts")
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="email_messages")
+    with op.batch_alter_table("email_messages") as batch_op:
+        batch_op.drop_column("priority")
+        batch_op.drop_column("category")
@@ -0,0 +1,76 @@
+"""add normalized lead_tags table
+
+Revision ID: 0012_lead_tags
+Revises: 0011_email_search_index
+Create Date: 2026-10-19 00:00:00.000000
+
+Backfilled from the comma-joined ``leads.tags`` column, which stays as the
+display value.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_lead_tags"
+down_revision = "0011_email_search_index"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+INDEX_NAME = "ix_lead_tags_company_id_tag_lead_created_at"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lead_tags",
+        sa.Column(
+            "lead_id",
+            sa.Integer(),
+            sa.ForeignKey("leads.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("tag", sa.String(), nullable=False),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=True),
+        sa.Column("lead_created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("lead_id", "tag"),
+    )
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, company_id, created_at, tags FROM leads "
+                "WHERE id > :last_id AND tags IS NOT NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        tag_rows = [
+            {
+                "lead_id": row.id,
+                "tag": tag,
+                "company_id": row.company_id,
+                "lead_created_at": row.created_at,
+            }
+            for row in rows
+            for tag in dict.fromkeys(part.strip().lower() for part in row.tags.split(","))
+            if tag
+        ]
+        if tag_rows:
+            bind.execute(
+                sa.text(
+                    "INSERT INTO lead_tags (lead_id, tag, company_id, lead_created_at) "
+                    "VALUES (:lead_id, :tag, :company_id, :lead_created_at)"
+                ),
+                tag_rows,
+            )
+        last_id = rows[-1].id
+
+    op.create_index(INDEX_NAME, "lead_tags", ["company_id", "tag", "lead_created_at", "lead_id"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="lead_tags")
+    op.drop_table("lead_tags")
@@ -0,0 +1,55 @@
+"""store company api key prefix and hash
+
+Revision ID: 0013_company_api_key_hash
+Revises: 0012_lead_tags
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013_company_api_key_hash"
+down_revision = "0012_lead_tags"
+branch_labels = None
+depends_on = None
+
+PREFIX_LENGTH = 8
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("companies") as batch_op:
+        batch_op.add_column(sa.Column("api_key_prefix", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("api_key_hash", sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, api_key FROM companies")).all()
+    if rows:
+        bind.execute(
+            sa.text(
+                "UPDATE companies SET api_key_prefix = :prefix, api_key_hash = :hash WHERE id = :id"
+            ),
+            [
+                {
+                    "id": row.id,
+                    "prefix": row.api_key[:PREFIX_LENGTH],
+                    "hash": hashlib.sha256(row.api_key.encode()).hexdigest(),
+                }
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table("companies") as batch_op:
+        batch_op.alter_column("api_key_prefix", existing_type=sa.String(), nullable=False)
+        batch_op.alter_column("api_key_hash", existing_type=sa.String(), nullable=False)
+        batch_op.create_index("ix_companies_api_key_prefix", ["api_key_prefix"])
+        batch_op.create_unique_constraint("uq_companies_api_key_hash", ["api_key_hash"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("companies") as batch_op:
+        batch_op.drop_constraint("uq_companies_api_key_hash", type_="unique")
+        batch_op.drop_index("ix_companies_api_key_prefix")
+        batch_op.drop_column("api_key_hash")
+        batch_op.drop_column("api_key_prefix")
@@ -0,0 +1,29 @@
+"""add (company_id, email) index on leads for inbound email matching
+
+Revision ID: 0014_leads_company_email_index
+Revises: 0013_company_api_key_hash
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "0014_leads_company_email_index"
+down_revision = "0013_company_api_key_hash"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_leads_company_id_email"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME, "leads", ["company_id", "email"], postgresql_concurrently=True
+            )
+        return
+    op.create_index(INDEX_NAME, "leads", ["company_id", "email"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="leads")
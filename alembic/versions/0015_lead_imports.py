@@ -0,0 +1,47 @@
+"""add lead_imports table for resumable bulk lead imports
+
+Revision ID: 0015_lead_imports
+Revises: 0014_leads_company_email_index
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015_lead_imports"
+down_revision = "0014_leads_company_email_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lead_imports",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("file_format", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("bytes_processed", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("rows_processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("duplicate_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_lead_imports_id", "lead_imports", ["id"])
+    op.create_index(
+        "ix_lead_imports_company_id_created_at", "lead_imports", ["company_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lead_imports_company_id_created_at", table_name="lead_imports")
+    op.drop_index("ix_lead_imports_id", table_name="lead_imports")
+    op.drop_table("lead_imports")
@@ -0,0 +1,68 @@
+"""store workflow route targets on emails and drop token-less rule keywords
+
+Revision ID: 0016_email_routing
+Revises: 0015_lead_imports
+Create Date: 2026-10-19 00:00:00.000000
+
+``email_messages`` gains ``routed_to``, set from a matching rule's ``route_to``
+action, with a per-company index for routed inbox views.
+
+Rule keywords are now rejected unless they contain a letter or digit. Stored
+rules never matched on such keywords, so they are dropped here; a rule left
+with only such keywords never matched anything and is disabled instead of
+turning into a match-all rule.
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.schemas.workflow_rule import TOKEN_PATTERN
+
+revision = "0016_email_routing"
+down_revision = "0015_lead_imports"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_email_messages_company_id_routed_to_received_at"
+INDEX_COLUMNS = ["company_id", "routed_to", "received_at"]
+
+
+def _clean_rule_keywords(bind) -> None:
+    rules = sa.table(
+        "workflow_rules",
+        sa.column("id", sa.Integer()),
+        sa.column("enabled", sa.Boolean()),
+        sa.column("conditions", sa.JSON()),
+    )
+    for rule_id, conditions in bind.execute(sa.select(rules.c.id, rules.c.conditions)).all():
+        if isinstance(conditions, str):
+            conditions = json.loads(conditions)
+        keywords = (conditions or {}).get("keywords") or []
+        kept = [keyword for keyword in keywords if TOKEN_PATTERN.search(keyword.lower())]
+        if len(kept) == len(keywords):
+            continue
+        values = {"conditions": {**conditions, "keywords": kept}}
+        if not kept:
+            values["enabled"] = False
+        bind.execute(sa.update(rules).where(rules.c.id == rule_id).values(**values))
+
+
+def upgrade() -> None:
+    op.add_column("email_messages", sa.Column("routed_to", sa.String(), nullable=True))
+    bind = op.get_bind()
+    _clean_rule_keywords(bind)
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME, "email_messages", INDEX_COLUMNS, postgresql_concurrently=True
+            )
+        return
+    op.create_index(INDEX_NAME, "email_messages", INDEX_COLUMNS)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="email_messages")
+    # A plain DROP COLUMN: a batch rebuild would drop the SQLite full-text triggers.
+    op.drop_column("email_messages", "routed_to")
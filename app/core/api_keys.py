@@ -0,0 +1,82 @@
+"""Company API keys: hashed lookup and a bounded cache of resolved companies.
+
+Keys are looked up by ``api_key_prefix`` (indexed) and confirmed against the
+SHA-256 ``api_key_hash`` in constant time; keys are random, so an unsalted fast
+hash is sufficient. Resolved companies are cached in an LRU keyed by the hash,
+so ``/public/lead`` and ``/webhook/email`` skip the auth query on a hit.
+Rotating a key bumps a shared version stamp, which with ``CACHE_BACKEND=redis``
+invalidates the old key in every worker at once.
+"""
+
+import hashlib
+import hmac
+import secrets
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, VersionStamps
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.company import Company
+
+PREFIX_LENGTH = 8
+VERSION_KEY = "companies"
+
+cache_requests = registry.counter(
+    "api_key_cache_requests_total", "Company API key lookups by result"
+)
+
+
+@dataclass(frozen=True)
+class ApiKeyCompany:
+    id: int
+    name: str
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def issue_api_key(company: Company) -> str:
+    """Give ``company`` a fresh key, storing its prefix and hash alongside it."""
+    api_key = secrets.token_urlsafe(24)
+    company.api_key = api_key
+    company.api_key_prefix = api_key[:PREFIX_LENGTH]
+    company.api_key_hash = hash_api_key(api_key)
+    return api_key
+
+
+_companies = TTLCache(
+    maxsize=settings.api_key_cache_max_entries,
+    ttl=settings.api_key_cache_ttl_seconds,
+)
+_versions = VersionStamps("api_key_version")
+
+
+def resolve_api_key(db: Session, api_key: str) -> ApiKeyCompany | None:
+    key_hash = hash_api_key(api_key)
+    # Rotations are rare, so one stamp covers every key; reading it before the
+    # query means a rotation that races this lookup can never be cached over.
+    version = _versions.current(VERSION_KEY)
+    entry = _companies.get(key_hash)
+    if entry is not None and version is not None and entry[0] == version:
+        cache_requests.inc(result="hit")
+        return entry[1]
+    cache_requests.inc(result="miss")
+    candidates = (
+        db.query(Company.id, Company.name, Company.api_key_hash)
+        .filter(Company.api_key_prefix == api_key[:PREFIX_LENGTH])
+        .all()
+    )
+    for company_id, name, stored_hash in candidates:
+        if hmac.compare_digest(stored_hash, key_hash):
+            company = ApiKeyCompany(id=company_id, name=name)
+            if version is not None:
+                _companies.set(key_hash, (version, company))
+            return company
+    return None
+
+
+def invalidate_api_keys() -> None:
+    _versions.bump(VERSION_KEY)
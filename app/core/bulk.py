@@ -0,0 +1,26 @@
+"""Multi-row ``INSERT ... RETURNING`` for ORM models."""
+
+from typing import Any, TypeVar
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+ModelT = TypeVar("ModelT")
+
+
+def insert_returning(db: Session, model: type[ModelT], rows: list[dict[str, Any]]) -> list[ModelT]:
+    """Insert ``rows`` in as few statements as the driver allows, returned in row order.
+
+    Every row must have the same keys; ``None`` values are sent as NULL rather than
+    splitting the batch by key set.
+    """
+    if not rows:
+        return []
+    options = {"render_nulls": True}
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite cannot batch an order-preserving RETURNING, but one INSERT assigns
+        # rowids in VALUES order, so sorting by id restores it.
+        created = db.scalars(insert(model).returning(model), rows, execution_options=options)
+        return sorted(created, key=lambda instance: instance.id)
+    statement = insert(model).returning(model, sort_by_parameter_order=True)
+    return list(db.scalars(statement, rows, execution_options=options))
@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+import redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client: redis.Redis | None = None
+_redis_lock = threading.Lock()
+_local_caches: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def redis_enabled() -> bool:
+    return settings.cache_backend == "redis"
+
+
+def get_redis() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                _redis_client = redis.Redis.from_url(
+                    settings.redis_url,
+                    socket_timeout=settings.cache_redis_timeout_seconds,
+                    socket_connect_timeout=settings.cache_redis_timeout_seconds,
+                )
+    return _redis_client
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        _local_caches.add(self)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionStamps:
+    """Monotonic per-key version counters used to invalidate cached entries.
+
+    With the memory backend the counters live in this process only; with the
+    Redis backend they are shared, so a bump in one worker invalidates entries
+    cached by every other worker. ``current`` returns ``None`` when the shared
+    counter cannot be read, which callers must treat as a cache miss.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self._versions: dict[Any, int] = {}
+        self._lock = threading.Lock()
+        _local_caches.add(self)
+
+    def _redis_key(self, key: Any) -> str:
+        return f"{self.namespace}:{key}"
+
+    def current(self, key: Any) -> int | None:
+        if redis_enabled():
+            try:
+                value = get_redis().get(self._redis_key(key))
+            except RedisError as exc:
+                logger.warning(
+                    "cache.version.unavailable",
+                    extra={"namespace": self.namespace, "error": str(exc)},
+                )
+                return None
+            return int(value or 0)
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def bump(self, key: Any) -> None:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+        if redis_enabled():
+            try:
+                get_redis().incr(self._redis_key(key))
+            except RedisError as exc:
+                logger.warning(
+                    "cache.version.bump_failed",
+                    extra={"namespace": self.namespace, "key": str(key), "error": str(exc)},
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+
+
+def register_local_cache(cache: Any) -> None:
+    """Include ``cache`` (anything with ``clear()``) in ``clear_local_caches``."""
+    _local_caches.add(cache)
+
+
+def clear_local_caches() -> None:
+    for cache in list(_local_caches):
+        cache.clear()
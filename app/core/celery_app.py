@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 
 from app.core.config import settings
 
@@ -13,4 +14,14 @@ celery_app.conf.task_routes = {
     "app.tasks.generate_email_reply_task": {"queue": "email"},
     "app.tasks.send_email_reply_task": {"queue": "email"},
 }
+celery_app.conf.beat_schedule = {
+    "rebuild-daily-stats": {
+        "task": "app.tasks.rebuild_daily_stats_task",
+        "schedule": crontab(hour=settings.daily_stats_rebuild_hour, minute=15),
+    },
+    "maintain-activity-logs": {
+        "task": "app.tasks.maintain_activity_logs_task",
+        "schedule": crontab(hour=settings.daily_stats_rebuild_hour, minute=45),
+    },
+}
 celery_app.conf.task_always_eager = settings.celery_task_always_eager
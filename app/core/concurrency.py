@@ -0,0 +1,157 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+limit_gauge = registry.gauge(
+    "llm_concurrency_limit", "Current adaptive in-flight limit for LLM calls"
+)
+inflight_gauge = registry.gauge("llm_concurrency_inflight", "LLM calls currently in flight")
+decisions_counter = registry.counter(
+    "llm_concurrency_decisions_total", "Adaptive limit adjustments by decision"
+)
+rejected_counter = registry.counter(
+    "llm_concurrency_rejected_total", "LLM calls deferred because the limit was reached"
+)
+calls_counter = registry.counter("llm_calls_total", "Completed LLM calls by outcome")
+latency_sum = registry.counter("llm_call_latency_seconds_sum", "Total LLM call latency")
+
+
+@dataclass(frozen=True)
+class ConcurrencyPermit:
+    started_at: float
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limiter for calls to a shared downstream such as the LLM provider.
+
+    The limit grows by roughly one slot per window of successful calls that
+    finish under the latency target, and shrinks multiplicatively on errors or
+    slow calls. Only calls started after the last decrease can trigger another
+    one, so a single slow burst backs off once instead of collapsing the limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        backoff_ratio: float,
+    ) -> None:
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= max_limit")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_seconds = latency_target_seconds
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._inflight = 0
+        self._last_decrease_at = 0.0
+        self._lock = threading.Lock()
+        self._publish()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def try_acquire(self) -> ConcurrencyPermit | None:
+        with self._lock:
+            if self._inflight >= self.limit:
+                rejected_counter.inc(limiter=self.name)
+                return None
+            self._inflight += 1
+            self._publish()
+        return ConcurrencyPermit(started_at=time.monotonic())
+
+    def release(self, permit: ConcurrencyPermit, *, error: bool = False) -> None:
+        finished_at = time.monotonic()
+        latency = finished_at - permit.started_at
+        slow = latency > self.latency_target_seconds
+        with self._lock:
+            saturated = self._inflight >= self.limit
+            self._inflight = max(0, self._inflight - 1)
+            previous = self.limit
+            if error or slow:
+                decision = self._decrease(permit, finished_at)
+            elif saturated:
+                decision = self._increase()
+            else:
+                decision = "hold"
+            current = self.limit
+            self._publish()
+
+        outcome = "error" if error else "slow" if slow else "ok"
+        calls_counter.inc(limiter=self.name, outcome=outcome)
+        latency_sum.inc(latency, limiter=self.name)
+        if current != previous:
+            logger.info(
+                "llm.concurrency.adjusted",
+                extra={
+                    "limiter": self.name,
+                    "decision": decision,
+                    "previous_limit": previous,
+                    "limit": current,
+                    "latency_ms": round(latency * 1000, 2),
+                    "outcome": outcome,
+                },
+            )
+
+    def cancel(self, permit: ConcurrencyPermit) -> None:
+        """Return a permit whose call never ran, without counting it toward the limit."""
+        with self._lock:
+            self._inflight = max(0, self._inflight - 1)
+            self._publish()
+
+    def snapshot(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "inflight": self._inflight,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+            }
+
+    def _increase(self) -> str:
+        if self._limit >= self.max_limit:
+            return "hold"
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / max(self._limit, 1.0))
+        decisions_counter.inc(limiter=self.name, decision="increase")
+        return "increase"
+
+    def _decrease(self, permit: ConcurrencyPermit, finished_at: float) -> str:
+        if permit.started_at < self._last_decrease_at or self._limit <= self.min_limit:
+            return "hold"
+        self._limit = max(float(self.min_limit), math.floor(self._limit * self.backoff_ratio))
+        self._last_decrease_at = finished_at
+        decisions_counter.inc(limiter=self.name, decision="decrease")
+        return "decrease"
+
+    def _publish(self) -> None:
+        limit_gauge.set(self.limit, limiter=self.name)
+        inflight_gauge.set(self._inflight, limiter=self.name)
+
+
+draft_limiter = AdaptiveConcurrencyLimiter(
+    "email_drafts",
+    initial_limit=settings.llm_concurrency_initial,
+    min_limit=settings.llm_concurrency_min,
+    max_limit=settings.llm_concurrency_max,
+    latency_target_seconds=settings.llm_latency_target_seconds,
+    backoff_ratio=settings.llm_concurrency_backoff_ratio,
+)
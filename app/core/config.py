@@ -24,13 +24,63 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 60
     refresh_token_expire_minutes: int = 60 * 24 * 7
     database_url: str = "sqlite:///./app.db"
+    database_async_url: str = ""
+    database_read_url: str = ""
+    read_replica_max_lag_seconds: float = 5.0
+    read_replica_check_interval_seconds: float = 10.0
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_bytes: int = 268435456
     rate_limit: str = "100/minute"
     redis_url: str = "redis://localhost:6379/0"
+    cache_backend: str = "memory"
+    cache_redis_timeout_seconds: float = 0.5
+    template_cache_ttl_seconds: float = 300.0
+    template_cache_max_entries: int = 10000
+    principal_cache_ttl_seconds: float = 30.0
+    principal_cache_max_entries: int = 10000
+    api_key_cache_ttl_seconds: float = 300.0
+    api_key_cache_max_entries: int = 10000
+    lead_email_filter_enabled: bool = True
+    lead_email_filter_sync_seconds: float = 5.0
+    dashboard_cache_ttl_seconds: float = 5.0
+    dashboard_cache_max_entries: int = 10000
+    dashboard_cache_lock_seconds: float = 2.0
+    activity_log_mode: str = "memory"
+    activity_log_batch_size: int = 500
+    activity_log_flush_interval_seconds: float = 1.0
+    activity_log_max_buffered: int = 100000
+    activity_log_retention_months: int = 3
+    activity_log_partitions_ahead: int = 2
+    activity_archive_dir: str = "./archive/activity_logs"
+    lead_import_dir: str = "./imports/leads"
+    lead_import_chunk_size: int = 1000
+    lead_import_stale_seconds: int = 600
+    bulk_render_batch_size: int = 1000
+    webhook_email_batch_max_items: int = 1000
+    webhook_email_batch_max_bytes: int = 10 * 1024 * 1024
+    page_size_default: int = 100
+    page_size_max: int = 500
+    page_include_total: bool = True
+    daily_stats_rebuild_hour: int = 3
     celery_task_always_eager: bool = False
     ai_base_url: str = "https://api.openai.com/v1"
     ai_api_key: str = "change-this-key"
     ai_default_model: str = "gpt-4o-mini"
     ai_request_timeout_seconds: float = 30.0
+    llm_concurrency_initial: int = 4
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 32
+    llm_latency_target_seconds: float = 8.0
+    llm_concurrency_backoff_ratio: float = 0.7
+    llm_concurrency_retry_seconds: int = 5
+    llm_concurrency_max_deferrals: int = 60
+    worker_metrics_port: int = 0
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     sentry_dsn: str = ""
@@ -45,6 +95,22 @@ class Settings(BaseSettings):
             raise ValueError("ENVIRONMENT must be one of: development, staging, production, test")
         return normalized
 
+    @field_validator("cache_backend", mode="before")
+    @classmethod
+    def normalize_cache_backend(cls, value: str | None) -> str:
+        normalized = (value or "memory").strip().lower()
+        if normalized not in {"memory", "redis"}:
+            raise ValueError("CACHE_BACKEND must be one of: memory, redis")
+        return normalized
+
+    @field_validator("activity_log_mode", mode="before")
+    @classmethod
+    def normalize_activity_log_mode(cls, value: str | None) -> str:
+        normalized = (value or "memory").strip().lower()
+        if normalized not in {"sync", "memory", "redis"}:
+            raise ValueError("ACTIVITY_LOG_MODE must be one of: sync, memory, redis")
+        return normalized
+
     @field_validator("allowed_origins", mode="before")
     @classmethod
     def split_origins(cls, value: str | list[str] | tuple[str, ...] | None) -> list[str]:
@@ -1,16 +1,184 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import registry
+from app.core.read_replica import ReadReplicaRouter
+
+pool_checkouts = registry.counter(
+    "db_pool_checkouts_total", "Connections handed out by the database pool"
+)
+pool_checkout_wait = registry.counter(
+    "db_pool_checkout_wait_seconds_sum",
+    "Time spent waiting for a pooled connection, including opening new ones",
+)
+pool_checkout_timeouts = registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT_SECONDS"
+)
+
+_pooled_engines: dict[str, Engine] = {}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_checkout_timeouts.inc(pool=self.label)
+            raise
+        finally:
+            pool_checkout_wait.inc(time.perf_counter() - started, pool=self.label)
+        pool_checkouts.inc(pool=self.label)
+        return connection
+
+
+def instrumented_pool_class(label: str, *, is_async: bool = False) -> type[InstrumentedQueuePool]:
+    # A subclass per engine keeps the label when SQLAlchemy recreates the pool on dispose().
+    bases = (InstrumentedQueuePool, AsyncAdaptedQueuePool) if is_async else (InstrumentedQueuePool,)
+    return type(f"InstrumentedQueuePool_{label}", bases, {"label": label})
+
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_bytes)}")
+    cursor.close()
+
 
-connect_args = None
-if settings.database_url.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+def engine_options(database_url: str, label: str, *, is_async: bool = False) -> dict:
+    url = make_url(database_url)
+    options: dict = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if url.get_backend_name() == "sqlite":
+        options["pool_pre_ping"] = False
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live inside a single connection; keep SQLAlchemy's default pool.
+            return options
+    elif url.get_backend_name() == "postgresql" and settings.db_statement_timeout_ms > 0:
+        timeout = str(int(settings.db_statement_timeout_ms))
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    options.update(
+        poolclass=instrumented_pool_class(label, is_async=is_async),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    return options
 
-engine = create_engine(
-    settings.database_url,
-    connect_args=connect_args or {},
-    pool_pre_ping=not settings.database_url.startswith("sqlite"),
+
+def configure_engine(engine: Engine, label: str) -> Engine:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    if isinstance(engine.pool, QueuePool):
+        _pooled_engines[label] = engine
+    return engine
+
+
+def create_async_database_engine(database_url: str, label: str) -> AsyncEngine:
+    async_url = async_database_url(database_url)
+    async_engine = create_async_engine(
+        async_url, **engine_options(async_url, label, is_async=True)
+    )
+    configure_engine(async_engine.sync_engine, label)
+    return async_engine
+
+
+async def begin_snapshot(session: AsyncSession) -> None:
+    """Pin every following read in ``session`` to one consistent snapshot.
+
+    Must be called before the session has run any statement.
+    """
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        await session.connection(
+            execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+        )
+    elif dialect == "sqlite":
+        # pysqlite only opens a transaction before writes; WAL readers get a snapshot
+        # from an explicit BEGIN until the session rolls back on close.
+        connection = await session.connection()
+        await connection.exec_driver_sql("BEGIN")
+
+
+def pool_status() -> dict[str, dict[str, int]]:
+    status = {}
+    for label, pooled_engine in _pooled_engines.items():
+        pool = pooled_engine.pool
+        status[label] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    return status
+
+
+def _pool_samples() -> dict:
+    samples = {}
+    for label, stats in pool_status().items():
+        for state, value in stats.items():
+            samples[(("pool", label), ("state", state))] = float(value)
+    return samples
+
+
+registry.callback_gauge(
+    "db_pool_connections", "Database pool connections by state", _pool_samples
+)
+
+engine = configure_engine(
+    create_engine(settings.database_url, **engine_options(settings.database_url, "primary")),
+    "primary",
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_database_engine(
+    settings.database_async_url or settings.database_url, "primary_async"
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+read_engine = (
+    create_async_database_engine(settings.database_read_url, "replica")
+    if settings.database_read_url
+    else None
+)
+read_router = ReadReplicaRouter(
+    AsyncSessionLocal,
+    read_engine,
+    max_lag_seconds=settings.read_replica_max_lag_seconds,
+    check_interval_seconds=settings.read_replica_check_interval_seconds,
+)
+
 Base = declarative_base()
@@ -1,12 +1,20 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.api_keys import ApiKeyCompany, resolve_api_key
+from app.core.database import AsyncSessionLocal, SessionLocal, read_router
+from app.core.principal_cache import (
+    Principal,
+    cached_principal,
+    principal_from_user,
+    store_principal,
+)
 from app.core.security import decode_token
-from app.models.company import Company
 from app.models.user import User
 
 
@@ -21,32 +29,72 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session: the replica when configured and fresh, otherwise the primary."""
+    db = await read_router.session()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def _token_subject(token: str) -> str | None:
     payload = decode_token(token)
     if not payload or payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db.query(User).filter(User.email == payload.get("sub")).first()
+    return payload.get("sub")
+
+
+def _resolved_principal(subject: str | None, version: int | None, user: User | None) -> Principal:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = principal_from_user(user)
+    store_principal(subject, version, principal)
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    subject = _token_subject(token)
+    version, principal = cached_principal(subject)
+    if principal is not None:
+        return principal
+    user = db.query(User).filter(User.email == subject).first()
+    return _resolved_principal(subject, version, user)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    subject = _token_subject(token)
+    version, principal = cached_principal(subject)
+    if principal is not None:
+        return principal
+    user = (await db.execute(select(User).where(User.email == subject))).scalars().first()
+    return _resolved_principal(subject, version, user)
 
 
 def get_company_from_api_key(
     api_key: str | None = Header(default=None, alias="X-Company-Key"),
     db: Session = Depends(get_db),
-) -> Company:
+) -> ApiKeyCompany:
     if not api_key:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API key")
-    company = db.query(Company).filter(Company.api_key == api_key).first()
+    company = resolve_api_key(db, api_key)
     if not company:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
     return company
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
@@ -0,0 +1,85 @@
+"""Database-maintained full-text indexes shared by lead and email search.
+
+PostgreSQL tables get a generated, weighted ``search_vector`` column with a GIN
+index; SQLite tables get an external-content FTS5 table (``<table>_fts``) that
+triggers keep in step with the base table. Because the database maintains both,
+every insert or update path stays searchable without application hooks.
+
+``company_id`` is an indexed FTS5 column so SQLite intersects the tenant and
+the search terms inside the index lookup.
+"""
+
+import re
+from collections.abc import Sequence
+
+from sqlalchemy import DDL, ColumnElement, Table, event, func, literal_column
+
+MAX_TERMS = 8
+
+_TERM = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list[str]:
+    return _TERM.findall(query.lower())[:MAX_TERMS]
+
+
+def sqlite_fts_ddl(table_name: str, columns: Sequence[str]) -> list[str]:
+    fts = f"{table_name}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{name}" for name in columns)
+    old_values = ", ".join(f"old.{name}" for name in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+        f"content='{table_name}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table_name} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def register_fulltext_index(table: Table, columns: Sequence[str], postgres_vector: str) -> None:
+    """Create the table's search index whenever ``metadata.create_all`` creates the table."""
+    for statement in sqlite_fts_ddl(table.name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {table.name}_fts").execute_if(dialect="sqlite"),
+    )
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"ALTER TABLE {table.name} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({postgres_vector}) STORED"
+        ).execute_if(dialect="postgresql"),
+    )
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE INDEX ix_{table.name}_search_vector ON {table.name} USING gin (search_vector)"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
+def postgres_match(table_name: str, terms: Sequence[str]) -> tuple[ColumnElement, ColumnElement]:
+    """``(search_vector, tsquery)`` requiring every term as a prefix."""
+    vector = literal_column(f"{table_name}.search_vector")
+    tsquery = func.to_tsquery(
+        literal_column("'simple'::regconfig"), " & ".join(f"{term}:*" for term in terms)
+    )
+    return vector, tsquery
+
+
+def sqlite_match(company_id: int, terms: Sequence[str], text_columns: Sequence[str]) -> str:
+    """FTS5 query for ``terms`` as prefixes in ``text_columns``, limited to one company."""
+    prefixes = " AND ".join(f'"{term}"*' for term in terms)
+    return f'company_id : "{company_id}" AND {{{" ".join(text_columns)}}} : ({prefixes})'
@@ -0,0 +1,102 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select, func, select, tuple_
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    after: tuple[datetime, int] | None
+    include_total: bool
+
+
+def _encode(values: list[Any]) -> str:
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+    )
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    return _encode([sort_value.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise _invalid_cursor() from exc
+
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    """Cursor for relevance-ordered pages; JSON keeps the float exact for the next comparison."""
+    return _encode([score, row_id])
+
+
+def decode_score_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, row_id = json.loads(raw)
+        return float(score), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise _invalid_cursor() from exc
+
+
+def page_params(
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    include_total: bool | None = Query(default=None),
+) -> PageParams:
+    return PageParams(
+        limit=min(limit or settings.page_size_default, settings.page_size_max),
+        after=decode_cursor(cursor) if cursor else None,
+        include_total=settings.page_include_total if include_total is None else include_total,
+    )
+
+
+def count_statement(statement: Select) -> Select:
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+def keyset_page(statement: Select, sort_column: Any, id_column: Any, params: PageParams) -> Select:
+    """Newest-first page of ``statement`` strictly after the cursor position.
+
+    One extra row is fetched so callers can tell whether another page exists.
+    """
+    if params.after is not None:
+        statement = statement.where(tuple_(sort_column, id_column) < tuple_(*params.after))
+    return statement.order_by(sort_column.desc(), id_column.desc()).limit(params.limit + 1)
+
+
+def finish_page(
+    response: Response,
+    rows: Sequence[Any],
+    params: PageParams,
+    sort_attr: str,
+    total: int | None = None,
+) -> list[Any]:
+    page = list(rows[: params.limit])
+    if len(rows) > params.limit:
+        last = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, sort_attr), last.id)
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    return page
@@ -0,0 +1,73 @@
+"""Short-lived cache of authenticated principals keyed by token subject.
+
+``get_current_user`` resolves a token to the few user fields routes rely on
+without querying ``users`` on every request. Role and password changes call
+``invalidate_principal``; deleting a user invalidates it through a mapper
+event. With ``CACHE_BACKEND=redis`` the version stamps are shared, so an
+invalidation reaches every worker; otherwise other workers converge within
+``PRINCIPAL_CACHE_TTL_SECONDS``.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import event
+
+from app.core.cache import TTLCache, VersionStamps
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.user import User
+
+cache_requests = registry.counter(
+    "principal_cache_requests_total", "Authenticated principal lookups by result"
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+    company_id: int
+    role: str
+
+
+def principal_from_user(user: User) -> Principal:
+    return Principal(id=user.id, email=user.email, company_id=user.company_id, role=user.role)
+
+
+_principals = TTLCache(
+    maxsize=settings.principal_cache_max_entries,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+_versions = VersionStamps("principal_version")
+
+
+def cached_principal(subject: str) -> tuple[int | None, Principal | None]:
+    """The subject's cache version and its principal, or ``None`` on a miss.
+
+    A ``None`` version means the shared version could not be read; the caller
+    must not store what it loads.
+    """
+    if settings.principal_cache_ttl_seconds <= 0:
+        return None, None
+    version = _versions.current(subject)
+    entry = _principals.get(subject)
+    if entry is not None and version is not None and entry[0] == version:
+        cache_requests.inc(result="hit")
+        return version, entry[1]
+    cache_requests.inc(result="miss")
+    return version, None
+
+
+def store_principal(subject: str, version: int | None, principal: Principal) -> None:
+    if version is not None:
+        _principals.set(subject, (version, principal))
+
+
+def invalidate_principal(subject: str) -> None:
+    _versions.bump(subject)
+    _principals.pop(subject)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(_mapper, _connection, user: User) -> None:
+    invalidate_principal(user.email)
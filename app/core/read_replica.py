@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+replica_lag = registry.gauge(
+    "db_replica_lag_seconds", "Replication lag of the read replica at the last check"
+)
+read_routing = registry.counter(
+    "db_read_routing_total", "Read-only sessions by the database they were routed to"
+)
+
+POSTGRES_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReadReplicaRouter:
+    """Hands out read-only sessions on the replica while it is healthy and fresh.
+
+    Lag is measured at most once per ``check_interval_seconds``; while the
+    replica is unreachable or more than ``max_lag_seconds`` behind, sessions
+    are opened on the primary instead.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica_engine: AsyncEngine | None,
+        *,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+    ) -> None:
+        self.primary = primary
+        self.replica_engine = replica_engine
+        self.replica = (
+            async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+            if replica_engine is not None
+            else None
+        )
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._healthy = False
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def measure_lag(self) -> float:
+        async with self.replica_engine.connect() as connection:
+            if connection.dialect.name != "postgresql":
+                await connection.execute(text("SELECT 1"))
+                return 0.0
+            return float((await connection.execute(POSTGRES_LAG_QUERY)).scalar() or 0.0)
+
+    async def replica_available(self) -> bool:
+        if self.replica is None:
+            return False
+        if time.monotonic() - self._checked_at < self.check_interval_seconds:
+            return self._healthy
+        async with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval_seconds:
+                return self._healthy
+            try:
+                lag = await self.measure_lag()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("db.replica.unavailable", extra={"error": str(exc)})
+                healthy = False
+            else:
+                replica_lag.set(lag)
+                healthy = lag <= self.max_lag_seconds
+                if not healthy:
+                    logger.warning(
+                        "db.replica.lagging",
+                        extra={"lag_seconds": lag, "max_lag_seconds": self.max_lag_seconds},
+                    )
+            self._healthy = healthy
+            self._checked_at = time.monotonic()
+        return self._healthy
+
+    async def session(self) -> AsyncSession:
+        if await self.replica_available():
+            read_routing.inc(target="replica")
+            return self.replica()
+        read_routing.inc(target="primary")
+        return self.primary()
@@ -0,0 +1,265 @@
+"""OpenAI-compatible stand-in for the LLM provider.
+
+Serves ``/chat/completions`` (plain and streaming) with configurable latency,
+error and rate-limit behaviour so the draft pipeline can be exercised and
+load-tested without network access. Responses are deterministic for a given
+seed and request sequence.
+
+Run it as a subprocess::
+
+    python -m app.devtools.fake_llm --port 8089 --latency-ms 400 --error-rate 0.02
+
+and point ``AI_BASE_URL`` at ``http://127.0.0.1:8089/v1``. In tests or scripts,
+use ``FakeLLMServer`` to run it in a background thread.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+VOCABULARY = (
+    "thanks", "for", "reaching", "out", "we", "can", "help", "with", "pricing",
+    "setup", "and", "next", "steps", "our", "team", "will", "follow", "up",
+    "shortly", "please", "share", "details", "about", "your", "use", "case",
+)
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+@dataclass
+class FakeLLMConfig:
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    latency_distribution: str = "fixed"
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    completion_tokens: int = 40
+    stream_chunk_tokens: int = 4
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"latency_distribution must be one of: {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        if not 0 <= self.error_rate + self.rate_limit_rate <= 1:
+            raise ValueError("error_rate + rate_limit_rate must be between 0 and 1")
+
+
+class _RequestPlan:
+    def __init__(self, config: FakeLLMConfig, sequence: int) -> None:
+        rng = random.Random(f"{config.seed}:{sequence}")
+        self.sequence = sequence
+        self.latency_seconds = _sample_latency(config, rng) / 1000
+        roll = rng.random()
+        self.rate_limited = roll < config.rate_limit_rate
+        self.failed = not self.rate_limited and roll < config.rate_limit_rate + config.error_rate
+        self.tokens = [rng.choice(VOCABULARY) for _ in range(max(1, config.completion_tokens))]
+
+
+def _sample_latency(config: FakeLLMConfig, rng: random.Random) -> float:
+    mean = config.latency_ms
+    jitter = config.latency_jitter_ms
+    if config.latency_distribution == "uniform":
+        value = rng.uniform(mean - jitter, mean + jitter)
+    elif config.latency_distribution == "normal":
+        value = rng.gauss(mean, jitter)
+    elif config.latency_distribution == "lognormal" and mean > 0:
+        # Parameterised so the median is latency_ms and jitter widens the tail.
+        sigma = jitter / mean if jitter else 0.0
+        value = mean * rng.lognormvariate(0.0, sigma)
+    else:
+        value = mean
+    return max(0.0, value)
+
+
+def _prompt_tokens(payload: dict) -> int:
+    messages = payload.get("messages") or []
+    return sum(len(str(message.get("content", "")).split()) for message in messages)
+
+
+def create_fake_llm_app(config: FakeLLMConfig | None = None) -> FastAPI:
+    config = config or FakeLLMConfig()
+    app = FastAPI(title="Fake LLM provider")
+    counter = itertools.count(1)
+    stats = {"requests": 0, "rate_limited": 0, "errors": 0}
+    app.state.config = config
+    app.state.stats = stats
+
+    @app.post("/chat/completions")
+    @app.post("/v1/chat/completions", include_in_schema=False)
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        plan = _RequestPlan(config, next(counter))
+        stats["requests"] += 1
+        await asyncio.sleep(plan.latency_seconds)
+        if plan.rate_limited:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after_seconds)},
+                content={"error": {"type": "rate_limit_exceeded", "message": "Rate limit reached"}},
+            )
+        if plan.failed:
+            stats["errors"] += 1
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"type": "server_error", "message": "Upstream failure"}},
+            )
+        completion_id = f"chatcmpl-fake-{plan.sequence}"
+        model = payload.get("model", "fake-model")
+        created = int(time.time())
+        if payload.get("stream"):
+            return StreamingResponse(
+                _stream_chunks(config, plan, completion_id, model, created),
+                media_type="text/event-stream",
+            )
+        prompt_tokens = _prompt_tokens(payload)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(plan.tokens)},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(plan.tokens),
+                "total_tokens": prompt_tokens + len(plan.tokens),
+            },
+        }
+
+    @app.get("/stats")
+    def get_stats() -> dict[str, int]:
+        return dict(stats)
+
+    return app
+
+
+async def _stream_chunks(
+    config: FakeLLMConfig,
+    plan: _RequestPlan,
+    completion_id: str,
+    model: str,
+    created: int,
+):
+    step = max(1, config.stream_chunk_tokens)
+    for start in range(0, len(plan.tokens), step):
+        piece = " ".join(plan.tokens[start : start + step])
+        if start:
+            piece = f" {piece}"
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(0)
+    final = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+    }
+    yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+class FakeLLMServer:
+    """Runs the fake provider on a free local port in a background thread."""
+
+    def __init__(self, config: FakeLLMConfig | None = None, host: str = "127.0.0.1") -> None:
+        self.app = create_fake_llm_app(config)
+        self.host = host
+        self.port: int | None = None
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(self.app.state.stats)
+
+    def start(self) -> "FakeLLMServer":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, 0))
+        self.port = sock.getsockname()[1]
+        config = uvicorn.Config(self.app, log_level="warning", lifespan="off", ws="none")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        self._thread.start()
+        deadline = time.monotonic() + 5
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake LLM server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a deterministic fake LLM provider.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after-seconds", type=int, default=1)
+    parser.add_argument("--completion-tokens", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after_seconds,
+        completion_tokens=args.completion_tokens,
+        seed=args.seed,
+    )
+    uvicorn.run(create_fake_llm_app(config), host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
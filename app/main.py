@@ -6,7 +6,7 @@ from typing import Callable
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 import sentry_sdk
@@ -14,18 +14,32 @@ import sentry_sdk
 from app.core.config import settings
 from app.core.logging_config import configure_logging
 from app.core.limiter import limiter
-from app.core.database import Base, engine
+from app.core.metrics import registry as metrics_registry
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.core.database import (
+    Base,
+    SessionLocal,
+    async_engine,
+    engine,
+    pool_status,
+    read_engine,
+)
 from app.models import (
     activity_log,
     auto_reply_template,
     company,
+    daily_company_stat,
     email_integration,
     email_message,
     email_reply,
     lead,
+    lead_import,
+    lead_tag,
     user,
+    workflow_rule,
 )
 from app.routes import (
+    activity,
     analytics,
     auth,
     auto_replies,
@@ -33,12 +47,17 @@ from app.routes import (
     companies,
     dashboard,
     emails,
+    exports,
     integrations,
+    lead_imports,
     leads,
     public,
     templates,
     users,
+    workflows,
 )
+from app.services.activity_writer import activity_writer
+from app.services.lead_email_filter import lead_email_filter
 
 if settings.database_url.startswith("sqlite"):
     Base.metadata.create_all(bind=engine)
@@ -77,6 +96,12 @@ app.add_middleware(
     allow_credentials=not settings.cors_allow_all,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Request-ID",
+        "Content-Disposition",
+        NEXT_CURSOR_HEADER,
+        TOTAL_COUNT_HEADER,
+    ],
 )
 
 @app.middleware("http")
@@ -123,6 +148,7 @@ if settings.sentry_dsn:
     sentry_sdk.init(dsn=settings.sentry_dsn, environment=settings.sentry_environment)
 
 app.include_router(auth.router)
+app.include_router(lead_imports.router)
 app.include_router(leads.router)
 app.include_router(emails.router)
 app.include_router(auto_replies.router)
@@ -134,6 +160,29 @@ app.include_router(chat.router)
 app.include_router(integrations.router)
 app.include_router(analytics.router)
 app.include_router(templates.router)
+app.include_router(workflows.router)
+app.include_router(activity.router)
+app.include_router(exports.router)
+
+
+@app.on_event("startup")
+def build_lead_email_filters() -> None:
+    if not settings.lead_email_filter_enabled:
+        return
+    with SessionLocal() as db:
+        lead_email_filter.rebuild_all(db)
+
+
+@app.on_event("shutdown")
+def flush_activity_logs() -> None:
+    activity_writer.close()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine() -> None:
+    await async_engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 
 @app.get("/")
@@ -154,4 +203,10 @@ def status() -> dict:
         "app": settings.app_name,
         "environment": settings.environment,
         "uptime_seconds": uptime_seconds,
+        "database_pool": pool_status(),
     }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    return metrics_registry.render()
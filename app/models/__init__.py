@@ -1,19 +1,27 @@
 from app.models.activity_log import ActivityLog
 from app.models.auto_reply_template import AutoReplyTemplate
 from app.models.company import Company
+from app.models.daily_company_stat import DailyCompanyStat
 from app.models.email_message import EmailMessage
 from app.models.email_integration import EmailIntegration
 from app.models.email_reply import EmailReply
 from app.models.lead import Lead
+from app.models.lead_import import LeadImport
+from app.models.lead_tag import LeadTag
 from app.models.user import User
+from app.models.workflow_rule import WorkflowRule
 
 __all__ = [
     "ActivityLog",
     "AutoReplyTemplate",
     "Company",
+    "DailyCompanyStat",
     "EmailMessage",
     "EmailIntegration",
     "EmailReply",
     "Lead",
+    "LeadImport",
+    "LeadTag",
     "User",
+    "WorkflowRule",
 ]
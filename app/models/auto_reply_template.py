@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -8,6 +8,14 @@ from app.core.database import Base
 
 class AutoReplyTemplate(Base):
     __tablename__ = "auto_reply_templates"
+    __table_args__ = (
+        Index(
+            "ix_auto_reply_templates_company_id_trigger_type_created_at",
+            "company_id",
+            "trigger_type",
+            "created_at",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=True)
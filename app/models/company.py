@@ -12,6 +12,9 @@ class Company(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     api_key = Column(String, unique=True, nullable=False, index=True)
+    # Lookups go through the prefix and hash (see app/core/api_keys.py).
+    api_key_prefix = Column(String, nullable=False, index=True)
+    api_key_hash = Column(String, unique=True, nullable=False)
     auto_reply_enabled = Column(Boolean, default=True, nullable=False)
     ai_model = Column(String, default="gpt-4o-mini", nullable=False)
     ai_prompt_template = Column(
@@ -26,6 +29,7 @@ class Company(Base):
     emails = relationship("EmailMessage", back_populates="company")
     auto_reply_templates = relationship("AutoReplyTemplate", back_populates="company")
     activity_logs = relationship("ActivityLog", back_populates="company")
+    workflow_rules = relationship("WorkflowRule", back_populates="company")
     email_integrations = relationship(
         "EmailIntegration", back_populates="company", cascade="all, delete-orphan"
     )
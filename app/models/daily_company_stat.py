@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, String
+
+from app.core.database import Base
+
+
+class DailyCompanyStat(Base):
+    """One counter of the per-company daily rollup read by the dashboard and analytics."""
+
+    __tablename__ = "daily_company_stats"
+
+    company_id = Column(Integer, ForeignKey("companies.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    metric = Column(String, primary_key=True)
+    dimension = Column(String, primary_key=True, default="")
+    value = Column(Integer, nullable=False, default=0)
@@ -1,13 +1,36 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.fulltext import register_fulltext_index
 
 
 class EmailMessage(Base):
     __tablename__ = "email_messages"
+    __table_args__ = (
+        Index("ix_email_messages_company_id_received_at", "company_id", "received_at"),
+        Index("ix_email_messages_lead_id_received_at", "lead_id", "received_at"),
+        Index(
+            "ix_email_messages_company_id_category_received_at",
+            "company_id",
+            "category",
+            "received_at",
+        ),
+        Index(
+            "ix_email_messages_company_id_priority_received_at",
+            "company_id",
+            "priority",
+            "received_at",
+        ),
+        Index(
+            "ix_email_messages_company_id_routed_to_received_at",
+            "company_id",
+            "routed_to",
+            "received_at",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     from_email = Column(String, index=True, nullable=False)
@@ -15,9 +38,29 @@ class EmailMessage(Base):
     body = Column(String, nullable=False)
     received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed = Column(Boolean, default=False, nullable=False)
+    # Classified once in receive_email so inbox filters run in SQL.
+    category = Column(String, nullable=True)
+    priority = Column(String, nullable=True)
+    # Route target set by the first matching workflow rule with a ``route_to`` action.
+    routed_to = Column(String, nullable=True)
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
 
     lead = relationship("Lead", back_populates="emails")
     company = relationship("Company", back_populates="emails")
     replies = relationship("EmailReply", back_populates="email", cascade="all, delete-orphan")
+
+
+# Full-text search index (see app/core/fulltext.py); migration 0011 adds it to
+# existing databases. Bodies are capped so one huge message cannot exceed the
+# tsvector size limit.
+SEARCH_COLUMNS = ("subject", "body", "from_email", "company_id")
+
+POSTGRES_SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(subject, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(from_email, '') || ' '
+        || translate(coalesce(from_email, ''), '@.', '  ')), 'A')
+    || setweight(to_tsvector('simple', left(coalesce(body, ''), 100000)), 'B')
+"""
+
+register_fulltext_index(EmailMessage.__table__, SEARCH_COLUMNS, POSTGRES_SEARCH_VECTOR)
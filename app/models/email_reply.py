@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -8,9 +8,24 @@ from app.core.database import Base
 
 class EmailReply(Base):
     __tablename__ = "email_replies"
+    __table_args__ = (
+        Index(
+            "ix_email_replies_email_id_send_status_created_at",
+            "email_id",
+            "send_status",
+            "created_at",
+        ),
+        Index(
+            "ix_email_replies_company_id_send_status_created_at",
+            "company_id",
+            "send_status",
+            "created_at",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email_id = Column(Integer, ForeignKey("email_messages.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
     subject = Column(String, nullable=False)
     body = Column(Text, nullable=False)
     generated_by_ai = Column(Boolean, default=True, nullable=False)
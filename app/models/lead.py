@@ -1,13 +1,19 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.core.fulltext import register_fulltext_index
 
 
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        Index("ix_leads_company_id_created_at", "company_id", "created_at"),
+        Index("ix_leads_company_id_status_created_at", "company_id", "status", "created_at"),
+        Index("ix_leads_company_id_email", "company_id", "email"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -24,3 +30,19 @@ class Lead(Base):
 
     company = relationship("Company", back_populates="leads")
     emails = relationship("EmailMessage", back_populates="lead")
+
+
+# Full-text search index (see app/core/fulltext.py); migration 0010 adds it to
+# existing databases.
+SEARCH_COLUMNS = ("name", "email", "phone", "message", "tags", "conversation_summary", "company_id")
+
+POSTGRES_SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(email, '') || ' '
+        || translate(coalesce(email, ''), '@.', '  ')), 'A')
+    || setweight(to_tsvector('simple', coalesce(tags, '') || ' ' || coalesce(phone, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(message, '')), 'C')
+    || setweight(to_tsvector('simple', coalesce(conversation_summary, '')), 'C')
+"""
+
+register_fulltext_index(Lead.__table__, SEARCH_COLUMNS, POSTGRES_SEARCH_VECTOR)
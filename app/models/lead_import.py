@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from app.core.database import Base
+
+
+class LeadImport(Base):
+    """A bulk lead import and its checkpoint.
+
+    ``rows_processed`` and ``bytes_processed`` advance in the same transaction as
+    each chunk's inserts, so an interrupted import resumes exactly after the last
+    committed chunk. ``error_bytes`` is the committed length of the error file.
+    """
+
+    __tablename__ = "lead_imports"
+    __table_args__ = (Index("ix_lead_imports_company_id_created_at", "company_id", "created_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    filename = Column(String, nullable=False)
+    file_format = Column(String, nullable=False)
+    status = Column(String, default="pending", nullable=False)
+    size_bytes = Column(BigInteger, default=0, nullable=False)
+    bytes_processed = Column(BigInteger, default=0, nullable=False)
+    rows_processed = Column(Integer, default=0, nullable=False)
+    created_count = Column(Integer, default=0, nullable=False)
+    duplicate_count = Column(Integer, default=0, nullable=False)
+    error_count = Column(Integer, default=0, nullable=False)
+    error_bytes = Column(BigInteger, default=0, nullable=False)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    @property
+    def progress(self) -> float:
+        """Share of the uploaded file processed, from 0.0 to 1.0."""
+        if not self.size_bytes:
+            return 1.0 if self.status == "completed" else 0.0
+        return min(1.0, self.bytes_processed / self.size_bytes)
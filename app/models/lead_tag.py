@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from app.core.database import Base
+
+
+class LeadTag(Base):
+    """One normalized tag of a lead; ``Lead.tags`` keeps the display text.
+
+    ``company_id`` and ``lead_created_at`` are copied from the lead so tag-filtered
+    listings and per-tag counts are answered from one index without touching ``leads``.
+    """
+
+    __tablename__ = "lead_tags"
+    __table_args__ = (
+        Index(
+            "ix_lead_tags_company_id_tag_lead_created_at",
+            "company_id",
+            "tag",
+            "lead_created_at",
+            "lead_id",
+        ),
+    )
+
+    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String, primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
+    lead_created_at = Column(DateTime, nullable=False)
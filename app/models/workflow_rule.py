@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class WorkflowRule(Base):
+    __tablename__ = "workflow_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), index=True, nullable=False)
+    name = Column(String, nullable=False)
+    priority = Column(Integer, default=100, nullable=False)
+    enabled = Column(Boolean, default=True, nullable=False)
+    stop_processing = Column(Boolean, default=False, nullable=False)
+    conditions = Column(JSON, default=dict, nullable=False)
+    actions = Column(JSON, default=dict, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    company = relationship("Company", back_populates="workflow_rules")
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import require_admin
+from app.schemas.activity import ArchivedActivityMonth
+from app.services.activity_archive import (
+    archived_entry_files,
+    iter_archived_entries,
+    list_archived_months,
+)
+
+router = APIRouter(prefix="/activity", tags=["activity"])
+
+
+@router.get("/archive/months", response_model=list[ArchivedActivityMonth])
+def get_archived_months(current_user=Depends(require_admin)) -> list[ArchivedActivityMonth]:
+    return list_archived_months(current_user.company_id)
+
+
+@router.get("/archive")
+def stream_archived_activity(
+    month: str = Query(pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    current_user=Depends(require_admin),
+) -> StreamingResponse:
+    paths = archived_entry_files(current_user.company_id, month)
+    if paths is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="No archived activity for this month"
+        )
+    return StreamingResponse(iter_archived_entries(paths), media_type="application/x-ndjson")
@@ -9,6 +9,7 @@ from app.schemas.auto_reply_template import (
     AutoReplyTemplateUpdate,
 )
 from app.services.activity_service import log_activity
+from app.services.template_cache import invalidate_template_cache
 
 router = APIRouter(prefix="/auto-replies", tags=["auto-replies"])
 
@@ -28,6 +29,7 @@ def create_template(
     db.add(template)
     db.commit()
     db.refresh(template)
+    invalidate_template_cache(current_user.company_id)
     log_activity(
         db,
         action="create",
@@ -81,6 +83,7 @@ def update_template(
     db.add(template)
     db.commit()
     db.refresh(template)
+    invalidate_template_cache(current_user.company_id)
     log_activity(
         db,
         action="update",
@@ -111,6 +114,7 @@ def delete_template(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
     db.delete(template)
     db.commit()
+    invalidate_template_cache(current_user.company_id)
     log_activity(
         db,
         action="delete",
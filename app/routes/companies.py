@@ -1,8 +1,7 @@
-import secrets
-
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
+from app.core.api_keys import invalidate_api_keys, issue_api_key
 from app.core.deps import get_db, require_admin
 from app.models.company import Company
 from app.schemas.company import CompanyRead, CompanyUpdate
@@ -51,10 +50,11 @@ def rotate_company_key(
     current_user=Depends(require_admin),
 ) -> CompanyRead:
     company = db.query(Company).filter(Company.id == current_user.company_id).first()
-    company.api_key = secrets.token_urlsafe(24)
+    issue_api_key(company)
     db.add(company)
     db.commit()
     db.refresh(company)
+    invalidate_api_keys()
     log_activity(
         db,
         action="update",
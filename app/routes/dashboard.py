@@ -1,10 +1,11 @@
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db
+from app.core.database import begin_snapshot
+from app.core.deps import get_current_user_async, get_read_db
 
 from app.models.activity_log import ActivityLog
 from app.models.email_message import EmailMessage
@@ -21,6 +22,13 @@ from app.schemas.dashboard import (
     DashboardUrgentResponse,
     LeadStatusFunnelItem,
 )
+from app.services.daily_stats_service import (
+    EMAILS_BY_CATEGORY,
+    LEADS_CREATED,
+    REPLIES_BY_STATUS,
+    load_company_stats,
+)
+from app.services.dashboard_cache import cached_dashboard_response
 from app.services.email_analysis_service import classify_category
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
@@ -48,52 +56,61 @@ def _format_activity(entry: ActivityLog) -> DashboardActivityItem:
     )
 
 
-@router.get("/stats", response_model=DashboardStats)
-def get_stats(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-) -> DashboardStats:
-    total_leads = db.query(Lead).filter(Lead.company_id == current_user.company_id).count()
+async def _compute_stats(db: AsyncSession, company_id: int | None) -> DashboardStats:
     today = datetime.utcnow() - timedelta(days=1)
-    leads_today = (
-        db.query(Lead)
-        .filter(Lead.company_id == current_user.company_id, Lead.created_at >= today)
-        .count()
+    lead_counts = (
+        select(
+            func.count(Lead.id).label("total"),
+            func.count(Lead.id).filter(Lead.created_at >= today).label("today"),
+        )
+        .where(Lead.company_id == company_id)
+        .subquery()
     )
     emails_today = (
-        db.query(EmailMessage)
-        .filter(EmailMessage.company_id == current_user.company_id, EmailMessage.received_at >= today)
-        .count()
+        select(func.count(EmailMessage.id))
+        .where(EmailMessage.company_id == company_id, EmailMessage.received_at >= today)
+        .scalar_subquery()
     )
     replies_sent = (
-        db.query(EmailReply)
-        .join(EmailMessage, EmailReply.email_id == EmailMessage.id)
-        .filter(
-            EmailMessage.company_id == current_user.company_id,
-            EmailReply.send_status == "sent",
-        )
-        .count()
+        select(func.count(EmailReply.id))
+        .where(EmailReply.company_id == company_id, EmailReply.send_status == "sent")
+        .scalar_subquery()
     )
-    return DashboardStats(
-        total_leads=total_leads,
-        leads_today=leads_today,
-        emails_today=emails_today,
-        replies_sent=replies_sent,
+    counts = (
+        await db.execute(
+            select(
+                lead_counts.c.total.label("total_leads"),
+                lead_counts.c.today.label("leads_today"),
+                emails_today.label("emails_today"),
+                replies_sent.label("replies_sent"),
+            )
+        )
+    ).one()
+    return DashboardStats(**counts._mapping)
+
+
+@router.get("/stats", response_model=DashboardStats)
+async def get_stats(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> DashboardStats:
+    company_id = current_user.company_id
+    return await cached_dashboard_response(
+        company_id, "stats", DashboardStats, lambda: _compute_stats(db, company_id)
     )
 
 
-@router.get("/activity", response_model=DashboardActivityResponse)
-def get_activity(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+async def _compute_activity(
+    db: AsyncSession, company_id: int | None
 ) -> DashboardActivityResponse:
     logs = (
-        db.query(ActivityLog)
-        .filter(ActivityLog.company_id == current_user.company_id)
-        .order_by(ActivityLog.created_at.desc())
-        .limit(20)
-        .all()
-    )
+        await db.scalars(
+            select(ActivityLog)
+            .where(ActivityLog.company_id == company_id)
+            .order_by(ActivityLog.created_at.desc())
+            .limit(20)
+        )
+    ).all()
     ai_logs = [
         log
         for log in logs
@@ -106,37 +123,44 @@ def get_activity(
     )
 
 
-@router.get("/urgent", response_model=DashboardUrgentResponse)
-def get_urgent_items(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-) -> DashboardUrgentResponse:
-    now = datetime.utcnow()
-    pending_replies = (
-        db.query(EmailReply)
-        .join(EmailMessage, EmailReply.email_id == EmailMessage.id)
-        .filter(
-            EmailMessage.company_id == current_user.company_id,
-            EmailReply.send_status == "pending",
-        )
-        .count()
+@router.get("/activity", response_model=DashboardActivityResponse)
+async def get_activity(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> DashboardActivityResponse:
+    company_id = current_user.company_id
+    return await cached_dashboard_response(
+        company_id, "activity", DashboardActivityResponse, lambda: _compute_activity(db, company_id)
     )
-    stale_leads = (
-        db.query(Lead)
-        .filter(
-            Lead.company_id == current_user.company_id,
-            Lead.status == "new",
-            Lead.created_at <= now - timedelta(hours=24),
+
+
+async def _compute_urgent(db: AsyncSession, company_id: int | None) -> DashboardUrgentResponse:
+    now = datetime.utcnow()
+    pending_replies, stale_leads = (
+        await db.execute(
+            select(
+                select(func.count(EmailReply.id))
+                .where(
+                    EmailReply.company_id == company_id,
+                    EmailReply.send_status == "pending",
+                )
+                .scalar_subquery(),
+                select(func.count(Lead.id))
+                .where(
+                    Lead.company_id == company_id,
+                    Lead.status == "new",
+                    Lead.created_at <= now - timedelta(hours=24),
+                )
+                .scalar_subquery(),
+            )
         )
-        .count()
-    )
+    ).one()
 
-    recent_emails = (
-        db.query(EmailMessage)
-        .filter(EmailMessage.company_id == current_user.company_id)
+    recent_emails = await db.execute(
+        select(EmailMessage.subject, EmailMessage.body)
+        .where(EmailMessage.company_id == company_id)
         .order_by(EmailMessage.received_at.desc())
         .limit(10)
-        .all()
     )
     low_confidence = 0
     for email in recent_emails:
@@ -164,124 +188,74 @@ def get_urgent_items(
     return DashboardUrgentResponse(items=items)
 
 
-@router.get("/summary", response_model=DashboardSummary)
-def get_dashboard_summary(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-) -> DashboardSummary:
+@router.get("/urgent", response_model=DashboardUrgentResponse)
+async def get_urgent_items(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> DashboardUrgentResponse:
+    company_id = current_user.company_id
+    return await cached_dashboard_response(
+        company_id, "urgent", DashboardUrgentResponse, lambda: _compute_urgent(db, company_id)
+    )
+
+
+async def _compute_summary(db: AsyncSession, company_id: int | None) -> DashboardSummary:
     now = datetime.utcnow()
     last_24h = now - timedelta(days=1)
-    last_30_days = now - timedelta(days=30)
-
-    total_leads = db.query(func.count(Lead.id)).filter(Lead.company_id == current_user.company_id).scalar() or 0
-    leads_today = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.company_id == current_user.company_id, Lead.created_at >= last_24h)
-        .scalar()
-        or 0
-    )
-    emails_processed = (
-        db.query(func.count(EmailMessage.id))
-        .filter(
-            EmailMessage.company_id == current_user.company_id,
-            EmailMessage.received_at >= last_24h,
-        )
-        .scalar()
-        or 0
-    )
-    emails_processed_30d = (
-        db.query(func.count(EmailMessage.id))
-        .filter(
-            EmailMessage.company_id == current_user.company_id,
-            EmailMessage.received_at >= last_30_days,
-        )
-        .scalar()
-        or 0
-    )
-    ai_replies_sent = (
-        db.query(func.count(EmailReply.id))
-        .join(EmailMessage, EmailReply.email_id == EmailMessage.id)
-        .filter(
-            EmailMessage.company_id == current_user.company_id,
-            EmailReply.send_status == "sent",
-            EmailReply.created_at >= last_24h,
-        )
-        .scalar()
-        or 0
-    )
-    ai_replies_sent_30d = (
-        db.query(func.count(EmailReply.id))
-        .join(EmailMessage, EmailReply.email_id == EmailMessage.id)
-        .filter(
-            EmailMessage.company_id == current_user.company_id,
-            EmailReply.send_status == "sent",
-            EmailReply.created_at >= last_30_days,
-        )
-        .scalar()
-        or 0
-    )
-    leads_generated_30d = (
-        db.query(func.count(Lead.id))
-        .filter(Lead.company_id == current_user.company_id, Lead.created_at >= last_30_days)
-        .scalar()
-        or 0
-    )
+    today = now.date()
 
-    open_leads = (
-        db.query(func.count(Lead.id))
-        .filter(
-            Lead.company_id == current_user.company_id,
-            Lead.status.notin_(["closed", "won", "lost"]),
+    # KPIs, trend, categories, funnel and activity all read the same snapshot.
+    await begin_snapshot(db)
+    # Rolling 24h windows straddle two rollup days, so they stay on index range scans,
+    # batched into one round trip.
+    leads_today, emails_processed, ai_replies_sent = (
+        await db.execute(
+            select(
+                select(func.count(Lead.id))
+                .where(Lead.company_id == company_id, Lead.created_at >= last_24h)
+                .scalar_subquery(),
+                select(func.count(EmailMessage.id))
+                .where(
+                    EmailMessage.company_id == company_id,
+                    EmailMessage.received_at >= last_24h,
+                )
+                .scalar_subquery(),
+                select(func.count(EmailReply.id))
+                .where(
+                    EmailReply.company_id == company_id,
+                    EmailReply.send_status == "sent",
+                    EmailReply.created_at >= last_24h,
+                )
+                .scalar_subquery(),
+            )
         )
-        .scalar()
-        or 0
-    )
+    ).one()
+    stats = await load_company_stats(db, company_id, since=today - timedelta(days=29))
+    status_map = stats.lead_status_counts
 
     kpis = DashboardKpis(
-        total_leads=total_leads,
+        total_leads=sum(status_map.values()),
         leads_today=leads_today,
         emails_processed=emails_processed,
         ai_replies_sent=ai_replies_sent,
-        pending_actions=open_leads,
-        emails_processed_30d=emails_processed_30d,
-        ai_replies_sent_30d=ai_replies_sent_30d,
-        leads_generated_30d=leads_generated_30d,
+        pending_actions=sum(
+            count
+            for status, count in status_map.items()
+            if status not in {"closed", "won", "lost"}
+        ),
+        emails_processed_30d=stats.total(EMAILS_BY_CATEGORY),
+        ai_replies_sent_30d=stats.total(REPLIES_BY_STATUS, ["sent"]),
+        leads_generated_30d=stats.total(LEADS_CREATED),
     )
 
-    today = now.date()
     start_date = today - timedelta(days=6)
-    start_datetime = datetime.combine(start_date, datetime.min.time())
-    lead_counts = (
-        db.query(func.date(Lead.created_at), func.count(Lead.id))
-        .filter(
-            Lead.company_id == current_user.company_id,
-            Lead.created_at >= start_datetime,
-        )
-        .group_by(func.date(Lead.created_at))
-        .all()
-    )
-    lead_count_map: dict[datetime.date, int] = {}
-    for record_date, count in lead_counts:
-        if isinstance(record_date, str):
-            record_date = datetime.strptime(record_date, "%Y-%m-%d").date()
-        lead_count_map[record_date] = count
+    lead_count_map = stats.by_day(LEADS_CREATED, since=start_date)
     lead_trend = [
         {"date": day, "count": int(lead_count_map.get(day, 0))}
         for day in (start_date + timedelta(days=i) for i in range(7))
     ]
 
-    emails_query = (
-        db.query(EmailMessage)
-        .filter(
-            EmailMessage.company_id == current_user.company_id,
-            EmailMessage.received_at >= last_30_days,
-        )
-        .all()
-    )
-    category_counts: dict[str, int] = {}
-    for email in emails_query:
-        category, _ = classify_category(email.subject, email.body)
-        category_counts[category] = category_counts.get(category, 0) + 1
+    category_counts = stats.by_dimension(EMAILS_BY_CATEGORY)
     if not category_counts:
         category_counts = {"Other": 0}
     email_category_breakdown = [
@@ -289,13 +263,6 @@ def get_dashboard_summary(
         for category, count in sorted(category_counts.items(), key=lambda item: item[1], reverse=True)
     ]
 
-    status_counts = (
-        db.query(Lead.status, func.count(Lead.id))
-        .filter(Lead.company_id == current_user.company_id)
-        .group_by(Lead.status)
-        .all()
-    )
-    status_map = {status: count for status, count in status_counts}
     status_order = ["new", "contacted", "qualified", "closed", "won", "lost"]
     status_total = sum(status_map.values()) or 0
     lead_status_funnel = [
@@ -310,12 +277,11 @@ def get_dashboard_summary(
         if status_map.get(status, 0) or status_total
     ]
 
-    logs = (
-        db.query(ActivityLog)
-        .filter(ActivityLog.company_id == current_user.company_id)
+    logs = await db.scalars(
+        select(ActivityLog)
+        .where(ActivityLog.company_id == company_id)
         .order_by(ActivityLog.created_at.desc())
         .limit(10)
-        .all()
     )
 
     charts = DashboardCharts(
@@ -328,3 +294,14 @@ def get_dashboard_summary(
         charts=charts,
         recent_activity=[_format_activity(entry) for entry in logs],
     )
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> DashboardSummary:
+    company_id = current_user.company_id
+    return await cached_dashboard_response(
+        company_id, "summary", DashboardSummary, lambda: _compute_summary(db, company_id)
+    )
@@ -1,21 +1,38 @@
 import logging
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.orm import joinedload
-
-from app.core.deps import get_current_user, get_db
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.core.deps import (
+    get_async_db,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+    get_read_db,
+)
+from app.core.fulltext import search_terms
+from app.core.pagination import PageParams, count_statement, finish_page, keyset_page, page_params
 from app.models.company import Company
 from app.models.email_message import EmailMessage
 from app.schemas.email_message import (
     EmailAnalysis,
     EmailMessageRead,
+    EmailReplyRead,
     EmailReplyGenerated,
     EmailThreadRead,
 )
 from app.services.activity_service import log_activity
 from app.services.auto_reply_service import generate_ai_reply_from_template, get_template
-from app.services.email_analysis_service import analyze_email, classify_category, classify_priority
+from app.services.email_analysis_service import (
+    analyze_email,
+    classify_category,
+    email_classification,
+)
+from app.services.email_search import EmailSearchFilters, email_search_statement
 from app.services.email_service import create_email_reply
 from app.services.llm_service import generate_ai_reply
 
@@ -23,54 +40,8 @@ router = APIRouter(prefix="/emails", tags=["emails"])
 logger = logging.getLogger("app.emails")
 
 
-@router.get("/", response_model=list[EmailMessageRead])
-def list_emails(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-) -> list[EmailMessageRead]:
-    emails = (
-        db.query(EmailMessage)
-        .options(joinedload(EmailMessage.replies))
-        .filter(EmailMessage.company_id == current_user.company_id)
-        .order_by(EmailMessage.received_at.desc())
-        .all()
-    )
-    results: list[EmailMessageRead] = []
-    for email in emails:
-        category, confidence = classify_category(email.subject, email.body)
-        priority = classify_priority(email.subject, email.body)
-        preview = " ".join(email.body.split())[:140]
-        status = "processed" if email.processed else "new"
-        data = EmailMessageRead.model_validate(email, from_attributes=True).model_dump()
-        data.update(
-            {
-                "preview": preview,
-                "status": status,
-                "category": category,
-                "priority": priority,
-                "confidence": confidence,
-            }
-        )
-        results.append(EmailMessageRead(**data))
-    return results
-
-
-@router.get("/{email_id}", response_model=EmailThreadRead)
-def get_email_thread(
-    email_id: int,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-) -> EmailThreadRead:
-    email = (
-        db.query(EmailMessage)
-        .options(joinedload(EmailMessage.replies))
-        .filter(EmailMessage.id == email_id, EmailMessage.company_id == current_user.company_id)
-        .first()
-    )
-    if not email:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Email not found")
-    category, confidence = classify_category(email.subject, email.body)
-    priority = classify_priority(email.subject, email.body)
+def _email_read(email: EmailMessage) -> EmailMessageRead:
+    category, priority, confidence = email_classification(email)
     preview = " ".join(email.body.split())[:140]
     status = "processed" if email.processed else "new"
     data = EmailMessageRead.model_validate(email, from_attributes=True).model_dump()
@@ -83,7 +54,87 @@ def get_email_thread(
             "confidence": confidence,
         }
     )
-    return EmailThreadRead(email=EmailMessageRead(**data))
+    return EmailMessageRead(**data)
+
+
+@router.get("/", response_model=list[EmailMessageRead])
+async def list_emails(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> list[EmailMessageRead]:
+    statement = select(EmailMessage).where(EmailMessage.company_id == current_user.company_id)
+    total = await db.scalar(count_statement(statement)) if page.include_total else None
+    rows = (
+        await db.scalars(
+            keyset_page(statement, EmailMessage.received_at, EmailMessage.id, page).options(
+                selectinload(EmailMessage.replies)
+            )
+        )
+    ).all()
+    emails = finish_page(response, rows, page, "received_at", total)
+    return [_email_read(email) for email in emails]
+
+
+@router.get("/search", response_model=list[EmailMessageRead])
+async def search_emails(
+    response: Response,
+    q: str | None = Query(default=None, max_length=200),
+    category: str | None = Query(default=None),
+    priority: str | None = Query(default=None),
+    routed_to: str | None = Query(default=None),
+    processed: bool | None = Query(default=None),
+    received_from: datetime | None = Query(default=None),
+    received_to: datetime | None = Query(default=None),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> list[EmailMessageRead]:
+    terms = search_terms(q) if q else []
+    if q and not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain letters or digits",
+        )
+    filters = EmailSearchFilters(
+        category=category,
+        priority=priority,
+        routed_to=routed_to,
+        processed=processed,
+        received_from=received_from,
+        received_to=received_to,
+    )
+    statement = email_search_statement(
+        db.bind.dialect.name, current_user.company_id, terms, filters
+    )
+    total = await db.scalar(count_statement(statement)) if page.include_total else None
+    rows = (
+        await db.scalars(
+            keyset_page(statement, EmailMessage.received_at, EmailMessage.id, page).options(
+                selectinload(EmailMessage.replies)
+            )
+        )
+    ).all()
+    emails = finish_page(response, rows, page, "received_at", total)
+    return [_email_read(email) for email in emails]
+
+
+@router.get("/{email_id}", response_model=EmailThreadRead)
+async def get_email_thread(
+    email_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+) -> EmailThreadRead:
+    result = await db.execute(
+        select(EmailMessage)
+        .options(selectinload(EmailMessage.replies))
+        .where(EmailMessage.id == email_id, EmailMessage.company_id == current_user.company_id)
+    )
+    email = result.scalar_one_or_none()
+    if not email:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Email not found")
+    return EmailThreadRead(email=_email_read(email))
 
 
 @router.get("/{email_id}/analysis", response_model=EmailAnalysis)
@@ -170,7 +221,9 @@ def generate_email_reply(
     )
 
     category, confidence = classify_category(email.subject, email.body)
-    return EmailReplyGenerated(reply=reply, confidence=confidence)
+    return EmailReplyGenerated(
+        reply=EmailReplyRead.model_validate(reply, from_attributes=True), confidence=confidence
+    )
 
 
 @router.post("/{email_id}/regenerate-reply", response_model=EmailReplyGenerated)
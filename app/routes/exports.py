@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import get_current_user_async, require_admin
+from app.services.exports import (
+    ACTIVITY_COLUMNS,
+    EMAIL_COLUMNS,
+    EMAIL_CSV_COLUMNS,
+    LEAD_COLUMNS,
+    ExportRange,
+    RowSource,
+    activity_rows,
+    email_rows,
+    lead_rows,
+    stream_export,
+)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+ExportFormat = Literal["csv", "ndjson"]
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _period(start: datetime | None, end: datetime | None) -> ExportRange:
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="The range must end after it starts"
+        )
+    return ExportRange(start=start, end=end)
+
+
+def _export_response(
+    name: str,
+    source: RowSource,
+    file_format: ExportFormat,
+    columns: tuple[str, ...],
+    compress: bool,
+) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d%H%M%S}.{file_format}"
+    media_type = MEDIA_TYPES[file_format]
+    if compress:
+        filename, media_type = f"{filename}.gz", "application/gzip"
+    return StreamingResponse(
+        stream_export(source, file_format, columns, compress=compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/leads")
+async def export_leads(
+    file_format: ExportFormat = Query(default="csv", alias="format"),
+    compress: bool = Query(default=False, alias="gzip"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user=Depends(get_current_user_async),
+) -> StreamingResponse:
+    source = lead_rows(current_user.company_id, _period(created_from, created_to))
+    return _export_response("leads", source, file_format, LEAD_COLUMNS, compress)
+
+
+@router.get("/emails")
+async def export_emails(
+    file_format: ExportFormat = Query(default="csv", alias="format"),
+    compress: bool = Query(default=False, alias="gzip"),
+    received_from: datetime | None = None,
+    received_to: datetime | None = None,
+    current_user=Depends(get_current_user_async),
+) -> StreamingResponse:
+    """Emails with their replies: nested in NDJSON, one line per reply in CSV."""
+    period = _period(received_from, received_to)
+    source = email_rows(current_user.company_id, period, flatten=file_format == "csv")
+    columns = EMAIL_CSV_COLUMNS if file_format == "csv" else EMAIL_COLUMNS
+    return _export_response("emails", source, file_format, columns, compress)
+
+
+@router.get("/activity")
+async def export_activity(
+    file_format: ExportFormat = Query(default="csv", alias="format"),
+    compress: bool = Query(default=False, alias="gzip"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    current_user=Depends(require_admin),
+) -> StreamingResponse:
+    source = activity_rows(current_user.company_id, _period(created_from, created_to))
+    return _export_response("activity", source, file_format, ACTIVITY_COLUMNS, compress)
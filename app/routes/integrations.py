@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user, get_db, require_admin
+from app.core.pagination import PageParams, count_statement, finish_page, keyset_page, page_params
+from app.models.email_integration import EmailIntegration
 from app.schemas.email_integration import EmailIntegrationConnect, EmailIntegrationStatus
-from app.services.email_integration_service import list_email_integrations, upsert_email_integration
+from app.services.email_integration_service import upsert_email_integration
 
 router = APIRouter(prefix="/integrations", tags=["integrations"])
 
@@ -24,7 +27,16 @@ def connect_email_integration(
 
 @router.get("/email/status", response_model=list[EmailIntegrationStatus])
 def email_integration_status(
+    response: Response,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ) -> list[EmailIntegrationStatus]:
-    return list_email_integrations(db, current_user.company_id)
+    statement = select(EmailIntegration).where(
+        EmailIntegration.company_id == current_user.company_id
+    )
+    total = db.scalar(count_statement(statement)) if page.include_total else None
+    rows = db.scalars(
+        keyset_page(statement, EmailIntegration.created_at, EmailIntegration.id, page)
+    ).all()
+    return finish_page(response, rows, page, "created_at", total)
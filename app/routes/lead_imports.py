@@ -0,0 +1,106 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_current_user, get_db
+from app.models.lead_import import LeadImport
+from app.schemas.lead_import import LeadImportRead
+from app.services.lead_import import (
+    FORMATS,
+    create_lead_import,
+    detect_format,
+    error_path,
+    resume_lead_import,
+)
+from app.tasks import import_leads_task
+
+router = APIRouter(prefix="/leads/imports", tags=["leads"])
+
+ERROR_CHUNK_BYTES = 64 * 1024
+
+
+def _get_company_import(db: Session, import_id: int, company_id: int) -> LeadImport:
+    lead_import = db.get(LeadImport, import_id)
+    if lead_import is None or lead_import.company_id != company_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+    return lead_import
+
+
+def _read_prefix(path: Path, size: int) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        while size > 0:
+            chunk = handle.read(min(ERROR_CHUNK_BYTES, size))
+            if not chunk:
+                return
+            size -= len(chunk)
+            yield chunk
+
+
+@router.post("", response_model=LeadImportRead, status_code=status.HTTP_202_ACCEPTED)
+def upload_lead_import(
+    file: UploadFile = File(...),
+    file_format: str | None = Query(default=None, alias="format"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> LeadImport:
+    file_format = file_format or detect_format(file.filename or "")
+    if file_format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload a .csv or .ndjson file, or pass format=csv|ndjson",
+        )
+    lead_import = create_lead_import(
+        db,
+        company_id=current_user.company_id,
+        user_id=current_user.id,
+        filename=file.filename or f"leads.{file_format}",
+        file_format=file_format,
+        upload=file.file,
+    )
+    import_leads_task.delay(lead_import.id)
+    db.refresh(lead_import)
+    return lead_import
+
+
+@router.get("/{import_id}", response_model=LeadImportRead)
+def get_lead_import(
+    import_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> LeadImport:
+    return _get_company_import(db, import_id, current_user.company_id)
+
+
+@router.get("/{import_id}/errors")
+def get_lead_import_errors(
+    import_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> StreamingResponse:
+    """Rejected rows as NDJSON (``row``, ``errors``), up to the last committed chunk."""
+    lead_import = _get_company_import(db, import_id, current_user.company_id)
+    path = error_path(lead_import)
+    size = lead_import.error_bytes if path.exists() else 0
+    return StreamingResponse(_read_prefix(path, size), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/{import_id}/resume", response_model=LeadImportRead, status_code=status.HTTP_202_ACCEPTED
+)
+def resume_company_lead_import(
+    import_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+) -> LeadImport:
+    lead_import = _get_company_import(db, import_id, current_user.company_id)
+    if not resume_lead_import(db, lead_import):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only failed or stalled imports can be resumed",
+        )
+    import_leads_task.delay(lead_import.id)
+    db.refresh(lead_import)
+    return lead_import
@@ -1,41 +1,131 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import (
+    get_async_db,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+    get_read_db,
+)
+from app.core.config import settings
+from app.core.fulltext import search_terms
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    PageParams,
+    count_statement,
+    decode_score_cursor,
+    encode_score_cursor,
+    finish_page,
+    keyset_page,
+    page_params,
+)
 from app.models.lead import Lead
+from app.models.lead_tag import LeadTag
 from app.models.email_message import EmailMessage
-from app.schemas.lead import LeadCreate, LeadEmailRead, LeadRead, LeadStatusUpdate, LeadUpdate
+from app.schemas.lead import (
+    LeadCreate,
+    LeadEmailRead,
+    LeadRead,
+    LeadStatusUpdate,
+    LeadTagCount,
+    LeadUpdate,
+)
 from app.services.activity_service import log_activity
-from app.services.lead_service import create_lead, list_leads, update_lead
+from app.services.daily_stats_service import record_lead_status_change
+from app.services.lead_search import search_leads
+from app.services.lead_service import create_lead, normalize_tag, update_lead
 
 router = APIRouter(prefix="/leads", tags=["leads"])
 logger = logging.getLogger("app.leads")
 
 
+async def _get_company_lead(db: AsyncSession, lead_id: int, company_id: int | None) -> Lead:
+    lead = (
+        await db.execute(select(Lead).where(Lead.id == lead_id, Lead.company_id == company_id))
+    ).scalar_one_or_none()
+    if not lead:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
+    return lead
+
+
 @router.get("/", response_model=list[LeadRead])
-def get_leads(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+async def get_leads(
+    response: Response,
+    tag: str | None = Query(default=None, min_length=1),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
 ) -> list[LeadRead]:
-    return list_leads(db, current_user.company_id)
+    if tag is None:
+        statement = select(Lead).where(Lead.company_id == current_user.company_id)
+        sort_column, id_column = Lead.created_at, Lead.id
+    else:
+        # Walk the (company_id, tag, lead_created_at, lead_id) index and join leads by id.
+        statement = (
+            select(Lead)
+            .join(LeadTag, LeadTag.lead_id == Lead.id)
+            .where(
+                LeadTag.company_id == current_user.company_id,
+                LeadTag.tag == normalize_tag(tag),
+            )
+        )
+        sort_column, id_column = LeadTag.lead_created_at, LeadTag.lead_id
+    total = await db.scalar(count_statement(statement)) if page.include_total else None
+    rows = (await db.scalars(keyset_page(statement, sort_column, id_column, page))).all()
+    return finish_page(response, rows, page, "created_at", total)
+
+
+@router.get("/tags", response_model=list[LeadTagCount])
+async def get_lead_tag_counts(
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> list[LeadTagCount]:
+    count = func.count().label("count")
+    rows = await db.execute(
+        select(LeadTag.tag, count)
+        .where(LeadTag.company_id == current_user.company_id)
+        .group_by(LeadTag.tag)
+        .order_by(count.desc(), LeadTag.tag)
+    )
+    return [LeadTagCount(tag=tag, count=tag_count) for tag, tag_count in rows.all()]
+
+
+@router.get("/search", response_model=list[LeadRead])
+async def search_company_leads(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
+) -> list[LeadRead]:
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain letters or digits",
+        )
+    page_size = min(limit or settings.page_size_default, settings.page_size_max)
+    after = decode_score_cursor(cursor) if cursor else None
+    rows = await search_leads(db, current_user.company_id, terms, page_size, after)
+    if len(rows) > page_size:
+        last_lead, last_score = rows[page_size - 1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_score_cursor(last_score, last_lead.id)
+    return [lead for lead, _ in rows[:page_size]]
 
 
 @router.get("/{lead_id}", response_model=LeadRead)
-def get_lead(
+async def get_lead(
     lead_id: int,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
 ) -> LeadRead:
-    lead = (
-        db.query(Lead)
-        .filter(Lead.id == lead_id, Lead.company_id == current_user.company_id)
-        .first()
-    )
-    if not lead:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
-    return lead
+    return await _get_company_lead(db, lead_id, current_user.company_id)
 
 
 @router.post("/", response_model=LeadRead, status_code=status.HTTP_201_CREATED)
@@ -100,6 +190,7 @@ def update_lead_status_only(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
     previous_status = lead.status
     lead.status = payload.status
+    record_lead_status_change(db, lead, previous_status)
     db.add(lead)
     db.commit()
     db.refresh(lead)
@@ -126,36 +217,33 @@ def update_lead_status_only(
 
 
 @router.get("/{lead_id}/emails", response_model=list[LeadEmailRead])
-def get_lead_emails(
+async def get_lead_emails(
     lead_id: int,
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user_async),
 ) -> list[LeadEmailRead]:
-    lead = (
-        db.query(Lead)
-        .filter(Lead.id == lead_id, Lead.company_id == current_user.company_id)
-        .first()
+    await _get_company_lead(db, lead_id, current_user.company_id)
+    statement = select(
+        EmailMessage.id, EmailMessage.subject, EmailMessage.received_at, EmailMessage.body
+    ).where(
+        EmailMessage.lead_id == lead_id,
+        EmailMessage.company_id == current_user.company_id,
     )
-    if not lead:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
-    emails = (
-        db.query(EmailMessage)
-        .filter(
-            EmailMessage.lead_id == lead_id,
-            EmailMessage.company_id == current_user.company_id,
+    total = await db.scalar(count_statement(statement)) if page.include_total else None
+    rows = (
+        await db.execute(
+            keyset_page(statement, EmailMessage.received_at, EmailMessage.id, page)
         )
-        .order_by(EmailMessage.received_at.desc())
-        .all()
-    )
-    results = []
-    for email in emails:
-        preview = " ".join(email.body.split())[:120]
-        results.append(
-            LeadEmailRead(
-                id=email.id,
-                subject=email.subject,
-                received_at=email.received_at,
-                preview=preview,
-            )
+    ).all()
+    emails = finish_page(response, rows, page, "received_at", total)
+    return [
+        LeadEmailRead(
+            id=email.id,
+            subject=email.subject,
+            received_at=email.received_at,
+            preview=" ".join(email.body.split())[:120],
         )
-    return results
+        for email in emails
+    ]
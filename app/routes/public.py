@@ -1,14 +1,28 @@
+import json
 import logging
+from collections.abc import AsyncIterator
+from typing import Any
 
-from fastapi import APIRouter, Depends, status
+from celery import group
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.deps import get_company_from_api_key, get_db
-from app.schemas.email_message import EmailMessageCreate, EmailReceiveResponse
-from app.schemas.lead import LeadCreate, LeadCreateResponse
-from app.services.activity_service import log_activity
+from app.schemas.email_message import (
+    EmailBatchItemError,
+    EmailBatchItemResult,
+    EmailBatchResponse,
+    EmailMessageCreate,
+    EmailMessageRead,
+    EmailReceiveResponse,
+)
+from app.schemas.lead import LeadCreate, LeadCreateResponse, LeadRead
+from app.services.activity_service import log_activities, log_activity
 from app.services.auto_reply_service import generate_reply, get_template
-from app.services.email_service import receive_email
+from app.services.email_service import receive_email, receive_emails
 from app.services.lead_service import create_lead
+from app.services.workflow_engine import apply_workflow_decision, evaluate_inbound_email
 from app.tasks import generate_email_reply_task
 
 router = APIRouter(tags=["public"])
@@ -43,7 +57,9 @@ def create_public_lead(
     auto_reply = None
     if template:
         auto_reply = generate_reply(template, {"name": lead.name, "email": lead.email})
-    return LeadCreateResponse(lead=lead, auto_reply=auto_reply)
+    return LeadCreateResponse(
+        lead=LeadRead.model_validate(lead, from_attributes=True), auto_reply=auto_reply
+    )
 
 
 @router.post("/webhook/email", response_model=EmailReceiveResponse)
@@ -52,7 +68,9 @@ def receive_incoming_email(
     company=Depends(get_company_from_api_key),
     db: Session = Depends(get_db),
 ) -> EmailReceiveResponse:
-    email, _ = receive_email(db, EmailMessageCreate(**email_in.dict(), company_id=company.id))
+    email, lead_status = receive_email(
+        db, EmailMessageCreate(**email_in.dict(exclude={"company_id"}), company_id=company.id)
+    )
     log_activity(
         db,
         action="create",
@@ -71,5 +89,192 @@ def receive_incoming_email(
         },
     )
 
-    generate_email_reply_task.delay(email.id, company.id)
-    return EmailReceiveResponse(email=email, auto_reply=None)
+    decision = evaluate_inbound_email(db, email, lead_status)
+    apply_workflow_decision(db, email, decision)
+    if decision.route_to:
+        log_activity(
+            db,
+            action="route",
+            entity_type="email",
+            entity_id=email.id,
+            company_id=company.id,
+            description=f"Email routed to {decision.route_to}",
+        )
+    if decision.skip_ai:
+        logger.info(
+            "ai.reply.skipped",
+            extra={"email_id": email.id, "company_id": company.id, "reason": "workflow_rule"},
+        )
+    else:
+        generate_email_reply_task.delay(email.id, company.id, auto_send=decision.auto_send)
+    return EmailReceiveResponse(
+        email=EmailMessageRead.model_validate(email, from_attributes=True), auto_reply=None
+    )
+
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+_MALFORMED_LINE = object()
+
+
+def _ndjson_item(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return _MALFORMED_LINE
+
+
+def _batch_too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+def _check_item_count(items: list[Any]) -> None:
+    if len(items) > settings.webhook_email_batch_max_items:
+        raise _batch_too_large(
+            f"A batch may contain at most {settings.webhook_email_batch_max_items} emails"
+        )
+
+
+async def _body_chunks(request: Request) -> AsyncIterator[bytes]:
+    """The request body as it arrives, cut off at ``WEBHOOK_EMAIL_BATCH_MAX_BYTES``."""
+    max_bytes = settings.webhook_email_batch_max_bytes
+    too_large = f"A batch body may be at most {max_bytes} bytes"
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise _batch_too_large(too_large)
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise _batch_too_large(too_large)
+        yield chunk
+
+
+async def _email_batch_items(request: Request) -> list[Any]:
+    """The raw batch: a JSON array, or one JSON object per line for NDJSON bodies.
+
+    NDJSON is parsed line by line as the body streams in and rejected as soon as
+    it holds too many items; a JSON array is buffered up to the byte limit.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    items: list[Any] = []
+    if media_type in NDJSON_MEDIA_TYPES:
+        pending = bytearray()
+        async for chunk in _body_chunks(request):
+            pending += chunk
+            end = pending.rfind(b"\n")
+            if end < 0:
+                continue
+            items.extend(_ndjson_item(line) for line in pending[:end].splitlines() if line.strip())
+            del pending[: end + 1]
+            _check_item_count(items)
+        if pending.strip():
+            items.append(_ndjson_item(pending))
+        _check_item_count(items)
+        return items
+
+    body = bytearray()
+    async for chunk in _body_chunks(request):
+        body += chunk
+    try:
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Request body is not valid JSON"
+        ) from None
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of emails"
+        )
+    _check_item_count(items)
+    return items
+
+
+def _item_errors(exc: ValidationError) -> list[EmailBatchItemError]:
+    return [
+        EmailBatchItemError(
+            field=".".join(str(item) for item in error.get("loc", [])) or "body",
+            message=error.get("msg", "Invalid value"),
+            type=error.get("type", "validation_error"),
+        )
+        for error in exc.errors()
+    ]
+
+
+@router.post("/webhook/email/batch", response_model=EmailBatchResponse)
+def receive_incoming_email_batch(
+    company=Depends(get_company_from_api_key),
+    items: list[Any] = Depends(_email_batch_items),
+    db: Session = Depends(get_db),
+) -> EmailBatchResponse:
+    results: dict[int, EmailBatchItemResult] = {}
+    accepted: list[tuple[int, EmailMessageCreate]] = []
+    for index, item in enumerate(items):
+        if item is _MALFORMED_LINE:
+            error = EmailBatchItemError(field="body", message="Invalid JSON", type="json_invalid")
+            results[index] = EmailBatchItemResult(index=index, status="rejected", errors=[error])
+            continue
+        try:
+            email_in = EmailMessageCreate.model_validate(item)
+        except ValidationError as exc:
+            results[index] = EmailBatchItemResult(
+                index=index, status="rejected", errors=_item_errors(exc)
+            )
+            continue
+        email_in = EmailMessageCreate(
+            **email_in.dict(exclude={"company_id"}), company_id=company.id
+        )
+        accepted.append((index, email_in))
+
+    received = []
+    if accepted:
+        received = receive_emails(db, company.id, [email_in for _, email_in in accepted])
+    activities: list[dict] = []
+    drafts = []
+    for (index, _), (email, lead_status) in zip(accepted, received, strict=True):
+        results[index] = EmailBatchItemResult(
+            index=index, status="accepted", email_id=email.id, lead_id=email.lead_id
+        )
+        activities.append(
+            {
+                "action": "create",
+                "entity_type": "email",
+                "entity_id": email.id,
+                "company_id": company.id,
+                "description": "Email received via webhook",
+            }
+        )
+        decision = evaluate_inbound_email(db, email, lead_status)
+        apply_workflow_decision(db, email, decision, commit=False)
+        if decision.route_to:
+            activities.append(
+                {
+                    "action": "route",
+                    "entity_type": "email",
+                    "entity_id": email.id,
+                    "company_id": company.id,
+                    "description": f"Email routed to {decision.route_to}",
+                }
+            )
+        if not decision.skip_ai:
+            drafts.append(
+                generate_email_reply_task.s(email.id, company.id, auto_send=decision.auto_send)
+            )
+    if received:
+        db.commit()
+        log_activities(db, activities)
+    if drafts:
+        group(drafts).apply_async()
+    logger.info(
+        "email.batch.received",
+        extra={
+            "company_id": company.id,
+            "accepted": len(received),
+            "rejected": len(items) - len(received),
+            "drafts_queued": len(drafts),
+        },
+    )
+    return EmailBatchResponse(
+        accepted=len(received),
+        rejected=len(items) - len(received),
+        items=[results[index] for index in range(len(items))],
+    )
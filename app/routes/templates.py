@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, require_admin
+from app.core.pagination import PageParams, count_statement, finish_page, keyset_page, page_params
 from app.models.auto_reply_template import AutoReplyTemplate
 from app.schemas.auto_reply_template import (
     AutoReplyTemplateCreate,
     AutoReplyTemplateRead,
     AutoReplyTemplateUpdate,
+    TemplateBulkRenderRequest,
 )
 from app.services.activity_service import log_activity
+from app.services.template_cache import compile_template, invalidate_template_cache
+from app.services.template_render_service import stream_rendered_leads
 
 router = APIRouter(prefix="/templates", tags=["templates"])
 
@@ -28,6 +34,7 @@ def create_template(
     db.add(template)
     db.commit()
     db.refresh(template)
+    invalidate_template_cache(current_user.company_id)
     log_activity(
         db,
         action="create",
@@ -42,6 +49,8 @@ def create_template(
 
 @router.get("/", response_model=list[AutoReplyTemplateRead])
 def list_templates(
+    response: Response,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     current_user=Depends(require_admin),
 ) -> list[AutoReplyTemplateRead]:
@@ -50,12 +59,14 @@ def list_templates(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Admin user must belong to a company",
         )
-    return (
-        db.query(AutoReplyTemplate)
-        .filter(AutoReplyTemplate.company_id == current_user.company_id)
-        .order_by(AutoReplyTemplate.created_at.desc())
-        .all()
+    statement = select(AutoReplyTemplate).where(
+        AutoReplyTemplate.company_id == current_user.company_id
     )
+    total = db.scalar(count_statement(statement)) if page.include_total else None
+    rows = db.scalars(
+        keyset_page(statement, AutoReplyTemplate.created_at, AutoReplyTemplate.id, page)
+    ).all()
+    return finish_page(response, rows, page, "created_at", total)
 
 
 @router.get("/{template_id}", response_model=AutoReplyTemplateRead)
@@ -100,6 +111,7 @@ def update_template(
     db.add(template)
     db.commit()
     db.refresh(template)
+    invalidate_template_cache(current_user.company_id)
     log_activity(
         db,
         action="update",
@@ -130,6 +142,7 @@ def delete_template(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
     db.delete(template)
     db.commit()
+    invalidate_template_cache(current_user.company_id)
     log_activity(
         db,
         action="delete",
@@ -140,3 +153,31 @@ def delete_template(
         description="Template deleted",
     )
     return None
+
+
+@router.post("/{template_id}/render")
+def render_template_for_leads(
+    template_id: int,
+    payload: TemplateBulkRenderRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_admin),
+) -> StreamingResponse:
+    template = (
+        db.query(AutoReplyTemplate)
+        .filter(
+            AutoReplyTemplate.id == template_id,
+            AutoReplyTemplate.company_id == current_user.company_id,
+        )
+        .first()
+    )
+    if not template:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    return StreamingResponse(
+        stream_rendered_leads(
+            compile_template(template),
+            current_user.company_id,
+            lead_ids=payload.lead_ids,
+            lead_filter=payload.filter,
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_user, get_db, require_admin
+from app.core.principal_cache import Principal, invalidate_principal
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.schemas.user import UserPasswordUpdate, UserRead, UserRoleUpdate
@@ -30,6 +31,7 @@ def update_user_role(
     db.add(user)
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.email)
     logger.info("Updated user role", extra={"user_id": user.id, "role": user.role})
     return user
 
@@ -38,11 +40,15 @@ def update_user_role(
 def update_my_password(
     payload: UserPasswordUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> UserRead:
-    current_user.hashed_password = get_password_hash(payload.password)
-    db.add(current_user)
+    user = db.get(User, current_user.id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    user.hashed_password = get_password_hash(payload.password)
+    db.add(user)
     db.commit()
-    db.refresh(current_user)
-    logger.info("Updated user password", extra={"user_id": current_user.id})
-    return current_user
+    db.refresh(user)
+    invalidate_principal(user.email)
+    logger.info("Updated user password", extra={"user_id": user.id})
+    return user
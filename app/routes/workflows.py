@@ -0,0 +1,149 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, require_admin
+from app.models.workflow_rule import WorkflowRule
+from app.schemas.workflow_rule import (
+    WorkflowDryRunRequest,
+    WorkflowDryRunResponse,
+    WorkflowRuleCreate,
+    WorkflowRuleRead,
+    WorkflowRuleUpdate,
+)
+from app.services.activity_service import log_activity
+from app.services.workflow_engine import (
+    RuleSpec,
+    compile_rules,
+    dry_run_rules,
+    get_company_ruleset,
+    invalidate_workflow_rules,
+)
+
+router = APIRouter(prefix="/workflows", tags=["workflows"])
+
+
+def _get_rule(db: Session, rule_id: int, company_id: int | None) -> WorkflowRule:
+    rule = (
+        db.query(WorkflowRule)
+        .filter(WorkflowRule.id == rule_id, WorkflowRule.company_id == company_id)
+        .first()
+    )
+    if not rule:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow rule not found")
+    return rule
+
+
+@router.get("/rules", response_model=list[WorkflowRuleRead])
+def list_rules(
+    db: Session = Depends(get_db),
+    current_user=Depends(require_admin),
+) -> list[WorkflowRuleRead]:
+    return (
+        db.query(WorkflowRule)
+        .filter(WorkflowRule.company_id == current_user.company_id)
+        .order_by(WorkflowRule.priority, WorkflowRule.id)
+        .all()
+    )
+
+
+@router.post("/rules", response_model=WorkflowRuleRead, status_code=status.HTTP_201_CREATED)
+def create_rule(
+    rule_in: WorkflowRuleCreate,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_admin),
+) -> WorkflowRuleRead:
+    if not current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Admin user must belong to a company",
+        )
+    rule = WorkflowRule(**rule_in.model_dump(mode="json"), company_id=current_user.company_id)
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    invalidate_workflow_rules(current_user.company_id)
+    log_activity(
+        db,
+        action="create",
+        entity_type="workflow_rule",
+        entity_id=rule.id,
+        company_id=current_user.company_id,
+        user_id=current_user.id,
+        description="Workflow rule created",
+    )
+    return rule
+
+
+@router.put("/rules/{rule_id}", response_model=WorkflowRuleRead)
+def update_rule(
+    rule_id: int,
+    rule_in: WorkflowRuleUpdate,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_admin),
+) -> WorkflowRuleRead:
+    rule = _get_rule(db, rule_id, current_user.company_id)
+    for key, value in rule_in.model_dump(mode="json", exclude_unset=True).items():
+        setattr(rule, key, value)
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    invalidate_workflow_rules(current_user.company_id)
+    log_activity(
+        db,
+        action="update",
+        entity_type="workflow_rule",
+        entity_id=rule.id,
+        company_id=current_user.company_id,
+        user_id=current_user.id,
+        description="Workflow rule updated",
+    )
+    return rule
+
+
+@router.delete("/rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_admin),
+) -> None:
+    rule = _get_rule(db, rule_id, current_user.company_id)
+    db.delete(rule)
+    db.commit()
+    invalidate_workflow_rules(current_user.company_id)
+    log_activity(
+        db,
+        action="delete",
+        entity_type="workflow_rule",
+        entity_id=rule_id,
+        company_id=current_user.company_id,
+        user_id=current_user.id,
+        description="Workflow rule deleted",
+    )
+    return None
+
+
+@router.post("/rules/dry-run", response_model=WorkflowDryRunResponse)
+def dry_run(
+    payload: WorkflowDryRunRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_admin),
+) -> WorkflowDryRunResponse:
+    if payload.rules is None:
+        ruleset = get_company_ruleset(db, current_user.company_id)
+    else:
+        # Draft rules have no ids yet, so matches are reported by 1-based position.
+        ruleset = compile_rules(
+            [
+                RuleSpec(
+                    id=position,
+                    name=rule.name,
+                    priority=rule.priority,
+                    stop_processing=rule.stop_processing,
+                    conditions=rule.conditions,
+                    actions=rule.actions,
+                )
+                for position, rule in enumerate(payload.rules, start=1)
+                if rule.enabled
+            ]
+        )
+    return dry_run_rules(db, current_user.company_id, ruleset, payload)
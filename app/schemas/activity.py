@@ -0,0 +1,9 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ArchivedActivityMonth(BaseModel):
+    month: str
+    entries: int
+    exported_at: datetime
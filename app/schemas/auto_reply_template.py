@@ -1,6 +1,10 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.enums import LeadStatus
+
+MAX_RENDER_LEAD_IDS = 50000
 
 
 class AutoReplyTemplateBase(BaseModel):
@@ -32,3 +36,21 @@ class AutoReplyTemplateRead(AutoReplyTemplateBase):
 
     class Config:
         orm_mode = True
+
+
+class LeadRenderFilter(BaseModel):
+    status: LeadStatus | None = None
+    source: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+
+class TemplateBulkRenderRequest(BaseModel):
+    lead_ids: list[int] | None = Field(default=None, max_length=MAX_RENDER_LEAD_IDS)
+    filter: LeadRenderFilter | None = None
+
+    @model_validator(mode="after")
+    def require_single_selector(self) -> "TemplateBulkRenderRequest":
+        if (self.lead_ids is None) == (self.filter is None):
+            raise ValueError("Provide either lead_ids or filter")
+        return self
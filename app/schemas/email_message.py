@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -44,6 +44,7 @@ class EmailMessageRead(EmailMessageBase):
     category: Optional[str] = None
     priority: Optional[str] = None
     confidence: Optional[int] = None
+    routed_to: Optional[str] = None
     replies: list[EmailReplyRead] = Field(default_factory=list)
 
     class Config:
@@ -60,6 +61,26 @@ class EmailReceiveResponse(BaseModel):
     auto_reply: Optional[AutoReplyPreview] = None
 
 
+class EmailBatchItemError(BaseModel):
+    field: str
+    message: str
+    type: str
+
+
+class EmailBatchItemResult(BaseModel):
+    index: int
+    status: Literal["accepted", "rejected"]
+    email_id: Optional[int] = None
+    lead_id: Optional[int] = None
+    errors: list[EmailBatchItemError] = Field(default_factory=list)
+
+
+class EmailBatchResponse(BaseModel):
+    accepted: int
+    rejected: int
+    items: list[EmailBatchItemResult]
+
+
 class EmailThreadRead(BaseModel):
     email: EmailMessageRead
 
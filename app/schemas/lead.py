@@ -35,6 +35,11 @@ class LeadUpdate(BaseModel):
     tags: Optional[list[str]] = None
 
 
+class LeadTagCount(BaseModel):
+    tag: str
+    count: int
+
+
 class LeadStatusUpdate(BaseModel):
     status: LeadStatus
 
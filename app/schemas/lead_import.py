@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeadImportRead(BaseModel):
+    id: int
+    filename: str
+    file_format: str
+    status: str
+    progress: float
+    size_bytes: int
+    bytes_processed: int
+    rows_processed: int
+    created_count: int
+    duplicate_count: int
+    error_count: int
+    error_message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
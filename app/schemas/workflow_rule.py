@@ -0,0 +1,122 @@
+import re
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.schemas.enums import LeadStatus
+
+MAX_DRY_RUN_EMAILS = 5000
+# Keywords and email text are matched on these tokens (see app/services/workflow_engine.py).
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+
+
+class DeliveryMode(str, Enum):
+    auto_send = "auto_send"
+    hold_for_approval = "hold_for_approval"
+
+
+class WorkflowConditions(BaseModel):
+    categories: list[str] = Field(default_factory=list)
+    priorities: list[str] = Field(default_factory=list)
+    sender_domains: list[str] = Field(default_factory=list)
+    lead_statuses: list[LeadStatus | str] = Field(default_factory=list)
+    keywords: list[str] = Field(default_factory=list)
+
+    @field_validator("categories", "priorities", "sender_domains", "keywords")
+    @classmethod
+    def normalize_values(cls, values: list[str]) -> list[str]:
+        return sorted({value.strip().lower().lstrip("@") for value in values if value.strip()})
+
+    @field_validator("keywords")
+    @classmethod
+    def require_keyword_tokens(cls, values: list[str]) -> list[str]:
+        for value in values:
+            if not TOKEN_PATTERN.search(value):
+                raise ValueError(f"Keyword must contain letters or digits: {value!r}")
+        return values
+
+    @field_validator("lead_statuses")
+    @classmethod
+    def normalize_statuses(cls, values: list[LeadStatus | str]) -> list[str]:
+        # "none" matches emails from senders that are not a known lead.
+        normalized = set()
+        for value in values:
+            value = value.value if isinstance(value, LeadStatus) else value.strip().lower()
+            if value != "none" and value not in LeadStatus.__members__:
+                raise ValueError(f"Unknown lead status: {value}")
+            normalized.add(value)
+        return sorted(normalized)
+
+
+class WorkflowActions(BaseModel):
+    delivery: DeliveryMode | None = None
+    skip_ai: bool = False
+    tags: list[str] = Field(default_factory=list)
+    route_to: str | None = None
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, values: list[str]) -> list[str]:
+        return [tag.strip() for tag in values if tag.strip()]
+
+
+class WorkflowRuleBase(BaseModel):
+    name: str
+    priority: int = 100
+    enabled: bool = True
+    stop_processing: bool = False
+    conditions: WorkflowConditions = Field(default_factory=WorkflowConditions)
+    actions: WorkflowActions = Field(default_factory=WorkflowActions)
+
+
+class WorkflowRuleCreate(WorkflowRuleBase):
+    pass
+
+
+class WorkflowRuleUpdate(BaseModel):
+    name: str | None = None
+    priority: int | None = None
+    enabled: bool | None = None
+    stop_processing: bool | None = None
+    conditions: WorkflowConditions | None = None
+    actions: WorkflowActions | None = None
+
+
+class WorkflowRuleRead(WorkflowRuleBase):
+    id: int
+    company_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+class WorkflowDryRunRequest(BaseModel):
+    rules: list[WorkflowRuleCreate] | None = None
+    email_ids: list[int] | None = Field(default=None, max_length=MAX_DRY_RUN_EMAILS)
+    received_after: datetime | None = None
+    received_before: datetime | None = None
+    limit: int = Field(default=500, ge=1, le=MAX_DRY_RUN_EMAILS)
+
+
+class WorkflowDecisionRead(BaseModel):
+    email_id: int
+    from_email: str
+    subject: str
+    category: str
+    priority: str
+    lead_status: str | None
+    matched_rules: list[int]
+    auto_send: bool
+    skip_ai: bool
+    tags: list[str]
+    route_to: str | None
+
+
+class WorkflowDryRunResponse(BaseModel):
+    evaluated: int
+    matched: int
+    action_counts: dict[str, int]
+    results: list[WorkflowDecisionRead]
@@ -0,0 +1,287 @@
+"""Monthly partitions for ``activity_logs`` and their cold archive.
+
+On Postgres ``activity_logs`` is range-partitioned by ``created_at`` into one
+table per month (``activity_logs_y2026m01``). SQLite has no partitioning, so a
+"partition" is the month's ``created_at`` range in the single table.
+
+Months older than ``ACTIVITY_LOG_RETENTION_MONTHS`` are exported to
+``<ACTIVITY_ARCHIVE_DIR>/<YYYY-MM>/company_<id>.ndjson.gz`` together with a
+``manifest.json`` describing every file, and then dropped from the database.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterator
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.models.activity_log import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+EXPORT_BATCH_SIZE = 1000
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_label(month: date) -> str:
+    return f"{month.year:04d}-{month.month:02d}"
+
+
+def partition_name(month: date) -> str:
+    return f"activity_logs_y{month.year:04d}m{month.month:02d}"
+
+
+def archive_root() -> Path:
+    return Path(settings.activity_archive_dir)
+
+
+def _partition_exists(connection: Connection, name: str) -> bool:
+    exists = connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+    return exists is not None
+
+
+def ensure_partitions(connection: Connection, today: date | None = None) -> list[str]:
+    """Create monthly partitions from this month to ``ACTIVITY_LOG_PARTITIONS_AHEAD`` ahead."""
+    if connection.dialect.name != "postgresql":
+        return []
+    current = month_start(today or datetime.utcnow())
+    created = []
+    for offset in range(settings.activity_log_partitions_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if _partition_exists(connection, name):
+            continue
+        connection.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF activity_logs "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        created.append(name)
+    if created:
+        logger.info("activity.partitions.created", extra={"partitions": created})
+    return created
+
+
+def _month_range(month: date):
+    return ActivityLog.created_at >= month, ActivityLog.created_at < add_months(month, 1)
+
+
+def _entry_json(row: Any) -> str:
+    entry = dict(row._mapping)
+    entry["created_at"] = entry["created_at"].isoformat()
+    return json.dumps(entry, separators=(",", ":"))
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace_durably(tmp_path: Path, path: Path) -> None:
+    """Rename a fully written, fsynced temp file over ``path`` and persist the rename."""
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        handle.write(json.dumps(payload, indent=2, sort_keys=True))
+        handle.flush()
+        os.fsync(handle.fileno())
+    _replace_durably(tmp_path, path)
+
+
+class _GzipWriter:
+    """Text gzip stream over a raw file, fsynced on close."""
+
+    def __init__(self, path: Path) -> None:
+        self._raw = path.open("wb")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb")
+
+    def write(self, text: str) -> None:
+        self._gzip.write(text.encode("utf-8"))
+
+    def close(self) -> None:
+        self._gzip.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+
+
+def export_month(connection: Connection, month: date, root: Path) -> dict | None:
+    """Write one gzip NDJSON file per company for ``month`` and merge it into the manifest.
+
+    Every run writes its own files, so rows that arrive for an already archived
+    month are appended as another file instead of replacing the earlier export.
+    Returns ``None`` when the month has no rows.
+    """
+    month_dir = root / month_label(month)
+    exported_at = datetime.utcnow()
+    run = exported_at.strftime("%Y%m%dT%H%M%S%f")
+    rows = connection.execute(
+        select(ActivityLog.__table__)
+        .where(*_month_range(month))
+        .order_by(ActivityLog.company_id, ActivityLog.created_at, ActivityLog.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    files: dict[str, dict] = {}
+    handle = None
+    current: dict | None = None
+
+    def finish() -> None:
+        handle.close()
+        _replace_durably(month_dir / f"{current['file']}.tmp", month_dir / current["file"])
+        current["sha256"] = _sha256(month_dir / current["file"])
+
+    for row in rows:
+        company_key = str(row.company_id)
+        if company_key not in files:
+            if handle is not None:
+                finish()
+            if not month_dir.is_dir():
+                month_dir.mkdir(parents=True)
+                _fsync_dir(root)
+            current = {
+                "file": f"company_{row.company_id}.{run}.ndjson.gz",
+                "entries": 0,
+                "first_created_at": row.created_at.isoformat(),
+            }
+            files[company_key] = current
+            handle = _GzipWriter(month_dir / f"{current['file']}.tmp")
+        handle.write(_entry_json(row) + "\n")
+        current["entries"] += 1
+        current["last_created_at"] = row.created_at.isoformat()
+    if handle is None:
+        return None
+    finish()
+
+    manifest_path = month_dir / MANIFEST_NAME
+    if manifest_path.is_file():
+        manifest = json.loads(manifest_path.read_text())
+    else:
+        manifest = {"month": month_label(month), "entries": 0, "companies": {}}
+    for company_key, file_info in files.items():
+        company = manifest["companies"].setdefault(company_key, {"entries": 0, "files": []})
+        company["entries"] += file_info["entries"]
+        company["files"].append(file_info)
+        manifest["entries"] += file_info["entries"]
+    manifest["exported_at"] = exported_at.isoformat()
+    _write_json_atomic(manifest_path, manifest)
+    return manifest
+
+
+def drop_month(connection: Connection, month: date) -> None:
+    name = partition_name(month)
+    if connection.dialect.name == "postgresql" and _partition_exists(connection, name):
+        connection.execute(text(f"ALTER TABLE activity_logs DETACH PARTITION {name}"))
+        connection.execute(text(f"DROP TABLE {name}"))
+    # Rows that landed in the default partition (or SQLite's single table) are deleted by range.
+    connection.execute(delete(ActivityLog).where(*_month_range(month)))
+
+
+def _expired_months(connection: Connection, cutoff: date) -> list[date]:
+    oldest = connection.execute(
+        select(func.min(ActivityLog.created_at)).where(ActivityLog.created_at < cutoff)
+    ).scalar()
+    if oldest is None:
+        return []
+    months = []
+    month = month_start(oldest)
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def archive_expired_activity_logs(engine: Engine, today: date | None = None) -> list[dict]:
+    """Export and drop every month older than the retention window, oldest first.
+
+    Each month is exported and dropped in one transaction, so a failed export
+    leaves the rows in place and the next run exports the month again. The
+    export files and the manifest are fsynced (and the manifest swapped in
+    atomically) before the rows are dropped.
+    """
+    current_month = month_start(today or datetime.utcnow())
+    cutoff = add_months(current_month, -settings.activity_log_retention_months)
+    root = archive_root()
+    with engine.connect() as connection:
+        months = _expired_months(connection, cutoff)
+    manifests = []
+    for month in months:
+        with engine.begin() as connection:
+            manifest = export_month(connection, month, root)
+            drop_month(connection, month)
+        if manifest is None:
+            continue
+        manifests.append(manifest)
+        logger.info(
+            "activity.archive.exported",
+            extra={"month": manifest["month"], "entries": manifest["entries"]},
+        )
+    return manifests
+
+
+def list_archived_months(company_id: int) -> list[dict]:
+    root = archive_root()
+    if not root.is_dir():
+        return []
+    months = []
+    for manifest_path in sorted(root.glob(f"*/{MANIFEST_NAME}")):
+        manifest = json.loads(manifest_path.read_text())
+        company = manifest["companies"].get(str(company_id))
+        if company:
+            months.append(
+                {
+                    "month": manifest["month"],
+                    "entries": company["entries"],
+                    "exported_at": manifest["exported_at"],
+                }
+            )
+    return months
+
+
+def archived_entry_files(company_id: int, month: str) -> list[Path] | None:
+    """Files holding ``company_id``'s entries for ``month``, or ``None`` if none were archived."""
+    manifest_path = archive_root() / month / MANIFEST_NAME
+    if not manifest_path.is_file():
+        return None
+    company = json.loads(manifest_path.read_text())["companies"].get(str(company_id))
+    if not company:
+        return None
+    return [manifest_path.parent / file_info["file"] for file_info in company["files"]]
+
+
+def iter_archived_entries(paths: list[Path]) -> Iterator[str]:
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            yield from handle
@@ -1,12 +1,49 @@
 import logging
+from datetime import datetime
 
 from sqlalchemy.orm import Session
 
 from app.models.activity_log import ActivityLog
+from app.services.activity_writer import activity_writer
+from app.services.dashboard_cache import invalidate_dashboard_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _entry(
+    *,
+    action: str,
+    entity_type: str,
+    entity_id: int | None,
+    company_id: int,
+    user_id: int | None = None,
+    description: str | None = None,
+) -> dict:
+    return {
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "company_id": company_id,
+        "user_id": user_id,
+        "description": description,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def log_activities(db: Session, entries: list[dict]) -> None:
+    """Log many entries (``log_activity`` keyword arguments) with at most one commit."""
+    rows = [_entry(**entry) for entry in entries]
+    if activity_writer.buffered:
+        for row in rows:
+            activity_writer.write(row)
+    elif rows:
+        db.add_all([ActivityLog(**row) for row in rows])
+        db.commit()
+        for company_id in {row["company_id"] for row in rows}:
+            invalidate_dashboard_cache(company_id)
+    logger.info("Activities logged", extra={"entries": len(rows)})
+
+
 def log_activity(
     db: Session,
     *,
@@ -16,8 +53,8 @@ def log_activity(
     company_id: int,
     user_id: int | None = None,
     description: str | None = None,
-) -> ActivityLog:
-    entry = ActivityLog(
+) -> None:
+    entry = _entry(
         action=action,
         entity_type=entity_type,
         entity_id=entity_id,
@@ -25,9 +62,12 @@ def log_activity(
         user_id=user_id,
         description=description,
     )
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    if activity_writer.buffered:
+        activity_writer.write(entry)
+    else:
+        db.add(ActivityLog(**entry))
+        db.commit()
+        invalidate_dashboard_cache(company_id)
     logger.info(
         "Activity logged",
         extra={
@@ -38,4 +78,3 @@ def log_activity(
             "user_id": user_id,
         },
     )
-    return entry
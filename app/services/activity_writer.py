@@ -0,0 +1,214 @@
+"""Buffered, batched writer for activity log entries.
+
+``ACTIVITY_LOG_MODE`` selects how ``log_activity`` persists entries:
+
+* ``sync``: insert and commit on the caller's session (tests, scripts).
+* ``memory``: queue in this process; a background thread bulk-inserts.
+* ``redis``: queue in a shared Redis list that any process may drain, so
+  entries survive the process that produced them.
+
+Buffered entries are flushed when ``ACTIVITY_LOG_BATCH_SIZE`` are waiting,
+every ``ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS``, and on shutdown.
+"""
+
+import atexit
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.core.cache import get_redis
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import registry
+from app.models.activity_log import ActivityLog
+from app.services.dashboard_cache import invalidate_dashboard_cache
+
+logger = logging.getLogger(__name__)
+
+REDIS_QUEUE_KEY = "activity_logs:queue"
+
+flushed_entries = registry.counter(
+    "activity_log_flushed_total", "Activity log entries bulk-inserted by the buffered writer"
+)
+dropped_entries = registry.counter(
+    "activity_log_dropped_total", "Activity log entries discarded by the buffered writer"
+)
+flush_failures = registry.counter(
+    "activity_log_flush_failures_total", "Activity log flushes that failed and were requeued"
+)
+
+
+class ActivityLogWriter:
+    def __init__(
+        self,
+        *,
+        mode: str,
+        batch_size: int,
+        flush_interval_seconds: float,
+        max_buffered: int,
+    ) -> None:
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffered = max_buffered
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def buffered(self) -> bool:
+        return self.mode in {"memory", "redis"}
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def write(self, entry: dict[str, Any]) -> None:
+        if entry.get("company_id") is None:
+            dropped_entries.inc(reason="missing_company")
+            logger.warning("activity.dropped", extra={"reason": "missing_company", **entry})
+            return
+        self._ensure_started()
+        depth = self._push_redis(entry) if self.mode == "redis" else None
+        if depth is None:
+            with self._lock:
+                self._buffer.append(entry)
+                while len(self._buffer) > self.max_buffered:
+                    self._buffer.popleft()
+                    dropped_entries.inc(reason="overflow")
+                depth = len(self._buffer)
+        if depth >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Insert everything queued so far; returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_local()
+                if not batch and self.mode == "redis":
+                    batch = self._take_redis()
+                if not batch:
+                    return written
+                if not self._insert(batch):
+                    return written
+                written += len(batch)
+
+    def close(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval_seconds + 5)
+        self.flush()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("activity.flush.crashed", exc_info=exc)
+
+    def _take_local(self) -> list[dict[str, Any]]:
+        with self._lock:
+            count = min(len(self._buffer), self.batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _requeue_local(self, batch: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._buffer.extendleft(reversed(batch))
+
+    def _push_redis(self, entry: dict[str, Any]) -> int | None:
+        """Queue ``entry`` in Redis; returns the queue length, or None to buffer locally."""
+        payload = json.dumps({**entry, "created_at": entry["created_at"].isoformat()})
+        try:
+            return int(get_redis().rpush(REDIS_QUEUE_KEY, payload))
+        except RedisError as exc:
+            logger.warning("activity.queue.unavailable", extra={"error": str(exc)})
+            return None
+
+    def _take_redis(self) -> list[dict[str, Any]]:
+        try:
+            payloads = get_redis().lpop(REDIS_QUEUE_KEY, self.batch_size) or []
+        except RedisError as exc:
+            logger.warning("activity.queue.unavailable", extra={"error": str(exc)})
+            return []
+        batch = []
+        for payload in payloads:
+            entry = json.loads(payload)
+            entry["created_at"] = datetime.fromisoformat(entry["created_at"])
+            batch.append(entry)
+        return batch
+
+    def _insert(self, batch: list[dict[str, Any]]) -> bool:
+        try:
+            with engine.begin() as connection:
+                connection.execute(insert(ActivityLog), batch)
+        except IntegrityError:
+            # One bad row (e.g. a deleted company) must not sink the whole batch.
+            self._insert_rows(batch)
+        except Exception as exc:  # noqa: BLE001
+            flush_failures.inc()
+            logger.warning(
+                "activity.flush.failed", extra={"entries": len(batch), "error": str(exc)}
+            )
+            # Entries popped from Redis are kept locally so they are retried by this process.
+            self._requeue_local(batch)
+            return False
+        else:
+            flushed_entries.inc(len(batch))
+        for company_id in {entry["company_id"] for entry in batch}:
+            invalidate_dashboard_cache(company_id)
+        return True
+
+    def _insert_rows(self, batch: list[dict[str, Any]]) -> None:
+        for entry in batch:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(insert(ActivityLog), [entry])
+            except IntegrityError as exc:
+                dropped_entries.inc(reason="integrity_error")
+                logger.warning("activity.dropped", extra={"reason": str(exc.orig), **entry})
+            else:
+                flushed_entries.inc()
+
+
+activity_writer = ActivityLogWriter(
+    mode=settings.activity_log_mode,
+    batch_size=settings.activity_log_batch_size,
+    flush_interval_seconds=settings.activity_log_flush_interval_seconds,
+    max_buffered=settings.activity_log_max_buffered,
+)
+
+
+def _pending_samples() -> dict:
+    return {(("queue", "local"),): float(activity_writer.pending())}
+
+
+registry.callback_gauge(
+    "activity_log_pending", "Activity log entries waiting in this process", _pending_samples
+)
+atexit.register(activity_writer.close)
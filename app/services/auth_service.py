@@ -1,8 +1,8 @@
 import logging
-import secrets
 
 from sqlalchemy.orm import Session
 
+from app.core.api_keys import issue_api_key
 from app.core.security import get_password_hash, verify_password
 from app.models.company import Company
 from app.models.user import User
@@ -18,7 +18,8 @@ def register_user(db: Session, user_in: UserCreate) -> User:
     company = db.query(Company).filter(Company.name == user_in.company_name).first()
     is_new_company = False
     if not company:
-        company = Company(name=user_in.company_name, api_key=secrets.token_urlsafe(24))
+        company = Company(name=user_in.company_name)
+        issue_api_key(company)
         db.add(company)
         db.commit()
         db.refresh(company)
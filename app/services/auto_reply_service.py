@@ -6,47 +6,37 @@ from sqlalchemy.orm import Session
 from app.models.company import Company
 from app.models.auto_reply_template import AutoReplyTemplate
 from app.services.llm_service import generate_ai_reply
+from app.services.template_cache import (
+    CompiledTemplate,
+    compile_template,
+    get_cached_template,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class SafeDict(dict):
-    def __missing__(self, key: str) -> str:
-        return ""
-
-
 def get_template(
     db: Session, trigger_type: str, company_id: int | None
-) -> Optional[AutoReplyTemplate]:
+) -> Optional[CompiledTemplate]:
     if company_id is None:
         logger.warning("No company_id provided for auto-reply template lookup")
         return None
-    return (
-        db.query(AutoReplyTemplate)
-        .filter(
-            AutoReplyTemplate.trigger_type == trigger_type,
-            AutoReplyTemplate.company_id == company_id,
-        )
-        .order_by(AutoReplyTemplate.created_at.desc())
-        .first()
-    )
+    return get_cached_template(db, trigger_type, company_id)
 
 
 def generate_reply(
-    template: AutoReplyTemplate, context: Dict[str, str]
+    template: AutoReplyTemplate | CompiledTemplate, context: Dict[str, str]
 ) -> Dict[str, str]:
-    safe_context = SafeDict(**context)
-    return {
-        "subject": template.subject_template.format_map(safe_context),
-        "body": template.body_template.format_map(safe_context),
-    }
+    if not isinstance(template, CompiledTemplate):
+        template = compile_template(template)
+    return template.render(context)
 
 
-def generate_ai_reply_from_template(
-    template: AutoReplyTemplate,
+def build_ai_prompt(
+    template: AutoReplyTemplate | CompiledTemplate,
     company: Company,
     context: Dict[str, str],
-) -> Dict[str, str]:
+) -> tuple[str, str]:
     base = generate_reply(template, context)
     tone_line = f"Tone: {template.tone}\n" if template.tone else ""
     category_line = f"Category: {template.category}\n" if template.category else ""
@@ -57,5 +47,14 @@ def generate_ai_reply_from_template(
         f"Context:\n{context}\n\n"
         "Draft a helpful, concise reply."
     )
+    return base["subject"], prompt
+
+
+def generate_ai_reply_from_template(
+    template: AutoReplyTemplate | CompiledTemplate,
+    company: Company,
+    context: Dict[str, str],
+) -> Dict[str, str]:
+    subject, prompt = build_ai_prompt(template, company, context)
     body = generate_ai_reply(prompt, company.ai_model)
-    return {"subject": base["subject"], "body": body}
+    return {"subject": subject, "body": body}
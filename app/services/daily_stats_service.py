@@ -0,0 +1,366 @@
+"""Incrementally maintained per-company daily counters.
+
+Ingest paths call the ``record_*`` helpers before committing, so each counter
+moves in the same transaction as the row it describes.
+``rebuild_company_stats`` recomputes a company's counters from the raw tables
+when they have drifted, for example after bulk imports or manual fixes.
+
+A rebuild must not interleave with ingest transactions of the same company, or
+increments committed between its read and its rewrite are lost. On Postgres,
+increments hold a shared per-company advisory lock until they commit and a
+rebuild takes it exclusively; SQLite already runs one writer at a time, so a
+rebuild only has to start writing before it reads.
+"""
+
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+
+from sqlalchemy import case, delete, func, insert, or_, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.daily_company_stat import DailyCompanyStat
+from app.models.email_message import EmailMessage
+from app.models.email_reply import EmailReply
+from app.models.lead import Lead
+from app.services.dashboard_cache import invalidate_dashboard_cache
+from app.services.email_analysis_service import classify_category, classify_priority
+
+logger = logging.getLogger(__name__)
+
+LEADS_CREATED = "leads_created"
+EMAILS_BY_CATEGORY = "emails_by_category"
+EMAILS_BY_PRIORITY = "emails_by_priority"
+REPLIES_BY_STATUS = "replies_by_status"
+REPLIES_BY_ORIGIN = "replies_by_origin"
+# Dimension is "<from>><to>"; a lead's creation is recorded as a transition from "".
+LEAD_STATUS_TRANSITIONS = "lead_status_transitions"
+
+
+def _day(value: datetime | None) -> date:
+    return (value or datetime.utcnow()).date()
+
+
+def _status_name(value: str | Enum | None) -> str:
+    if isinstance(value, Enum):
+        return value.value
+    return value or ""
+
+
+def _transition(previous: str | Enum | None, current: str | Enum | None) -> str:
+    return f"{_status_name(previous)}>{_status_name(current)}"
+
+
+def _reply_origin(reply: EmailReply) -> str:
+    return "ai" if reply.generated_by_ai else "manual"
+
+
+# First key of the two-key advisory locks that guard each company's rollup.
+STATS_LOCK_NAMESPACE = 3701
+
+
+def _lock_company_stats(db: Session, company_ids: Iterable[int], *, exclusive: bool) -> None:
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    for company_id in sorted(set(company_ids)):
+        db.execute(
+            text(f"SELECT {function}(:namespace, :company_id)"),
+            {"namespace": STATS_LOCK_NAMESPACE, "company_id": company_id},
+        )
+
+
+def increment(db: Session, deltas: Counter) -> None:
+    """Add ``deltas`` (keyed by company, day, metric, dimension) to the rollup."""
+    rows = [
+        {
+            "company_id": company_id,
+            "day": day,
+            "metric": metric,
+            "dimension": dimension,
+            "value": value,
+        }
+        for (company_id, day, metric, dimension), value in deltas.items()
+        if company_id is not None and value
+    ]
+    if not rows:
+        return
+    _lock_company_stats(db, (row["company_id"] for row in rows), exclusive=False)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(DailyCompanyStat)
+    elif dialect == "sqlite":
+        statement = sqlite.insert(DailyCompanyStat)
+    else:
+        raise RuntimeError(f"Daily stats upserts are not supported on {dialect}")
+    statement = statement.on_conflict_do_update(
+        index_elements=["company_id", "day", "metric", "dimension"],
+        set_={"value": DailyCompanyStat.value + statement.excluded.value},
+    )
+    db.execute(statement, rows)
+
+
+def _lead_created_deltas(lead: Lead) -> Counter:
+    day = _day(lead.created_at)
+    return Counter(
+        {
+            (lead.company_id, day, LEADS_CREATED, ""): 1,
+            (lead.company_id, day, LEAD_STATUS_TRANSITIONS, _transition(None, lead.status)): 1,
+        }
+    )
+
+
+def record_lead_created(db: Session, lead: Lead) -> None:
+    increment(db, _lead_created_deltas(lead))
+
+
+def record_leads_created(db: Session, leads: Iterable[Lead]) -> None:
+    deltas: Counter = Counter()
+    for lead in leads:
+        deltas.update(_lead_created_deltas(lead))
+    increment(db, deltas)
+
+
+def _lead_status_deltas(lead: Lead, previous_status: str | None) -> Counter:
+    if _status_name(previous_status) == _status_name(lead.status):
+        return Counter()
+    key = (
+        lead.company_id,
+        _day(None),
+        LEAD_STATUS_TRANSITIONS,
+        _transition(previous_status, lead.status),
+    )
+    return Counter({key: 1})
+
+
+def record_lead_status_change(db: Session, lead: Lead, previous_status: str | None) -> None:
+    increment(db, _lead_status_deltas(lead, previous_status))
+
+
+def record_lead_status_changes(
+    db: Session, changes: Iterable[tuple[Lead, str | None]]
+) -> None:
+    """``record_lead_status_change`` for many ``(lead, previous_status)`` pairs in one upsert."""
+    deltas: Counter = Counter()
+    for lead, previous_status in changes:
+        deltas.update(_lead_status_deltas(lead, previous_status))
+    increment(db, deltas)
+
+
+def _email_received_deltas(email: EmailMessage) -> Counter:
+    day = _day(email.received_at)
+    category = email.category or classify_category(email.subject, email.body)[0]
+    priority = email.priority or classify_priority(email.subject, email.body)
+    return Counter(
+        {
+            (email.company_id, day, EMAILS_BY_CATEGORY, category): 1,
+            (email.company_id, day, EMAILS_BY_PRIORITY, priority): 1,
+        }
+    )
+
+
+def record_email_received(db: Session, email: EmailMessage) -> None:
+    increment(db, _email_received_deltas(email))
+
+
+def record_emails_received(db: Session, emails: Iterable[EmailMessage]) -> None:
+    deltas: Counter = Counter()
+    for email in emails:
+        deltas.update(_email_received_deltas(email))
+    increment(db, deltas)
+
+
+def record_reply_created(db: Session, reply: EmailReply) -> None:
+    day = _day(reply.created_at)
+    increment(
+        db,
+        Counter(
+            {
+                (reply.company_id, day, REPLIES_BY_STATUS, reply.send_status or "pending"): 1,
+                (reply.company_id, day, REPLIES_BY_ORIGIN, _reply_origin(reply)): 1,
+            }
+        ),
+    )
+
+
+def record_reply_status_change(db: Session, reply: EmailReply, previous_status: str) -> None:
+    """Move a reply between status buckets of the day it was created."""
+    if previous_status == reply.send_status:
+        return
+    day = _day(reply.created_at)
+    deltas = Counter()
+    deltas[(reply.company_id, day, REPLIES_BY_STATUS, previous_status)] -= 1
+    deltas[(reply.company_id, day, REPLIES_BY_STATUS, reply.send_status)] += 1
+    increment(db, deltas)
+
+
+def _as_date(value: date | str) -> date:
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    return value
+
+
+def _company_deltas(db: Session, company_id: int) -> Counter:
+    deltas: Counter = Counter()
+    lead_rows = db.execute(
+        select(func.date(Lead.created_at), Lead.status, func.count(Lead.id))
+        .where(Lead.company_id == company_id)
+        .group_by(func.date(Lead.created_at), Lead.status)
+    )
+    for day, lead_status, count in lead_rows:
+        day = _as_date(day)
+        deltas[(company_id, day, LEADS_CREATED, "")] += count
+        # Status history is not stored, so a rebuild books each lead's current status
+        # on its creation day; per-status totals stay exact.
+        deltas[(company_id, day, LEAD_STATUS_TRANSITIONS, _transition(None, lead_status))] += count
+
+    # Category and priority are stored at ingest; only rows missing one are classified.
+    classified = EmailMessage.category.is_not(None) & EmailMessage.priority.is_not(None)
+    email_day = func.date(EmailMessage.received_at)
+    stored_rows = db.execute(
+        select(email_day, EmailMessage.category, EmailMessage.priority, func.count(EmailMessage.id))
+        .where(EmailMessage.company_id == company_id, classified)
+        .group_by(email_day, EmailMessage.category, EmailMessage.priority)
+    )
+    for day, category, priority, count in stored_rows:
+        day = _as_date(day)
+        deltas[(company_id, day, EMAILS_BY_CATEGORY, category)] += count
+        deltas[(company_id, day, EMAILS_BY_PRIORITY, priority)] += count
+
+    unclassified_rows = db.execute(
+        select(
+            EmailMessage.received_at,
+            EmailMessage.category,
+            EmailMessage.priority,
+            EmailMessage.subject,
+            EmailMessage.body,
+        )
+        .where(EmailMessage.company_id == company_id, ~classified)
+        .execution_options(yield_per=1000)
+    )
+    for received_at, category, priority, subject, body in unclassified_rows:
+        day = received_at.date()
+        category = category or classify_category(subject, body)[0]
+        priority = priority or classify_priority(subject, body)
+        deltas[(company_id, day, EMAILS_BY_CATEGORY, category)] += 1
+        deltas[(company_id, day, EMAILS_BY_PRIORITY, priority)] += 1
+
+    reply_rows = db.execute(
+        select(
+            func.date(EmailReply.created_at),
+            EmailReply.send_status,
+            EmailReply.generated_by_ai,
+            func.count(EmailReply.id),
+        )
+        .where(EmailReply.company_id == company_id)
+        .group_by(
+            func.date(EmailReply.created_at), EmailReply.send_status, EmailReply.generated_by_ai
+        )
+    )
+    for day, send_status, generated_by_ai, count in reply_rows:
+        day = _as_date(day)
+        deltas[(company_id, day, REPLIES_BY_STATUS, send_status)] += count
+        deltas[(company_id, day, REPLIES_BY_ORIGIN, "ai" if generated_by_ai else "manual")] += count
+    return deltas
+
+
+def rebuild_company_stats(db: Session, company_id: int) -> int:
+    """Replace a company's rollup with counters recomputed from the raw tables.
+
+    The delete, the recount and the insert run in one transaction that holds the
+    company's stats lock, so concurrent ingest waits instead of being overwritten.
+    """
+    _lock_company_stats(db, [company_id], exclusive=True)
+    # Writing first takes SQLite's write lock before the raw tables are read.
+    db.execute(delete(DailyCompanyStat).where(DailyCompanyStat.company_id == company_id))
+    deltas = _company_deltas(db, company_id)
+    rows = [
+        {
+            "company_id": company_id,
+            "day": day,
+            "metric": metric,
+            "dimension": dimension,
+            "value": value,
+        }
+        for (_, day, metric, dimension), value in deltas.items()
+        if value
+    ]
+    if rows:
+        db.execute(insert(DailyCompanyStat), rows)
+    db.commit()
+    invalidate_dashboard_cache(company_id)
+    logger.info("stats.daily.rebuilt", extra={"company_id": company_id, "rows": len(rows)})
+    return len(rows)
+
+
+@dataclass
+class CompanyStats:
+    """Rollup counters for one company, as read by the dashboard and analytics."""
+
+    since: date
+    daily: dict[tuple[str, str, date], int] = field(default_factory=dict)
+    lead_status_counts: dict[str, int] = field(default_factory=dict)
+
+    def total(self, metric: str, dimensions: Iterable[str] | None = None) -> int:
+        wanted = set(dimensions) if dimensions is not None else None
+        return sum(
+            value
+            for (name, dimension, _), value in self.daily.items()
+            if name == metric and (wanted is None or dimension in wanted)
+        )
+
+    def by_dimension(self, metric: str) -> dict[str, int]:
+        totals: Counter = Counter()
+        for (name, dimension, _), value in self.daily.items():
+            if name == metric:
+                totals[dimension] += value
+        return dict(totals)
+
+    def by_day(self, metric: str, since: date | None = None) -> dict[date, int]:
+        totals: Counter = Counter()
+        for (name, _, day), value in self.daily.items():
+            if name == metric and (since is None or day >= since):
+                totals[day] += value
+        return dict(totals)
+
+
+async def load_company_stats(db: AsyncSession, company_id: int | None, since: date) -> CompanyStats:
+    """Read the window's daily counters and all-time lead status totals in one query."""
+    # Transitions are summed over all time; NULL collapses their days into one group.
+    bucket_day = case(
+        (DailyCompanyStat.metric != LEAD_STATUS_TRANSITIONS, DailyCompanyStat.day)
+    ).label("bucket_day")
+    rows = await db.execute(
+        select(
+            DailyCompanyStat.metric,
+            DailyCompanyStat.dimension,
+            bucket_day,
+            func.sum(DailyCompanyStat.value),
+        )
+        .where(
+            DailyCompanyStat.company_id == company_id,
+            or_(
+                DailyCompanyStat.day >= since,
+                DailyCompanyStat.metric == LEAD_STATUS_TRANSITIONS,
+            ),
+        )
+        .group_by(DailyCompanyStat.metric, DailyCompanyStat.dimension, bucket_day)
+    )
+    stats = CompanyStats(since=since)
+    counts: Counter = Counter()
+    for metric, dimension, day, value in rows:
+        if metric != LEAD_STATUS_TRANSITIONS:
+            stats.daily[(metric, dimension, day)] = value
+            continue
+        previous_status, _, current_status = dimension.partition(">")
+        if previous_status:
+            counts[previous_status] -= value
+        if current_status:
+            counts[current_status] += value
+    stats.lead_status_counts = {key: value for key, value in counts.items() if value}
+    return stats
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from app.core.cache import TTLCache, VersionStamps, get_redis, redis_enabled
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+cache_requests = registry.counter(
+    "dashboard_cache_requests_total", "Dashboard cache lookups by endpoint and result"
+)
+
+_responses = TTLCache(
+    maxsize=settings.dashboard_cache_max_entries,
+    ttl=settings.dashboard_cache_ttl_seconds,
+)
+_versions = VersionStamps("dashboard_version")
+_inflight: dict[tuple[int | None, int, str], asyncio.Future] = {}
+
+LOCK_POLL_SECONDS = 0.05
+
+
+def _redis_key(company_id: int | None, version: int, name: str) -> str:
+    return f"dashboard:{company_id}:{version}:{name}"
+
+
+def _redis_get(key: str) -> bytes | None:
+    try:
+        return get_redis().get(key)
+    except RedisError as exc:
+        logger.warning("dashboard.cache.unavailable", extra={"error": str(exc)})
+        return None
+
+
+def _redis_set(key: str, payload: str) -> None:
+    try:
+        get_redis().set(key, payload, px=int(settings.dashboard_cache_ttl_seconds * 1000))
+    except RedisError as exc:
+        logger.warning("dashboard.cache.unavailable", extra={"error": str(exc)})
+
+
+def _redis_lock(key: str) -> bool:
+    try:
+        return bool(
+            get_redis().set(
+                f"{key}:lock", "1", nx=True, px=int(settings.dashboard_cache_lock_seconds * 1000)
+            )
+        )
+    except RedisError:
+        # Without Redis there is nothing to coordinate on; compute locally.
+        return True
+
+
+async def _read(
+    company_id: int | None, version: int, name: str, model: type[ResponseT]
+) -> ResponseT | None:
+    if not redis_enabled():
+        return _responses.get((company_id, version, name))
+    payload = await asyncio.to_thread(_redis_get, _redis_key(company_id, version, name))
+    return model.model_validate_json(payload) if payload is not None else None
+
+
+async def _write(company_id: int | None, version: int, name: str, response: BaseModel) -> None:
+    if not redis_enabled():
+        _responses.set((company_id, version, name), response)
+        return
+    await asyncio.to_thread(
+        _redis_set, _redis_key(company_id, version, name), response.model_dump_json()
+    )
+
+
+async def _wait_for_other_worker(
+    company_id: int | None, version: int, name: str, model: type[ResponseT]
+) -> ResponseT | None:
+    key = _redis_key(company_id, version, name)
+    if await asyncio.to_thread(_redis_lock, key):
+        return None
+    waited = 0.0
+    while waited < settings.dashboard_cache_lock_seconds:
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+        waited += LOCK_POLL_SECONDS
+        cached = await _read(company_id, version, name, model)
+        if cached is not None:
+            return cached
+    return None
+
+
+async def cached_dashboard_response(
+    company_id: int | None,
+    name: str,
+    model: type[ResponseT],
+    compute: Callable[[], Awaitable[ResponseT]],
+) -> ResponseT:
+    """Serve a company's dashboard response from cache, computing it at most once per expiry.
+
+    Concurrent misses in this process share one computation; with the Redis
+    backend, workers also take a short lock so only one of them recomputes.
+    """
+    if settings.dashboard_cache_ttl_seconds <= 0:
+        return await compute()
+    if redis_enabled():
+        version = await asyncio.to_thread(_versions.current, company_id)
+    else:
+        version = _versions.current(company_id)
+    if version is None:
+        cache_requests.inc(endpoint=name, result="bypass")
+        return await compute()
+
+    cached = await _read(company_id, version, name, model)
+    if cached is not None:
+        cache_requests.inc(endpoint=name, result="hit")
+        return cached
+
+    key = (company_id, version, name)
+    pending = _inflight.get(key)
+    if pending is not None:
+        cache_requests.inc(endpoint=name, result="coalesced")
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        response = None
+        if redis_enabled():
+            response = await _wait_for_other_worker(company_id, version, name, model)
+        if response is None:
+            cache_requests.inc(endpoint=name, result="miss")
+            response = await compute()
+            await _write(company_id, version, name, response)
+        else:
+            cache_requests.inc(endpoint=name, result="coalesced")
+        future.set_result(response)
+        return response
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Waiters re-raise the exception; mark it retrieved so an unawaited future stays quiet.
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+def invalidate_dashboard_cache(company_id: int | None) -> None:
+    if company_id is None:
+        return
+    _versions.bump(company_id)
@@ -34,12 +34,30 @@ def _normalize_text(subject: str, body: str) -> str:
     return f"{subject} {body}".lower()
 
 
+MATCHED_CONFIDENCE = 88
+FALLBACK_CONFIDENCE = 72
+
+
 def classify_category(subject: str, body: str) -> tuple[str, int]:
     text = _normalize_text(subject, body)
     for category, keywords in CATEGORY_RULES:
         if any(keyword in text for keyword in keywords):
-            return category, 88
-    return "Other", 72
+            return category, MATCHED_CONFIDENCE
+    return "Other", FALLBACK_CONFIDENCE
+
+
+def email_classification(email: EmailMessage) -> tuple[str, str, int]:
+    """``(category, priority, confidence)``, preferring the values stored at ingest.
+
+    Only messages stored before classification was persisted are classified here.
+    """
+    if email.category:
+        category = email.category
+        confidence = FALLBACK_CONFIDENCE if category == "Other" else MATCHED_CONFIDENCE
+    else:
+        category, confidence = classify_category(email.subject, email.body)
+    priority = email.priority or classify_priority(email.subject, email.body)
+    return category, priority, confidence
 
 
 def classify_priority(subject: str, body: str) -> str:
@@ -88,8 +106,7 @@ def analyze_email(
     email: EmailMessage,
     company: Company | None = None,
 ) -> EmailAnalysisResult:
-    category, confidence = classify_category(email.subject, email.body)
-    priority = classify_priority(email.subject, email.body)
+    category, priority, confidence = email_classification(email)
     summary = summarize_email(email.body)
     suggestion = build_reply_suggestion(db, email, company)
     return EmailAnalysisResult(
@@ -0,0 +1,55 @@
+"""Inbox search: full-text terms plus category, priority, route, processed and date filters.
+
+Terms match as word prefixes in subject, body or sender (index:
+``app/core/fulltext.py``). Results keep the inbox order, newest first, so they
+page with the same ``(received_at, id)`` keyset as ``GET /emails``.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Select, column, literal_column, select, table
+
+from app.core.fulltext import postgres_match, sqlite_match
+from app.models.email_message import EmailMessage
+
+TEXT_COLUMNS = ("subject", "body", "from_email")
+
+
+@dataclass(frozen=True)
+class EmailSearchFilters:
+    category: str | None = None
+    priority: str | None = None
+    routed_to: str | None = None
+    processed: bool | None = None
+    received_from: datetime | None = None
+    received_to: datetime | None = None
+
+
+def email_search_statement(
+    dialect: str, company_id: int, terms: list[str], filters: EmailSearchFilters
+) -> Select:
+    statement = select(EmailMessage).where(EmailMessage.company_id == company_id)
+    if terms and dialect == "postgresql":
+        vector, tsquery = postgres_match("email_messages", terms)
+        statement = statement.where(vector.op("@@")(tsquery))
+    elif terms:
+        fts = table("email_messages_fts", column("rowid"))
+        statement = statement.join(fts, fts.c.rowid == EmailMessage.id).where(
+            literal_column("email_messages_fts").match(
+                sqlite_match(company_id, terms, TEXT_COLUMNS)
+            )
+        )
+    if filters.category is not None:
+        statement = statement.where(EmailMessage.category == filters.category)
+    if filters.priority is not None:
+        statement = statement.where(EmailMessage.priority == filters.priority)
+    if filters.routed_to is not None:
+        statement = statement.where(EmailMessage.routed_to == filters.routed_to)
+    if filters.processed is not None:
+        statement = statement.where(EmailMessage.processed.is_(filters.processed))
+    if filters.received_from is not None:
+        statement = statement.where(EmailMessage.received_at >= filters.received_from)
+    if filters.received_to is not None:
+        statement = statement.where(EmailMessage.received_at < filters.received_to)
+    return statement
@@ -3,33 +3,114 @@ from datetime import datetime
 
 from sqlalchemy.orm import Session
 
+from app.core.bulk import insert_returning
 from app.models.email_message import EmailMessage
 from app.models.email_reply import EmailReply
 from app.models.email_integration import EmailIntegration
 from app.models.lead import Lead
 from app.schemas.email_message import EmailMessageCreate
+from app.services.daily_stats_service import (
+    record_email_received,
+    record_emails_received,
+    record_lead_status_change,
+    record_lead_status_changes,
+    record_reply_created,
+    record_reply_status_change,
+)
+from app.services.dashboard_cache import invalidate_dashboard_cache
+from app.services.email_analysis_service import classify_category, classify_priority
 from app.services.email_provider import get_email_client
+from app.services.lead_email_filter import lead_email_filter
 
 logger = logging.getLogger(__name__)
 
 
-def receive_email(db: Session, email_in: EmailMessageCreate) -> tuple[EmailMessage, int | None]:
-    matched_lead = db.query(Lead).filter(Lead.email == email_in.from_email).first()
-    company_id = matched_lead.company_id if matched_lead else email_in.company_id
-    email = EmailMessage(
-        **email_in.dict(exclude={"company_id"}),
-        lead_id=matched_lead.id if matched_lead else None,
-        company_id=company_id,
-    )
+def receive_email(db: Session, email_in: EmailMessageCreate) -> tuple[EmailMessage, str | None]:
+    """Store an inbound email and return it with the matched lead's status before ingest."""
+    matched_lead = None
+    # Most inbound mail is from unknown senders; the filter answers those without a query.
+    if lead_email_filter.might_contain(db, email_in.company_id, email_in.from_email):
+        matched_lead = (
+            db.query(Lead)
+            .filter(Lead.company_id == email_in.company_id, Lead.email == email_in.from_email)
+            .first()
+        )
+    previous_status = matched_lead.status if matched_lead else None
+    email = EmailMessage(**_inbound_email_values(email_in, email_in.company_id, matched_lead))
     if matched_lead:
         matched_lead.status = "contacted"
+        record_lead_status_change(db, matched_lead, previous_status)
         db.add(matched_lead)
     else:
         logger.info("No lead matched incoming email", extra={"from_email": email_in.from_email})
     db.add(email)
+    db.flush()
+    record_email_received(db, email)
     db.commit()
     db.refresh(email)
-    return email, company_id
+    invalidate_dashboard_cache(email.company_id)
+    return email, previous_status
+
+
+def receive_emails(
+    db: Session, company_id: int, emails_in: list[EmailMessageCreate]
+) -> list[tuple[EmailMessage, str | None]]:
+    """Store a batch of inbound emails for one company in a single transaction.
+
+    Equivalent to ``receive_email`` for each message in order: senders are
+    matched against the company's leads with one query, emails are inserted
+    together and the daily counters move in one upsert.
+    """
+    senders = {
+        email_in.from_email
+        for email_in in emails_in
+        if lead_email_filter.might_contain(db, company_id, email_in.from_email)
+    }
+    leads: dict[str, Lead] = {}
+    if senders:
+        for lead in (
+            db.query(Lead)
+            .filter(Lead.company_id == company_id, Lead.email.in_(senders))
+            .order_by(Lead.id)
+        ):
+            leads.setdefault(lead.email, lead)
+
+    rows: list[dict] = []
+    previous_statuses: list[str | None] = []
+    status_changes: list[tuple[Lead, str | None]] = []
+    for email_in in emails_in:
+        matched_lead = leads.get(email_in.from_email)
+        previous_status = matched_lead.status if matched_lead else None
+        if matched_lead:
+            matched_lead.status = "contacted"
+            status_changes.append((matched_lead, previous_status))
+        rows.append(_inbound_email_values(email_in, company_id, matched_lead))
+        previous_statuses.append(previous_status)
+    emails = insert_returning(db, EmailMessage, rows)
+    record_emails_received(db, emails)
+    record_lead_status_changes(db, status_changes)
+    email_ids = [email.id for email in emails]
+    db.commit()
+    # Reload the expired rows in one query rather than one refresh per email.
+    db.query(EmailMessage).filter(EmailMessage.id.in_(email_ids)).all()
+    invalidate_dashboard_cache(company_id)
+    logger.info(
+        "email.batch.stored",
+        extra={"company_id": company_id, "emails": len(emails), "matched_leads": len(leads)},
+    )
+    return list(zip(emails, previous_statuses, strict=True))
+
+
+def _inbound_email_values(
+    email_in: EmailMessageCreate, company_id: int | None, lead: Lead | None
+) -> dict:
+    return {
+        **email_in.dict(exclude={"company_id"}),
+        "lead_id": lead.id if lead else None,
+        "company_id": company_id,
+        "category": classify_category(email_in.subject, email_in.body)[0],
+        "priority": classify_priority(email_in.subject, email_in.body),
+    }
 
 
 def create_email_reply(
@@ -42,6 +123,7 @@ def create_email_reply(
 ) -> EmailReply:
     reply = EmailReply(
         email_id=email.id,
+        company_id=email.company_id,
         subject=subject,
         body=body,
         generated_by_ai=generated_by_ai,
@@ -49,8 +131,11 @@ def create_email_reply(
     email.processed = True
     db.add(reply)
     db.add(email)
+    db.flush()
+    record_reply_created(db, reply)
     db.commit()
     db.refresh(reply)
+    invalidate_dashboard_cache(reply.company_id)
     return reply
 
 
@@ -62,6 +147,7 @@ def send_email_reply(
 ) -> EmailReply:
     reply.send_attempted_at = datetime.utcnow()
     reply.provider = integration.provider
+    previous_status = reply.send_status
     client = get_email_client(integration)
     message_id = client.send_email(
         to_email=reply.email.from_email,
@@ -72,6 +158,7 @@ def send_email_reply(
     reply.sent_at = datetime.utcnow()
     reply.provider_message_id = message_id
     reply.send_error = None
+    record_reply_status_change(db, reply, previous_status)
     db.add(reply)
     db.commit()
     db.refresh(reply)
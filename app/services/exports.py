@@ -0,0 +1,221 @@
+"""Streaming CSV / NDJSON exports of leads, emails with replies and activity logs.
+
+Rows are read through a server-side cursor (``yield_per``) on a read session the
+export opens itself, encoded as they arrive and optionally gzip-compressed, so
+memory stays bounded by one batch whatever the export size. Exports are ordered
+by the company's ``(company_id, <timestamp>)`` index and can be limited to a
+``[start, end)`` timestamp range.
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import read_router
+from app.models.activity_log import ActivityLog
+from app.models.email_message import EmailMessage
+from app.models.email_reply import EmailReply
+from app.models.lead import Lead
+
+EXPORT_BATCH_SIZE = 1000
+FLUSH_BYTES = 64 * 1024
+
+LEAD_COLUMNS = (
+    "id",
+    "name",
+    "email",
+    "phone",
+    "message",
+    "preferred_language",
+    "source",
+    "status",
+    "tags",
+    "conversation_summary",
+    "created_at",
+)
+EMAIL_COLUMNS = (
+    "id",
+    "from_email",
+    "subject",
+    "body",
+    "received_at",
+    "processed",
+    "category",
+    "priority",
+    "lead_id",
+)
+REPLY_COLUMNS = (
+    "id",
+    "subject",
+    "body",
+    "generated_by_ai",
+    "send_status",
+    "provider",
+    "sent_at",
+    "created_at",
+)
+# CSV has no nesting: one line per reply (or one per email without replies).
+EMAIL_CSV_COLUMNS = EMAIL_COLUMNS + tuple(f"reply_{column}" for column in REPLY_COLUMNS)
+ACTIVITY_COLUMNS = (
+    "id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "user_id",
+    "description",
+    "created_at",
+)
+
+
+@dataclass(frozen=True)
+class ExportRange:
+    start: datetime | None = None
+    end: datetime | None = None
+
+
+RowSource = Callable[[AsyncSession], AsyncIterator[dict[str, Any]]]
+
+
+def _ranged(statement: Select, column: Any, period: ExportRange) -> Select:
+    if period.start is not None:
+        statement = statement.where(column >= period.start)
+    if period.end is not None:
+        statement = statement.where(column < period.end)
+    return statement.order_by(column, statement.selected_columns.id)
+
+
+async def _stream(db: AsyncSession, statement: Select) -> AsyncIterator[list[Any]]:
+    result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield partition
+
+
+def lead_rows(company_id: int, period: ExportRange) -> RowSource:
+    columns = [getattr(Lead, name) for name in LEAD_COLUMNS]
+    statement = _ranged(
+        select(*columns).where(Lead.company_id == company_id), Lead.created_at, period
+    )
+
+    async def rows(db: AsyncSession) -> AsyncIterator[dict[str, Any]]:
+        async for partition in _stream(db, statement):
+            for row in partition:
+                yield row._asdict()
+
+    return rows
+
+
+def activity_rows(company_id: int, period: ExportRange) -> RowSource:
+    columns = [getattr(ActivityLog, name) for name in ACTIVITY_COLUMNS]
+    statement = _ranged(
+        select(*columns).where(ActivityLog.company_id == company_id),
+        ActivityLog.created_at,
+        period,
+    )
+
+    async def rows(db: AsyncSession) -> AsyncIterator[dict[str, Any]]:
+        async for partition in _stream(db, statement):
+            for row in partition:
+                yield row._asdict()
+
+    return rows
+
+
+def email_rows(company_id: int, period: ExportRange, *, flatten: bool) -> RowSource:
+    """Emails with a nested ``replies`` list, or one flat row per reply when ``flatten``."""
+    columns = [getattr(EmailMessage, name) for name in EMAIL_COLUMNS]
+    statement = _ranged(
+        select(*columns).where(EmailMessage.company_id == company_id),
+        EmailMessage.received_at,
+        period,
+    )
+    reply_columns = [EmailReply.email_id] + [getattr(EmailReply, name) for name in REPLY_COLUMNS]
+
+    async def rows(db: AsyncSession) -> AsyncIterator[dict[str, Any]]:
+        async for partition in _stream(db, statement):
+            # One reply query per batch of emails keeps replies out of the cursor's join.
+            replies: dict[int, list[dict[str, Any]]] = defaultdict(list)
+            reply_result = await db.execute(
+                select(*reply_columns)
+                .where(EmailReply.email_id.in_([row.id for row in partition]))
+                .order_by(EmailReply.email_id, EmailReply.id)
+            )
+            for reply in reply_result:
+                values = reply._asdict()
+                replies[values.pop("email_id")].append(values)
+            for row in partition:
+                email = row._asdict()
+                if not flatten:
+                    yield {**email, "replies": replies.get(row.id, [])}
+                    continue
+                for reply in replies.get(row.id) or [{}]:
+                    yield {**email, **{f"reply_{key}": value for key, value in reply.items()}}
+
+    return rows
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+async def _encode(
+    rows: AsyncIterator[dict[str, Any]], file_format: str, columns: tuple[str, ...]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if file_format == "csv":
+        writer.writerow(columns)
+    async for row in rows:
+        if file_format == "csv":
+            writer.writerow([_csv_value(row.get(column)) for column in columns])
+        else:
+            buffer.write(json.dumps(row, default=_json_default))
+            buffer.write("\n")
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def stream_export(
+    source: RowSource, file_format: str, columns: tuple[str, ...], *, compress: bool
+) -> AsyncIterator[bytes]:
+    """Encoded export bytes; the read session lives exactly as long as the response."""
+    db = await read_router.session()
+    try:
+        chunks = _encode(source(db), file_format, columns)
+        if compress:
+            chunks = _gzip(chunks)
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await db.close()
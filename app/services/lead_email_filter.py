@@ -0,0 +1,184 @@
+"""Per-company Bloom filters of known lead emails.
+
+``receive_email`` asks the filter before querying ``leads``: a negative answer
+means no lead of that company has the sender's address, so most mail from
+unknown senders never touches the database. Positives (including the ~1%
+false positives) fall through to the indexed ``(company_id, email)`` query.
+
+A filter must never miss a lead, so each one remembers the highest lead id it
+has loaded and catches up from the database before trusting a negative:
+
+* with ``CACHE_BACKEND=redis``, whenever another worker has created a lead for
+  the company since the last catch-up (a shared version stamp);
+* otherwise at most every ``LEAD_EMAIL_FILTER_SYNC_SECONDS``.
+
+Filters are built for every company on startup, lazily for companies seen
+later, and rebuilt at twice the size once they outgrow their capacity.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionStamps, redis_enabled, register_local_cache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.models.lead import Lead
+
+logger = logging.getLogger(__name__)
+
+FALSE_POSITIVE_RATE = 0.01
+MIN_CAPACITY = 1024
+REBUILD_BATCH_SIZE = 5000
+
+lookups = registry.counter(
+    "lead_email_filter_lookups_total", "Lead email filter checks by result"
+)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, false_positive_rate: float = FALSE_POSITIVE_RATE) -> None:
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size for index in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value)
+        )
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+@dataclass
+class _CompanyFilter:
+    bloom: BloomFilter
+    last_lead_id: int
+    version: int | None
+    synced_at: float = field(default_factory=time.monotonic)
+
+
+class LeadEmailFilter:
+    def __init__(self) -> None:
+        self._filters: dict[int, _CompanyFilter] = {}
+        self._lock = threading.Lock()
+        self._versions = VersionStamps("lead_email_filter_version")
+        register_local_cache(self)
+
+    def might_contain(self, db: Session, company_id: int | None, email: str) -> bool:
+        """``False`` only when no lead of ``company_id`` can have ``email``."""
+        if not settings.lead_email_filter_enabled or company_id is None:
+            return True
+        email = normalize_email(email)
+        company_filter = self._filters.get(company_id) or self._build(db, company_id)
+        if email not in company_filter.bloom:
+            version = self._versions.current(company_id)
+            if version is None:
+                # The shared stamp is unreachable, so the filter may be stale.
+                lookups.inc(result="unknown")
+                return True
+            if self._is_stale(company_filter, version):
+                company_filter = self._catch_up(db, company_id, company_filter, version)
+            if email not in company_filter.bloom:
+                lookups.inc(result="negative")
+                return False
+        lookups.inc(result="maybe")
+        return True
+
+    def add(self, company_id: int | None, email: str) -> None:
+        """Record a committed lead; other workers catch up through the version stamp."""
+        self.add_many(company_id, [email])
+
+    def add_many(self, company_id: int | None, emails: list[str]) -> None:
+        if company_id is None or not emails:
+            return
+        company_filter = self._filters.get(company_id)
+        if company_filter is not None:
+            # The high-water mark is left alone: leads committed elsewhere with lower ids
+            # must still be picked up by the next catch-up.
+            for email in emails:
+                company_filter.bloom.add(normalize_email(email))
+        self._versions.bump(company_id)
+
+    def rebuild_all(self, db: Session) -> int:
+        """Build filters for every company with leads; returns the number built."""
+        company_ids = db.scalars(
+            select(Lead.company_id).where(Lead.company_id.is_not(None)).distinct()
+        ).all()
+        for company_id in company_ids:
+            self._build(db, company_id)
+        logger.info("lead_email_filter.rebuilt", extra={"companies": len(company_ids)})
+        return len(company_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._filters.clear()
+
+    def _is_stale(self, company_filter: _CompanyFilter, version: int) -> bool:
+        if redis_enabled():
+            return version != company_filter.version
+        elapsed = time.monotonic() - company_filter.synced_at
+        return elapsed >= settings.lead_email_filter_sync_seconds
+
+    def _build(self, db: Session, company_id: int) -> _CompanyFilter:
+        # Read the stamp first so leads created during the build trigger another catch-up.
+        version = self._versions.current(company_id)
+        count = db.scalar(select(func.count()).where(Lead.company_id == company_id)) or 0
+        company_filter = _CompanyFilter(
+            bloom=BloomFilter(max(MIN_CAPACITY, count * 2)), last_lead_id=0, version=version
+        )
+        self._load_new_leads(db, company_id, company_filter)
+        with self._lock:
+            self._filters[company_id] = company_filter
+        return company_filter
+
+    def _catch_up(
+        self, db: Session, company_id: int, company_filter: _CompanyFilter, version: int
+    ) -> _CompanyFilter:
+        self._load_new_leads(db, company_id, company_filter)
+        company_filter.version = version
+        company_filter.synced_at = time.monotonic()
+        if company_filter.bloom.count > company_filter.bloom.capacity:
+            return self._build(db, company_id)
+        return company_filter
+
+    @staticmethod
+    def _load_new_leads(db: Session, company_id: int, company_filter: _CompanyFilter) -> None:
+        while True:
+            rows = db.execute(
+                select(Lead.id, Lead.email)
+                .where(Lead.company_id == company_id, Lead.id > company_filter.last_lead_id)
+                .order_by(Lead.id)
+                .limit(REBUILD_BATCH_SIZE)
+            ).all()
+            for _, email in rows:
+                company_filter.bloom.add(normalize_email(email))
+            if len(rows) < REBUILD_BATCH_SIZE:
+                if rows:
+                    company_filter.last_lead_id = rows[-1].id
+                return
+            company_filter.last_lead_id = rows[-1].id
+
+
+lead_email_filter = LeadEmailFilter()
@@ -0,0 +1,273 @@
+"""Streaming bulk lead import from CSV or NDJSON uploads.
+
+An upload is copied to ``LEAD_IMPORT_DIR`` and processed by ``import_leads_task``
+in chunks of ``LEAD_IMPORT_CHUNK_SIZE`` rows. Each row is validated with
+``LeadCreate``; rows whose email already belongs to one of the company's leads,
+or appears earlier in the file, are counted as duplicates, and the rest are
+bulk-inserted. Memory is bounded by one chunk whatever the file size.
+
+A chunk's inserts, counters and the import's checkpoint (row count and byte
+offset) commit together, so a failed or interrupted import resumes right after
+its last committed chunk without duplicating leads. Rejected rows are written
+to an NDJSON error file, which is cut back to its committed length on resume.
+"""
+
+import csv
+import json
+import logging
+import shutil
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from pydantic import ValidationError
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.lead_import import LeadImport
+from app.schemas.lead import LeadCreate
+from app.services.activity_service import log_activity
+from app.services.dashboard_cache import invalidate_dashboard_cache
+from app.services.lead_email_filter import lead_email_filter
+from app.services.lead_service import create_leads_bulk, existing_lead_emails
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+COPY_BUFFER_BYTES = 1024 * 1024
+_MALFORMED = object()
+
+
+def import_dir() -> Path:
+    return Path(settings.lead_import_dir)
+
+
+def source_path(lead_import: LeadImport) -> Path:
+    return import_dir() / f"{lead_import.id}.{lead_import.file_format}"
+
+
+def error_path(lead_import: LeadImport) -> Path:
+    return import_dir() / f"{lead_import.id}.errors.ndjson"
+
+
+def detect_format(filename: str) -> str | None:
+    return EXTENSIONS.get(Path(filename).suffix.lower())
+
+
+def create_lead_import(
+    db: Session,
+    *,
+    company_id: int,
+    user_id: int | None,
+    filename: str,
+    file_format: str,
+    upload: BinaryIO,
+) -> LeadImport:
+    """Record a pending import and copy the upload next to it, a buffer at a time."""
+    lead_import = LeadImport(
+        company_id=company_id, user_id=user_id, filename=filename, file_format=file_format
+    )
+    db.add(lead_import)
+    db.flush()
+    path = source_path(lead_import)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with path.open("wb") as target:
+            shutil.copyfileobj(upload, target, COPY_BUFFER_BYTES)
+            lead_import.size_bytes = target.tell()
+        db.commit()
+    except BaseException:
+        db.rollback()
+        path.unlink(missing_ok=True)
+        raise
+    db.refresh(lead_import)
+    logger.info(
+        "lead_import.uploaded",
+        extra={
+            "import_id": lead_import.id,
+            "company_id": company_id,
+            "format": file_format,
+            "size_bytes": lead_import.size_bytes,
+        },
+    )
+    return lead_import
+
+
+def resume_lead_import(db: Session, lead_import: LeadImport) -> bool:
+    """Queue a failed import, or one whose worker stopped reporting, to run again."""
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.lead_import_stale_seconds)
+    stalled = lead_import.status == "running" and lead_import.updated_at < stale_before
+    if lead_import.status != "failed" and not stalled:
+        return False
+    lead_import.status = "pending"
+    lead_import.error_message = None
+    lead_import.updated_at = datetime.utcnow()
+    db.commit()
+    return True
+
+
+def run_lead_import(db: Session, import_id: int) -> LeadImport | None:
+    """Process a pending import from its checkpoint; ``None`` if another worker has it."""
+    claimed = db.execute(
+        update(LeadImport)
+        .where(LeadImport.id == import_id, LeadImport.status == "pending")
+        .values(status="running", updated_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    if not claimed:
+        logger.info("lead_import.skipped", extra={"import_id": import_id})
+        return None
+    lead_import = db.get(LeadImport, import_id)
+    try:
+        _import_rows(db, lead_import)
+    except Exception as exc:
+        db.rollback()
+        lead_import.status = "failed"
+        lead_import.error_message = str(exc)
+        lead_import.updated_at = datetime.utcnow()
+        db.commit()
+        logger.exception("lead_import.failed", extra={"import_id": import_id})
+        return lead_import
+
+    lead_import.status = "completed"
+    lead_import.completed_at = lead_import.updated_at = datetime.utcnow()
+    db.commit()
+    log_activity(
+        db,
+        action="import",
+        entity_type="lead",
+        entity_id=None,
+        company_id=lead_import.company_id,
+        user_id=lead_import.user_id,
+        description=f"Imported {lead_import.created_count} leads from {lead_import.filename}",
+    )
+    logger.info(
+        "lead_import.completed",
+        extra={
+            "import_id": import_id,
+            "company_id": lead_import.company_id,
+            "created": lead_import.created_count,
+            "duplicates": lead_import.duplicate_count,
+            "errors": lead_import.error_count,
+        },
+    )
+    return lead_import
+
+
+def _import_rows(db: Session, lead_import: LeadImport) -> None:
+    errors = error_path(lead_import)
+    errors.touch()
+    with source_path(lead_import).open("rb") as source, errors.open("r+b") as error_file:
+        # Drop error lines written by a chunk that never committed.
+        error_file.truncate(lead_import.error_bytes)
+        error_file.seek(lead_import.error_bytes)
+        rows = _read_rows(source, lead_import.file_format, lead_import.bytes_processed)
+        while chunk := list(islice(rows, settings.lead_import_chunk_size)):
+            _import_chunk(db, lead_import, chunk, error_file)
+
+
+def _import_chunk(
+    db: Session, lead_import: LeadImport, chunk: list[tuple[int, Any]], error_file: BinaryIO
+) -> None:
+    company_id = lead_import.company_id
+    row_number = lead_import.rows_processed
+    valid: dict[str, LeadCreate] = {}
+    duplicates = rejected = 0
+    for _, values in chunk:
+        row_number += 1
+        try:
+            if values is _MALFORMED:
+                raise ValueError("Row is not a JSON object")
+            lead_in = LeadCreate.model_validate(values)
+        except (ValidationError, ValueError) as exc:
+            error_file.write(_error_line(row_number, exc))
+            rejected += 1
+            continue
+        if lead_in.email in valid:
+            duplicates += 1
+        else:
+            valid[lead_in.email] = lead_in
+
+    existing = existing_lead_emails(db, company_id, list(valid))
+    new_leads = [lead_in for email, lead_in in valid.items() if email not in existing]
+    create_leads_bulk(db, new_leads, company_id)
+
+    error_file.flush()
+    lead_import.rows_processed = row_number
+    lead_import.bytes_processed = chunk[-1][0]
+    lead_import.created_count += len(new_leads)
+    lead_import.duplicate_count += duplicates + len(existing)
+    lead_import.error_count += rejected
+    lead_import.error_bytes = error_file.tell()
+    lead_import.updated_at = datetime.utcnow()
+    db.commit()
+    lead_email_filter.add_many(company_id, [lead_in.email for lead_in in new_leads])
+    if new_leads:
+        invalidate_dashboard_cache(company_id)
+
+
+def _error_line(row_number: int, exc: Exception) -> bytes:
+    if isinstance(exc, ValidationError):
+        errors = [
+            {
+                "field": ".".join(str(item) for item in error.get("loc", [])) or "row",
+                "message": error.get("msg", "Invalid value"),
+                "type": error.get("type", "validation_error"),
+            }
+            for error in exc.errors()
+        ]
+    else:
+        errors = [{"field": "row", "message": str(exc), "type": "json_invalid"}]
+    return (json.dumps({"row": row_number, "errors": errors}) + "\n").encode()
+
+
+class _Lines:
+    """Decoded lines of a binary file from ``offset``, tracking the bytes consumed."""
+
+    def __init__(self, handle: BinaryIO, offset: int) -> None:
+        handle.seek(offset)
+        self._handle = handle
+        self.offset = offset
+
+    def __iter__(self) -> Iterator[str]:
+        for raw in self._handle:
+            line = raw.decode("utf-8", errors="replace")
+            if self.offset == 0:
+                line = line.removeprefix("\ufeff")
+            self.offset += len(raw)
+            yield line
+
+
+def _read_rows(handle: BinaryIO, file_format: str, offset: int) -> Iterator[tuple[int, Any]]:
+    """``(end_offset, values)`` per data row, starting at byte ``offset``."""
+    if file_format == "csv":
+        yield from _csv_rows(handle, offset)
+        return
+    lines = _Lines(handle, offset)
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            values = json.loads(line)
+        except ValueError:
+            values = _MALFORMED
+        yield lines.offset, values if isinstance(values, dict) else _MALFORMED
+
+
+def _csv_rows(handle: BinaryIO, offset: int) -> Iterator[tuple[int, dict[str, Any]]]:
+    header_lines = _Lines(handle, 0)
+    header = next(csv.reader(header_lines), None)
+    if header is None:
+        return
+    columns = [name.strip().lower() for name in header]
+    # The csv reader consumes exactly the lines of each record, so offsets stay exact.
+    lines = _Lines(handle, max(offset, header_lines.offset))
+    for record in csv.reader(lines):
+        if not record:
+            continue
+        values = {column: value or None for column, value in zip(columns, record, strict=False)}
+        yield lines.offset, values
@@ -0,0 +1,62 @@
+"""Ranked full-text search over a company's leads.
+
+Every term of the query must match, as a word prefix, in name, email, phone,
+message, tags or conversation summary (index: ``app/core/fulltext.py``).
+Results are ordered by relevance, then newest id, and paged with a
+``(score, id)`` keyset so deep pages stay cheap.
+"""
+
+from typing import Any
+
+from sqlalchemy import Select, column, func, literal_column, select, table, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.fulltext import postgres_match, sqlite_match
+from app.models.lead import Lead
+
+TEXT_COLUMNS = ("name", "email", "phone", "message", "tags", "conversation_summary")
+# bm25 weights in FTS5 column order: name, email, phone, message, tags, summary, company_id.
+SQLITE_WEIGHTS = (10.0, 10.0, 5.0, 1.0, 5.0, 1.0, 0.0)
+
+
+def _postgres_statement(company_id: int, terms: list[str]) -> tuple[Select, Any]:
+    vector, tsquery = postgres_match("leads", terms)
+    score = func.ts_rank(vector, tsquery)
+    statement = select(Lead, score.label("score")).where(
+        Lead.company_id == company_id, vector.op("@@")(tsquery)
+    )
+    return statement, score
+
+
+def _sqlite_statement(company_id: int, terms: list[str]) -> tuple[Select, Any]:
+    fts = table("leads_fts", column("rowid"))
+    match_target = literal_column("leads_fts")
+    # bm25 is lower-is-better; negate it so both dialects page by descending score.
+    score = -func.bm25(match_target, *SQLITE_WEIGHTS)
+    statement = (
+        select(Lead, score.label("score"))
+        .join(fts, fts.c.rowid == Lead.id)
+        .where(
+            match_target.match(sqlite_match(company_id, terms, TEXT_COLUMNS)),
+            Lead.company_id == company_id,
+        )
+    )
+    return statement, score
+
+
+async def search_leads(
+    db: AsyncSession,
+    company_id: int,
+    terms: list[str],
+    limit: int,
+    after: tuple[float, int] | None = None,
+) -> list[tuple[Lead, float]]:
+    """Up to ``limit + 1`` ``(lead, score)`` rows, best match first, after the cursor position."""
+    if db.bind.dialect.name == "postgresql":
+        statement, score = _postgres_statement(company_id, terms)
+    else:
+        statement, score = _sqlite_statement(company_id, terms)
+    if after is not None:
+        statement = statement.where(tuple_(score, Lead.id) < tuple_(*after))
+    statement = statement.order_by(score.desc(), Lead.id.desc()).limit(limit + 1)
+    return [(lead, float(lead_score)) for lead, lead_score in (await db.execute(statement)).all()]
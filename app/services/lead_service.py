@@ -1,12 +1,42 @@
 import logging
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.core.bulk import insert_returning
 from app.models.lead import Lead
+from app.models.lead_tag import LeadTag
 from app.schemas.lead import LeadCreate, LeadUpdate
+from app.services.daily_stats_service import (
+    record_lead_created,
+    record_lead_status_change,
+    record_leads_created,
+)
+from app.services.dashboard_cache import invalidate_dashboard_cache
+from app.services.lead_email_filter import lead_email_filter
 
 logger = logging.getLogger(__name__)
 
+
+def normalize_tag(tag: str) -> str:
+    return tag.strip().lower()
+
+
+def _lead_tag_rows(lead: Lead, tags: list[str] | None) -> list[LeadTag]:
+    """``lead_tags`` rows for ``tags``, normalized and de-duplicated; the lead needs an id."""
+    normalized = dict.fromkeys(normalize_tag(tag) for tag in tags or [])
+    return [
+        LeadTag(
+            lead_id=lead.id,
+            tag=tag,
+            company_id=lead.company_id,
+            lead_created_at=lead.created_at,
+        )
+        for tag in normalized
+        if tag
+    ]
+
+
 def create_lead(db: Session, lead_in: LeadCreate, company_id: int | None = None) -> Lead:
     data = lead_in.dict(exclude_none=True)
     tags = data.pop("tags", None)
@@ -16,12 +46,65 @@ def create_lead(db: Session, lead_in: LeadCreate, company_id: int | None = None)
         company_id=company_id,
     )
     db.add(lead)
+    db.flush()
+    db.add_all(_lead_tag_rows(lead, tags))
+    record_lead_created(db, lead)
     db.commit()
     db.refresh(lead)
+    invalidate_dashboard_cache(company_id)
+    lead_email_filter.add(company_id, lead.email)
     logger.info("Created lead", extra={"lead_id": lead.id, "company_id": company_id})
     return lead
 
 
+def existing_lead_emails(db: Session, company_id: int, emails: list[str]) -> set[str]:
+    """The subset of ``emails`` that already belong to a lead of ``company_id``."""
+    candidates = [
+        email for email in emails if lead_email_filter.might_contain(db, company_id, email)
+    ]
+    if not candidates:
+        return set()
+    return set(
+        db.scalars(
+            select(Lead.email).where(Lead.company_id == company_id, Lead.email.in_(candidates))
+        )
+    )
+
+
+def create_leads_bulk(db: Session, leads_in: list[LeadCreate], company_id: int) -> list[Lead]:
+    """Insert many leads with their ``lead_tags`` and counters; the caller commits.
+
+    Once committed, pass the emails to ``lead_email_filter.add_many``.
+    """
+    if not leads_in:
+        return []
+    rows, tags_by_row = [], []
+    for lead_in in leads_in:
+        data = lead_in.dict(exclude={"tags"})
+        data["source"] = data["source"] or "chat"
+        data["tags"] = ",".join(lead_in.tags) if lead_in.tags else None
+        rows.append({**data, "company_id": company_id})
+        tags_by_row.append(lead_in.tags)
+    leads = insert_returning(db, Lead, rows)
+    for lead, tags in zip(leads, tags_by_row, strict=True):
+        db.add_all(_lead_tag_rows(lead, tags))
+    record_leads_created(db, leads)
+    return leads
+
+
+def add_lead_tags(db: Session, lead: Lead, tags: list[str]) -> bool:
+    """Append the ``tags`` the lead does not have yet; returns whether any were added."""
+    existing = [tag.strip() for tag in (lead.tags or "").split(",") if tag.strip()]
+    known = {normalize_tag(tag) for tag in existing}
+    added = [tag for tag in dict.fromkeys(tags) if normalize_tag(tag) not in known | {""}]
+    if not added:
+        return False
+    lead.tags = ",".join(existing + added)
+    db.add_all(_lead_tag_rows(lead, added))
+    db.add(lead)
+    return True
+
+
 def list_leads(db: Session, company_id: int) -> list[Lead]:
     return db.query(Lead).filter(Lead.company_id == company_id).order_by(Lead.created_at.desc()).all()
 
@@ -31,8 +114,12 @@ def update_lead(db: Session, lead: Lead, lead_in: LeadUpdate) -> Lead:
     if "tags" in data:
         tags = data.pop("tags")
         data["tags"] = ",".join(tags) if tags else None
+        db.execute(delete(LeadTag).where(LeadTag.lead_id == lead.id))
+        db.add_all(_lead_tag_rows(lead, tags))
+    previous_status = lead.status
     for key, value in data.items():
         setattr(lead, key, value)
+    record_lead_status_change(db, lead, previous_status)
     db.add(lead)
     db.commit()
     db.refresh(lead)
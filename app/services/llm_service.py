@@ -6,8 +6,16 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+FALLBACK_REPLY = (
+    "Thanks for reaching out. Our team is reviewing your request and will respond shortly."
+)
 
-def generate_ai_reply(prompt: str, model: str | None = None) -> str:
+
+class LLMServiceError(Exception):
+    pass
+
+
+def request_ai_reply(prompt: str, model: str | None = None) -> str:
     payload = {
         "model": model or settings.ai_default_model,
         "messages": [
@@ -30,5 +38,12 @@ def generate_ai_reply(prompt: str, model: str | None = None) -> str:
         data = response.json()
         return data["choices"][0]["message"]["content"].strip()
     except Exception as exc:  # noqa: BLE001
+        raise LLMServiceError(str(exc)) from exc
+
+
+def generate_ai_reply(prompt: str, model: str | None = None) -> str:
+    try:
+        return request_ai_reply(prompt, model)
+    except LLMServiceError as exc:
         logger.exception("Failed to generate AI reply", exc_info=exc)
-        return "Thanks for reaching out. Our team is reviewing your request and will respond shortly."
+        return FALLBACK_REPLY
@@ -0,0 +1,129 @@
+import logging
+import string
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, VersionStamps
+from app.core.config import settings
+from app.models.auto_reply_template import AutoReplyTemplate
+
+logger = logging.getLogger(__name__)
+
+_formatter = string.Formatter()
+
+# (literal_text, field_name, format_spec, conversion) as produced by string.Formatter.parse
+Segment = tuple[str, str | None, str, str | None]
+
+
+class SafeDict(dict):
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+def _compile_format(source: str) -> tuple[Segment, ...] | None:
+    """Pre-parse a ``str.format`` template.
+
+    Returns ``None`` for templates the fast path does not handle (positional or
+    nested fields, malformed braces); those are rendered with ``format_map`` so
+    their behaviour, including errors, stays exactly as before.
+    """
+    try:
+        parsed = list(_formatter.parse(source))
+    except ValueError:
+        return None
+    segments: list[Segment] = []
+    for literal, field_name, format_spec, conversion in parsed:
+        if field_name is not None:
+            if not field_name or field_name[0].isdigit() or "{" in (format_spec or ""):
+                return None
+        segments.append((literal, field_name, format_spec or "", conversion))
+    return tuple(segments)
+
+
+def _render(source: str, segments: tuple[Segment, ...] | None, context: SafeDict) -> str:
+    if segments is None:
+        return source.format_map(context)
+    parts: list[str] = []
+    for literal, field_name, format_spec, conversion in segments:
+        if literal:
+            parts.append(literal)
+        if field_name is None:
+            continue
+        value, _ = _formatter.get_field(field_name, (), context)
+        if conversion:
+            value = _formatter.convert_field(value, conversion)
+        parts.append(format(value, format_spec))
+    return "".join(parts)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    id: int
+    company_id: int | None
+    name: str | None
+    category: str | None
+    tone: str | None
+    trigger_type: str
+    subject_template: str
+    body_template: str
+    subject_segments: tuple[Segment, ...] | None
+    body_segments: tuple[Segment, ...] | None
+
+    def render(self, context: dict[str, str]) -> dict[str, str]:
+        safe_context = SafeDict(**context)
+        return {
+            "subject": _render(self.subject_template, self.subject_segments, safe_context),
+            "body": _render(self.body_template, self.body_segments, safe_context),
+        }
+
+
+def compile_template(template: AutoReplyTemplate) -> CompiledTemplate:
+    return CompiledTemplate(
+        id=template.id,
+        company_id=template.company_id,
+        name=template.name,
+        category=template.category,
+        tone=template.tone,
+        trigger_type=template.trigger_type,
+        subject_template=template.subject_template,
+        body_template=template.body_template,
+        subject_segments=_compile_format(template.subject_template),
+        body_segments=_compile_format(template.body_template),
+    )
+
+
+_templates = TTLCache(
+    maxsize=settings.template_cache_max_entries,
+    ttl=settings.template_cache_ttl_seconds,
+)
+_versions = VersionStamps("template_version")
+
+
+def get_cached_template(
+    db: Session, trigger_type: str, company_id: int
+) -> CompiledTemplate | None:
+    version = _versions.current(company_id)
+    key = (company_id, trigger_type)
+    entry = _templates.get(key)
+    if entry is not None and version is not None and entry[0] == version:
+        return entry[1]
+    template = (
+        db.query(AutoReplyTemplate)
+        .filter(
+            AutoReplyTemplate.trigger_type == trigger_type,
+            AutoReplyTemplate.company_id == company_id,
+        )
+        .order_by(AutoReplyTemplate.created_at.desc())
+        .first()
+    )
+    compiled = compile_template(template) if template else None
+    if version is not None:
+        # Misses are cached too so companies without a template skip the query.
+        _templates.set(key, (version, compiled))
+    return compiled
+
+
+def invalidate_template_cache(company_id: int) -> None:
+    _versions.bump(company_id)
+    logger.info("template.cache.invalidated", extra={"company_id": company_id})
@@ -0,0 +1,100 @@
+import json
+import logging
+from collections.abc import Iterator
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.lead import Lead
+from app.schemas.auto_reply_template import LeadRenderFilter
+from app.services.template_cache import CompiledTemplate
+
+logger = logging.getLogger(__name__)
+
+RENDER_COLUMNS = (
+    Lead.id,
+    Lead.name,
+    Lead.email,
+    Lead.phone,
+    Lead.message,
+    Lead.source,
+    Lead.status,
+    Lead.preferred_language,
+)
+
+
+def _lead_statements(
+    company_id: int,
+    lead_ids: list[int] | None,
+    lead_filter: LeadRenderFilter | None,
+):
+    base = select(*RENDER_COLUMNS).where(Lead.company_id == company_id).order_by(Lead.id)
+    if lead_ids is not None:
+        # IN lists are chunked to stay under driver bind-parameter limits.
+        unique_ids = sorted(set(lead_ids))
+        chunk = settings.bulk_render_batch_size
+        for start in range(0, len(unique_ids), chunk):
+            yield base.where(Lead.id.in_(unique_ids[start : start + chunk]))
+        return
+    if lead_filter is not None:
+        if lead_filter.status is not None:
+            base = base.where(Lead.status == lead_filter.status.value)
+        if lead_filter.source is not None:
+            base = base.where(Lead.source == lead_filter.source)
+        if lead_filter.created_after is not None:
+            base = base.where(Lead.created_at >= lead_filter.created_after)
+        if lead_filter.created_before is not None:
+            base = base.where(Lead.created_at < lead_filter.created_before)
+    yield base
+
+
+def stream_rendered_leads(
+    template: CompiledTemplate,
+    company_id: int,
+    *,
+    lead_ids: list[int] | None = None,
+    lead_filter: LeadRenderFilter | None = None,
+) -> Iterator[str]:
+    """Yield one NDJSON line per lead rendered with ``template``.
+
+    Rows are read with ``yield_per`` so memory stays flat regardless of how
+    many leads match. The session is owned by the generator because the
+    response body is produced after the request dependencies have exited.
+    """
+    session = SessionLocal()
+    rendered = 0
+    try:
+        for statement in _lead_statements(company_id, lead_ids, lead_filter):
+            result = session.execute(
+                statement.execution_options(yield_per=settings.bulk_render_batch_size)
+            )
+            for row in result:
+                context = {
+                    "name": row.name,
+                    "email": row.email,
+                    "phone": row.phone or "",
+                    "message": row.message or "",
+                    "source": row.source,
+                    "status": row.status,
+                    "preferred_language": row.preferred_language or "",
+                }
+                reply = template.render(context)
+                rendered += 1
+                yield json.dumps(
+                    {
+                        "lead_id": row.id,
+                        "email": row.email,
+                        "subject": reply["subject"],
+                        "body": reply["body"],
+                    }
+                ) + "\n"
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Bulk template render failed", exc_info=exc)
+        yield json.dumps({"error": "Rendering stopped because of an internal error"}) + "\n"
+    finally:
+        session.close()
+        logger.info(
+            "template.bulk_rendered",
+            extra={"template_id": template.id, "company_id": company_id, "rendered": rendered},
+        )
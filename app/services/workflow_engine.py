@@ -0,0 +1,332 @@
+import logging
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, VersionStamps
+from app.core.config import settings
+from app.models.email_message import EmailMessage
+from app.models.lead import Lead
+from app.models.workflow_rule import WorkflowRule
+from app.schemas.workflow_rule import (
+    TOKEN_PATTERN,
+    DeliveryMode,
+    WorkflowActions,
+    WorkflowConditions,
+    WorkflowDecisionRead,
+    WorkflowDryRunRequest,
+    WorkflowDryRunResponse,
+)
+from app.services.email_analysis_service import classify_category, classify_priority
+from app.services.lead_service import add_lead_tags
+
+logger = logging.getLogger(__name__)
+
+NO_LEAD_STATUS = "none"
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    id: int
+    name: str
+    priority: int
+    stop_processing: bool
+    conditions: WorkflowConditions
+    actions: WorkflowActions
+
+
+@dataclass(frozen=True)
+class EmailFacts:
+    category: str
+    priority: str
+    sender_domain: str
+    lead_status: str
+    text: str
+
+
+@dataclass(frozen=True)
+class WorkflowDecision:
+    matched_rules: tuple[int, ...] = ()
+    auto_send: bool = True
+    skip_ai: bool = False
+    tags: tuple[str, ...] = ()
+    route_to: str | None = None
+
+
+DEFAULT_DECISION = WorkflowDecision()
+
+
+def _domain_suffixes(domain: str) -> list[str]:
+    labels = domain.split(".")
+    # "eu.mail.acme.com" also matches rules written for "mail.acme.com" and "acme.com".
+    return [".".join(labels[index:]) for index in range(len(labels))]
+
+
+def build_email_facts(
+    *, from_email: str, subject: str, body: str, lead_status: str | None
+) -> EmailFacts:
+    category, _ = classify_category(subject, body)
+    return EmailFacts(
+        category=category.lower(),
+        priority=classify_priority(subject, body),
+        sender_domain=from_email.rsplit("@", 1)[-1].strip().lower(),
+        lead_status=(lead_status or NO_LEAD_STATUS).lower(),
+        text=f"{subject} {body}".lower(),
+    )
+
+
+@dataclass
+class _FieldIndex:
+    values: dict[str, int] = field(default_factory=dict)
+    wildcard: int = 0
+
+    def add(self, bit: int, values: list[str]) -> None:
+        if not values:
+            self.wildcard |= bit
+            return
+        for value in values:
+            self.values[value] = self.values.get(value, 0) | bit
+
+    def candidates(self, values: list[str]) -> int:
+        mask = self.wildcard
+        for value in values:
+            mask |= self.values.get(value, 0)
+        return mask
+
+
+class CompiledRuleSet:
+    """Rules compiled into per-field bitmask indexes.
+
+    Bit ``i`` stands for ``rules[i]`` (ordered by priority). Evaluating an email
+    intersects one mask per condition field, so the cost depends on the
+    email's own values and tokens rather than on the number of rules; only the
+    rules left in the final mask are visited to merge their actions.
+    """
+
+    def __init__(self, rules: list[RuleSpec]) -> None:
+        self.rules = sorted(rules, key=lambda rule: (rule.priority, rule.id))
+        self.all_rules = (1 << len(self.rules)) - 1
+        self.categories = _FieldIndex()
+        self.priorities = _FieldIndex()
+        self.sender_domains = _FieldIndex()
+        self.lead_statuses = _FieldIndex()
+        self.keywords = _FieldIndex()
+        # Multi-word keywords are indexed by their first token and confirmed by substring.
+        self.phrases: dict[str, list[tuple[str, int]]] = {}
+        for position, rule in enumerate(self.rules):
+            bit = 1 << position
+            conditions = rule.conditions
+            self.categories.add(bit, conditions.categories)
+            self.priorities.add(bit, conditions.priorities)
+            self.sender_domains.add(bit, conditions.sender_domains)
+            self.lead_statuses.add(bit, conditions.lead_statuses)
+            words = []
+            for keyword in conditions.keywords:
+                tokens = TOKEN_PATTERN.findall(keyword)
+                if len(tokens) == 1 and tokens[0] == keyword:
+                    words.append(keyword)
+                elif tokens:
+                    self.phrases.setdefault(tokens[0], []).append((keyword, bit))
+            if words or not conditions.keywords:
+                self.keywords.add(bit, words)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, facts: EmailFacts) -> WorkflowDecision:
+        candidates = self.all_rules
+        candidates &= self.categories.candidates([facts.category])
+        candidates &= self.priorities.candidates([facts.priority])
+        candidates &= self.lead_statuses.candidates([facts.lead_status])
+        if candidates:
+            candidates &= self.sender_domains.candidates(_domain_suffixes(facts.sender_domain))
+        if candidates & ~self.keywords.wildcard:
+            matched = self.keywords.wildcard
+            for token in set(TOKEN_PATTERN.findall(facts.text)):
+                matched |= self.keywords.values.get(token, 0)
+                for phrase, bit in self.phrases.get(token, ()):
+                    if bit & candidates and phrase in facts.text:
+                        matched |= bit
+            candidates &= matched
+        if not candidates:
+            return DEFAULT_DECISION
+        return self._merge(candidates)
+
+    def _merge(self, candidates: int) -> WorkflowDecision:
+        matched: list[int] = []
+        delivery: DeliveryMode | None = None
+        skip_ai = False
+        tags: list[str] = []
+        route_to: str | None = None
+        while candidates:
+            lowest = candidates & -candidates
+            candidates ^= lowest
+            rule = self.rules[lowest.bit_length() - 1]
+            matched.append(rule.id)
+            actions = rule.actions
+            # The highest-priority rule that sets a value wins; tags accumulate.
+            delivery = delivery or actions.delivery
+            route_to = route_to or actions.route_to
+            skip_ai = skip_ai or actions.skip_ai
+            tags.extend(tag for tag in actions.tags if tag not in tags)
+            if rule.stop_processing:
+                break
+        return WorkflowDecision(
+            matched_rules=tuple(matched),
+            auto_send=delivery != DeliveryMode.hold_for_approval,
+            skip_ai=skip_ai,
+            tags=tuple(tags),
+            route_to=route_to,
+        )
+
+
+def rule_spec_from_model(rule: WorkflowRule) -> RuleSpec:
+    return RuleSpec(
+        id=rule.id,
+        name=rule.name,
+        priority=rule.priority,
+        stop_processing=rule.stop_processing,
+        conditions=WorkflowConditions.model_validate(rule.conditions or {}),
+        actions=WorkflowActions.model_validate(rule.actions or {}),
+    )
+
+
+def compile_rules(rules: list[RuleSpec]) -> CompiledRuleSet:
+    return CompiledRuleSet(rules)
+
+
+_rulesets = TTLCache(
+    maxsize=settings.template_cache_max_entries,
+    ttl=settings.template_cache_ttl_seconds,
+)
+_versions = VersionStamps("workflow_rules_version")
+
+
+def get_company_ruleset(db: Session, company_id: int) -> CompiledRuleSet:
+    version = _versions.current(company_id)
+    entry = _rulesets.get(company_id)
+    if entry is not None and version is not None and entry[0] == version:
+        return entry[1]
+    rules = (
+        db.query(WorkflowRule)
+        .filter(WorkflowRule.company_id == company_id, WorkflowRule.enabled.is_(True))
+        .all()
+    )
+    ruleset = compile_rules([rule_spec_from_model(rule) for rule in rules])
+    if version is not None:
+        _rulesets.set(company_id, (version, ruleset))
+    return ruleset
+
+
+def invalidate_workflow_rules(company_id: int) -> None:
+    _versions.bump(company_id)
+    logger.info("workflow.rules.invalidated", extra={"company_id": company_id})
+
+
+def evaluate_inbound_email(
+    db: Session, email: EmailMessage, lead_status: str | None
+) -> WorkflowDecision:
+    if email.company_id is None:
+        return DEFAULT_DECISION
+    ruleset = get_company_ruleset(db, email.company_id)
+    if not len(ruleset):
+        return DEFAULT_DECISION
+    facts = build_email_facts(
+        from_email=email.from_email,
+        subject=email.subject,
+        body=email.body,
+        lead_status=lead_status,
+    )
+    return ruleset.evaluate(facts)
+
+
+def apply_workflow_decision(
+    db: Session, email: EmailMessage, decision: WorkflowDecision, *, commit: bool = True
+) -> None:
+    """Store the route target and apply lead tags; with ``commit=False`` the caller commits."""
+    if not decision.matched_rules:
+        return
+    changed = False
+    if decision.route_to and email.routed_to != decision.route_to:
+        email.routed_to = decision.route_to
+        changed = True
+    lead = db.get(Lead, email.lead_id) if email.lead_id else None
+    if lead is not None and decision.tags and add_lead_tags(db, lead, list(decision.tags)):
+        changed = True
+    if changed and commit:
+        db.commit()
+    logger.info(
+        "workflow.rules.applied",
+        extra={
+            "email_id": email.id,
+            "company_id": email.company_id,
+            "matched_rules": list(decision.matched_rules),
+            "auto_send": decision.auto_send,
+            "skip_ai": decision.skip_ai,
+            "route_to": decision.route_to,
+        },
+    )
+
+
+def dry_run_rules(
+    db: Session,
+    company_id: int,
+    ruleset: CompiledRuleSet,
+    request: WorkflowDryRunRequest,
+) -> WorkflowDryRunResponse:
+    statement = (
+        select(
+            EmailMessage.id,
+            EmailMessage.from_email,
+            EmailMessage.subject,
+            EmailMessage.body,
+            Lead.status.label("lead_status"),
+        )
+        .outerjoin(Lead, EmailMessage.lead_id == Lead.id)
+        .where(EmailMessage.company_id == company_id)
+        .order_by(EmailMessage.received_at.desc(), EmailMessage.id.desc())
+        .limit(request.limit)
+    )
+    if request.email_ids is not None:
+        statement = statement.where(EmailMessage.id.in_(request.email_ids))
+    if request.received_after is not None:
+        statement = statement.where(EmailMessage.received_at >= request.received_after)
+    if request.received_before is not None:
+        statement = statement.where(EmailMessage.received_at < request.received_before)
+
+    results: list[WorkflowDecisionRead] = []
+    action_counts = {"hold_for_approval": 0, "skip_ai": 0, "tagged": 0, "routed": 0}
+    for row in db.execute(statement.execution_options(yield_per=500)):
+        facts = build_email_facts(
+            from_email=row.from_email,
+            subject=row.subject,
+            body=row.body,
+            lead_status=row.lead_status,
+        )
+        decision = ruleset.evaluate(facts)
+        action_counts["hold_for_approval"] += not decision.auto_send
+        action_counts["skip_ai"] += decision.skip_ai
+        action_counts["tagged"] += bool(decision.tags)
+        action_counts["routed"] += decision.route_to is not None
+        results.append(
+            WorkflowDecisionRead(
+                email_id=row.id,
+                from_email=row.from_email,
+                subject=row.subject,
+                category=facts.category,
+                priority=facts.priority,
+                lead_status=row.lead_status,
+                matched_rules=list(decision.matched_rules),
+                auto_send=decision.auto_send,
+                skip_ai=decision.skip_ai,
+                tags=list(decision.tags),
+                route_to=decision.route_to,
+            )
+        )
+    return WorkflowDryRunResponse(
+        evaluated=len(results),
+        matched=sum(1 for result in results if result.matched_rules),
+        action_counts=action_counts,
+        results=results,
+    )
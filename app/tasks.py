@@ -1,21 +1,92 @@
 import logging
 from datetime import datetime
 
+from celery.signals import worker_init, worker_process_shutdown, worker_shutdown
+
+from app.core.cache import redis_enabled
 from app.core.celery_app import celery_app
-from app.core.database import SessionLocal
+from app.core.concurrency import draft_limiter
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.metrics import start_metrics_server
 from app.models.company import Company
 from app.models.email_message import EmailMessage
 from app.models.email_reply import EmailReply
+from app.services.activity_archive import archive_expired_activity_logs, ensure_partitions
 from app.services.activity_service import log_activity
-from app.services.auto_reply_service import generate_ai_reply_from_template, get_template
+from app.services.activity_writer import activity_writer
+from app.services.auto_reply_service import build_ai_prompt, get_template
+from app.services.daily_stats_service import rebuild_company_stats, record_reply_status_change
 from app.services.email_integration_service import get_active_integration
 from app.services.email_service import create_email_reply, send_email_reply
+from app.services.lead_import import run_lead_import
+from app.services.llm_service import FALLBACK_REPLY, LLMServiceError, request_ai_reply
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name="app.tasks.generate_email_reply_task")
-def generate_email_reply_task(email_id: int, company_id: int) -> None:
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def _flush_activity_logs(**_kwargs) -> None:
+    activity_writer.close()
+
+
+@worker_init.connect
+def _check_cache_backend(**_kwargs) -> None:
+    # Templates, workflow rules and the lead email filter are invalidated through
+    # VersionStamps; with the memory backend a bump made by the API never reaches
+    # this process, so drafts would use edited or deleted templates until the TTL.
+    if redis_enabled() or settings.celery_task_always_eager:
+        return
+    if settings.environment in {"production", "staging"}:
+        # Signal handlers' exceptions are only logged; SystemExit stops the worker.
+        raise SystemExit("Set CACHE_BACKEND=redis for Celery workers in staging/production.")
+    logger.warning(
+        "worker.cache.process_local",
+        extra={
+            "cache_backend": settings.cache_backend,
+            "template_cache_ttl_seconds": settings.template_cache_ttl_seconds,
+        },
+    )
+
+
+@worker_init.connect
+def _serve_worker_metrics(**_kwargs) -> None:
+    # Started in the worker's main process: with ``--pool threads`` every task, and so
+    # ``draft_limiter``, lives there. Prefork children would each hold their own registry.
+    if settings.worker_metrics_port:
+        start_metrics_server(settings.worker_metrics_port)
+        logger.info("worker.metrics.started", extra={"port": settings.worker_metrics_port})
+
+
+def _generate_draft_body(prompt: str, model: str | None) -> tuple[str, bool]:
+    try:
+        return request_ai_reply(prompt, model), False
+    except LLMServiceError as exc:
+        logger.exception("Failed to generate AI reply", exc_info=exc)
+        return FALLBACK_REPLY, True
+
+
+@celery_app.task(name="app.tasks.generate_email_reply_task", bind=True)
+def generate_email_reply_task(
+    self, email_id: int, company_id: int, auto_send: bool = True
+) -> None:
+    # The limiter is checked before any query so a deferral costs nothing but a republish.
+    permit = draft_limiter.try_acquire()
+    if permit is None and self.request.retries < settings.llm_concurrency_max_deferrals:
+        logger.info(
+            "ai.reply.deferred",
+            extra={
+                "email_id": email_id,
+                "company_id": company_id,
+                "limit": draft_limiter.limit,
+                "deferrals": self.request.retries + 1,
+            },
+        )
+        raise self.retry(
+            countdown=settings.llm_concurrency_retry_seconds,
+            max_retries=settings.llm_concurrency_max_deferrals,
+        )
     session = SessionLocal()
     try:
         email_record = session.query(EmailMessage).filter(EmailMessage.id == email_id).first()
@@ -41,7 +112,7 @@ def generate_email_reply_task(email_id: int, company_id: int) -> None:
                 },
             )
             return
-        auto_reply = generate_ai_reply_from_template(
+        subject, prompt = build_ai_prompt(
             template,
             company_record,
             {
@@ -50,11 +121,29 @@ def generate_email_reply_task(email_id: int, company_id: int) -> None:
                 "body": email_record.body,
             },
         )
+        if permit is None:
+            # Deferred too often: hold the fallback draft for a person instead of cycling.
+            logger.warning(
+                "ai.reply.deferrals_exhausted",
+                extra={
+                    "email_id": email_id,
+                    "company_id": company_id,
+                    "deferrals": self.request.retries,
+                },
+            )
+            body, auto_send = FALLBACK_REPLY, False
+        else:
+            llm_error = False
+            try:
+                body, llm_error = _generate_draft_body(prompt, company_record.ai_model)
+            finally:
+                draft_limiter.release(permit, error=llm_error)
+                permit = None
         reply = create_email_reply(
             session,
             email=email_record,
-            subject=auto_reply["subject"],
-            body=auto_reply["body"],
+            subject=subject,
+            body=body,
         )
         logger.info(
             "ai.reply.generated",
@@ -63,6 +152,7 @@ def generate_email_reply_task(email_id: int, company_id: int) -> None:
                 "email_id": email_record.id,
                 "company_id": company_id,
                 "trigger": "automation",
+                "auto_send": auto_send,
             },
         )
         log_activity(
@@ -71,12 +161,15 @@ def generate_email_reply_task(email_id: int, company_id: int) -> None:
             entity_type="email_reply",
             entity_id=reply.id,
             company_id=company_id,
-            description="AI reply generated",
+            description="AI reply generated" if auto_send else "AI reply held for approval",
         )
-        send_email_reply_task.delay(reply.id)
+        if auto_send:
+            send_email_reply_task.delay(reply.id)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Failed to generate email reply", exc_info=exc)
     finally:
+        if permit is not None:
+            draft_limiter.cancel(permit)
         session.close()
 
 
@@ -90,8 +183,10 @@ def send_email_reply_task(self, reply_id: int) -> None:
         email = reply.email
         integration = get_active_integration(session, email.company_id) if email else None
         if not integration:
+            previous_status = reply.send_status
             reply.send_status = "failed"
             reply.send_error = "No connected email integration"
+            record_reply_status_change(session, reply, previous_status)
             session.add(reply)
             session.commit()
             logger.warning(
@@ -129,10 +224,42 @@ def send_email_reply_task(self, reply_id: int) -> None:
         logger.exception("Failed to send email reply", exc_info=exc)
         reply = session.query(EmailReply).filter(EmailReply.id == reply_id).first()
         if reply:
+            previous_status = reply.send_status
             reply.send_status = "retry"
             reply.send_error = str(exc)
+            record_reply_status_change(session, reply, previous_status)
             session.add(reply)
             session.commit()
         raise self.retry(exc=exc)
     finally:
         session.close()
+
+
+@celery_app.task(name="app.tasks.rebuild_daily_stats_task")
+def rebuild_daily_stats_task(company_id: int | None = None) -> None:
+    session = SessionLocal()
+    try:
+        if company_id is None:
+            company_ids = [row.id for row in session.query(Company.id).order_by(Company.id)]
+        else:
+            company_ids = [company_id]
+        for current_company_id in company_ids:
+            rebuild_company_stats(session, current_company_id)
+    finally:
+        session.close()
+
+
+@celery_app.task(name="app.tasks.import_leads_task")
+def import_leads_task(import_id: int) -> None:
+    session = SessionLocal()
+    try:
+        run_lead_import(session, import_id)
+    finally:
+        session.close()
+
+
+@celery_app.task(name="app.tasks.maintain_activity_logs_task")
+def maintain_activity_logs_task() -> int:
+    with engine.begin() as connection:
+        ensure_partitions(connection)
+    return len(archive_expired_activity_logs(engine))
@@ -42,6 +42,23 @@ api.interceptors.response.use(
   },
 );
 
+const NEXT_CURSOR_HEADER = "x-next-cursor";
+const LIST_PAGE_SIZE = 500;
+
+// List endpoints are keyset-paginated: follow X-Next-Cursor until the last page.
+const getAllPages = async (path, params = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const response = await api.get(path, {
+      params: { ...params, limit: LIST_PAGE_SIZE, include_total: false, cursor },
+    });
+    items.push(...response.data);
+    cursor = response.headers[NEXT_CURSOR_HEADER];
+  } while (cursor);
+  return items;
+};
+
 export const login = async (email, password) => {
   const params = new URLSearchParams();
   params.append("username", email);
@@ -85,8 +102,7 @@ export const getDashboardSummary = async () => {
 };
 
 export const getLeads = async () => {
-  const response = await api.get("/leads");
-  return response.data;
+  return getAllPages("/leads");
 };
 
 export const getLead = async (leadId) => {
@@ -100,8 +116,7 @@ export const updateLeadStatus = async (leadId, status) => {
 };
 
 export const getLeadEmails = async (leadId) => {
-  const response = await api.get(`/leads/${leadId}/emails`);
-  return response.data;
+  return getAllPages(`/leads/${leadId}/emails`);
 };
 
 export const updateLead = async (leadId, payload) => {
@@ -110,8 +125,7 @@ export const updateLead = async (leadId, payload) => {
 };
 
 export const getEmails = async () => {
-  const response = await api.get("/emails");
-  return response.data;
+  return getAllPages("/emails");
 };
 
 export const getEmailThread = async (emailId) => {
@@ -130,8 +144,7 @@ export const regenerateEmailReply = async (emailId) => {
 };
 
 export const getTemplates = async () => {
-  const response = await api.get("/templates");
-  return response.data;
+  return getAllPages("/templates");
 };
 
 export const createTemplate = async (payload) => {
@@ -174,8 +187,7 @@ export const rotateCompanyKey = async () => {
 };
 
 export const getEmailIntegrationStatus = async () => {
-  const response = await api.get("/integrations/email/status");
-  return response.data;
+  return getAllPages("/integrations/email/status");
 };
 
 export const connectEmailIntegration = async (payload) => {
@@ -0,0 +1,261 @@
+"""Compare dashboard query plans and timings without and with the composite indexes.
+
+Seeds a throwaway database (SQLite by default), runs the dashboard/analytics
+queries with the composite indexes dropped, then again after creating them.
+
+Example:
+    python scripts/benchmark_dashboard_indexes.py --companies 20 --leads 20000 --emails 40000
+    python scripts/benchmark_dashboard_indexes.py --database-url postgresql://.../scratch --runs 20
+
+``--database-url`` must point at a scratch database: every application table is
+dropped and recreated.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, insert, select, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.core.api_keys import PREFIX_LENGTH, hash_api_key  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.models import (  # noqa: E402
+    ActivityLog,
+    AutoReplyTemplate,
+    Company,
+    EmailMessage,
+    EmailReply,
+    Lead,
+)
+
+COMPOSITE_INDEXES = [
+    index
+    for table in Base.metadata.sorted_tables
+    for index in table.indexes
+    if len(index.columns) > 1
+]
+STATUSES = ["new", "contacted", "qualified", "closed", "won", "lost"]
+SEND_STATUSES = ["pending", "sent", "failed"]
+
+
+def _seed(engine: Engine, companies: int, leads: int, emails: int, seed: int) -> None:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    def recent(days: int = 120) -> datetime:
+        return now - timedelta(seconds=rng.randint(0, days * 86400))
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Company),
+            [
+                {
+                    "name": f"Company {i}",
+                    "api_key": f"key-{i}",
+                    "api_key_prefix": f"key-{i}"[:PREFIX_LENGTH],
+                    "api_key_hash": hash_api_key(f"key-{i}"),
+                    "created_at": now,
+                }
+                for i in range(1, companies + 1)
+            ],
+        )
+        conn.execute(
+            insert(Lead),
+            [
+                {
+                    "name": f"Lead {i}",
+                    "email": f"lead{i}@example.com",
+                    "source": "chat",
+                    "status": rng.choice(STATUSES),
+                    "company_id": rng.randint(1, companies),
+                    "created_at": recent(),
+                }
+                for i in range(leads)
+            ],
+        )
+        email_companies = [rng.randint(1, companies) for _ in range(emails)]
+        conn.execute(
+            insert(EmailMessage),
+            [
+                {
+                    "from_email": f"lead{rng.randrange(leads)}@example.com",
+                    "subject": "Question about pricing",
+                    "body": "Could you send over a quote?",
+                    "processed": True,
+                    "lead_id": rng.randint(1, leads),
+                    "company_id": company_id,
+                    "received_at": recent(),
+                }
+                for company_id in email_companies
+            ],
+        )
+        conn.execute(
+            insert(EmailReply),
+            [
+                {
+                    "email_id": email_id,
+                    "company_id": email_companies[email_id - 1],
+                    "subject": "Re: pricing",
+                    "body": "Thanks!",
+                    "generated_by_ai": rng.random() < 0.8,
+                    "send_status": rng.choice(SEND_STATUSES),
+                    "created_at": recent(),
+                }
+                for email_id in range(1, emails + 1)
+            ],
+        )
+        conn.execute(
+            insert(ActivityLog),
+            [
+                {
+                    "action": "create",
+                    "entity_type": "email",
+                    "company_id": rng.randint(1, companies),
+                    "created_at": recent(),
+                }
+                for _ in range(emails)
+            ],
+        )
+        conn.execute(
+            insert(AutoReplyTemplate),
+            [
+                {
+                    "trigger_type": trigger,
+                    "subject_template": "Re: {subject}",
+                    "body_template": "Hello",
+                    "company_id": company_id,
+                    "created_at": recent(),
+                }
+                for company_id in range(1, companies + 1)
+                for trigger in ("lead", "email")
+                for _ in range(3)
+            ],
+        )
+
+
+def _queries(company_id: int, lead_id: int) -> dict[str, object]:
+    now = datetime.utcnow()
+    last_24h = now - timedelta(days=1)
+    last_7d = now - timedelta(days=7)
+    last_30d = now - timedelta(days=30)
+    return {
+        "leads_today": select(func.count(Lead.id)).where(
+            Lead.company_id == company_id, Lead.created_at >= last_24h
+        ),
+        "lead_trend_7d": select(func.date(Lead.created_at), func.count(Lead.id))
+        .where(Lead.company_id == company_id, Lead.created_at >= last_7d)
+        .group_by(func.date(Lead.created_at)),
+        "stale_new_leads": select(func.count(Lead.id)).where(
+            Lead.company_id == company_id,
+            Lead.status == "new",
+            Lead.created_at <= now - timedelta(hours=24),
+        ),
+        "lead_status_funnel": select(Lead.status, func.count(Lead.id))
+        .where(Lead.company_id == company_id)
+        .group_by(Lead.status),
+        "emails_30d": select(func.count(EmailMessage.id)).where(
+            EmailMessage.company_id == company_id, EmailMessage.received_at >= last_30d
+        ),
+        "replies_sent_30d": select(func.count(EmailReply.id)).where(
+            EmailReply.company_id == company_id,
+            EmailReply.send_status == "sent",
+            EmailReply.created_at >= last_30d,
+        ),
+        "recent_activity": select(ActivityLog.id)
+        .where(ActivityLog.company_id == company_id)
+        .order_by(ActivityLog.created_at.desc())
+        .limit(10),
+        "template_lookup": select(AutoReplyTemplate.id)
+        .where(
+            AutoReplyTemplate.trigger_type == "email",
+            AutoReplyTemplate.company_id == company_id,
+        )
+        .order_by(AutoReplyTemplate.created_at.desc())
+        .limit(1),
+        "lead_emails": select(EmailMessage.id)
+        .where(EmailMessage.lead_id == lead_id)
+        .order_by(EmailMessage.received_at.desc()),
+    }
+
+
+def _plan(engine: Engine, statement) -> str:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + sql).all()
+    return "; ".join(str(row[-1]).strip() for row in rows)
+
+
+def _time(engine: Engine, statement, runs: int) -> float:
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(runs):
+            started = time.perf_counter()
+            conn.execute(statement).all()
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def _run_phase(engine: Engine, label: str, queries: dict[str, object], runs: int) -> dict:
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"\n=== {label} ===")
+    results = {}
+    for name, statement in queries.items():
+        median_ms = _time(engine, statement, runs)
+        results[name] = median_ms
+        print(f"{name:<20} {median_ms:8.2f} ms  {_plan(engine, statement)}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--leads", type=int, default=10000)
+    parser.add_argument("--emails", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = None
+    database_url = args.database_url
+    if database_url is None:
+        workdir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{workdir.name}/benchmark.db"
+    engine = create_engine(database_url)
+    try:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        _seed(engine, args.companies, args.leads, args.emails, args.seed)
+        queries = _queries(company_id=1, lead_id=1)
+
+        for index in COMPOSITE_INDEXES:
+            index.drop(bind=engine)
+        before = _run_phase(engine, "without composite indexes", queries, args.runs)
+        for index in COMPOSITE_INDEXES:
+            index.create(bind=engine)
+        after = _run_phase(engine, "with composite indexes", queries, args.runs)
+
+        print("\n=== speedup ===")
+        for name in queries:
+            ratio = before[name] / after[name] if after[name] else float("inf")
+            print(f"{name:<20} {ratio:6.1f}x")
+    finally:
+        if args.database_url is not None:
+            Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+        if workdir is not None:
+            workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Load-test AI draft generation against the bundled fake LLM provider.
+
+Example:
+    python scripts/load_test_drafts.py --requests 500 --workers 32 --latency-ms 300 \
+        --latency-jitter-ms 150 --latency-distribution lognormal --rate-limit-rate 0.05
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.concurrency import AdaptiveConcurrencyLimiter  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.devtools.fake_llm import LATENCY_DISTRIBUTIONS, FakeLLMConfig, FakeLLMServer  # noqa: E402
+from app.services.llm_service import LLMServiceError, request_ai_reply  # noqa: E402
+
+
+def _run_draft(limiter: AdaptiveConcurrencyLimiter, index: int) -> tuple[str, float]:
+    while True:
+        permit = limiter.try_acquire()
+        if permit is not None:
+            break
+        time.sleep(0.005)
+    started = time.perf_counter()
+    error = False
+    try:
+        request_ai_reply(f"Draft a reply to inbound email #{index} about pricing.")
+        outcome = "ok"
+    except LLMServiceError:
+        error = True
+        outcome = "error"
+    finally:
+        limiter.release(permit, error=error)
+    return outcome, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    limiter = AdaptiveConcurrencyLimiter(
+        "load_test",
+        initial_limit=settings.llm_concurrency_initial,
+        min_limit=settings.llm_concurrency_min,
+        max_limit=max(settings.llm_concurrency_min, args.workers),
+        latency_target_seconds=settings.llm_latency_target_seconds,
+        backoff_ratio=settings.llm_concurrency_backoff_ratio,
+    )
+
+    with FakeLLMServer(config) as server:
+        settings.ai_base_url = server.base_url
+        settings.ai_api_key = settings.ai_api_key or "fake-key"
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(lambda i: _run_draft(limiter, i), range(args.requests)))
+        elapsed = time.perf_counter() - started
+        provider_stats = server.stats
+
+    latencies = sorted(latency for _, latency in results)
+    errors = sum(1 for outcome, _ in results if outcome == "error")
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"requests:        {len(results)}")
+    print(f"errors:          {errors}")
+    print(f"elapsed:         {elapsed:.2f}s")
+    print(f"throughput:      {len(results) / elapsed:.1f} drafts/s")
+    print(f"latency p50:     {quantiles[49] * 1000:.1f} ms")
+    print(f"latency p95:     {quantiles[94] * 1000:.1f} ms")
+    print(f"final limit:     {limiter.limit}")
+    print(f"provider stats:  {provider_stats}")
+
+
+if __name__ == "__main__":
+    main()
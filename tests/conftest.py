@@ -1,6 +1,37 @@
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Settings are read once per process, so unit tests that import app modules during
+# collection must see the same environment the API tests configure.
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("AI_API_KEY", "")
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "true")
+os.environ.setdefault("ACTIVITY_LOG_MODE", "sync")
+
+
+def _reset_database() -> None:
+    # The engine is bound once per test session, so tests share one database file;
+    # recreate the schema and drop process-local caches to keep tests independent.
+    database = sys.modules.get("app.core.database")
+    if database is None:
+        return
+    database.Base.metadata.drop_all(bind=database.engine)
+    database.Base.metadata.create_all(bind=database.engine)
+    cache = sys.modules.get("app.core.cache")
+    if cache is not None:
+        cache.clear_local_caches()
+
+
+@pytest.fixture(autouse=True)
+def isolated_database():
+    _reset_database()
+    yield
+    _reset_database()
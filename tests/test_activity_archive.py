@@ -0,0 +1,170 @@
+import gzip
+import importlib
+import json
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient, email: str, company_name: str) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "StrongPassword1!", "company_name": company_name},
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": email, "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _add_entries(company_id: int, *timestamps: datetime) -> None:
+    from app.core.database import SessionLocal
+    from app.models.activity_log import ActivityLog
+
+    with SessionLocal() as session:
+        for created_at in timestamps:
+            session.add(
+                ActivityLog(
+                    action="update",
+                    entity_type="lead",
+                    entity_id=1,
+                    company_id=company_id,
+                    description=f"at {created_at.isoformat()}",
+                    created_at=created_at,
+                )
+            )
+        session.commit()
+
+
+def _remaining(company_id: int) -> list[datetime]:
+    from app.core.database import SessionLocal
+    from app.models.activity_log import ActivityLog
+
+    with SessionLocal() as session:
+        return list(
+            session.scalars(
+                select(ActivityLog.created_at)
+                .where(ActivityLog.company_id == company_id, ActivityLog.action == "update")
+                .order_by(ActivityLog.created_at)
+            )
+        )
+
+
+def test_expired_months_are_archived_and_streamed_back(monkeypatch, tmp_path) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "activity_archive_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "activity_log_retention_months", 3)
+    client = _create_client(monkeypatch, "./test_activity_archive.db")
+    headers = _login_headers(client, "owner@example.com", "Archive Co")
+    other_headers = _login_headers(client, "other@example.com", "Other Co")
+    company_id = client.get("/companies/me", headers=headers).json()["id"]
+    other_id = client.get("/companies/me", headers=other_headers).json()["id"]
+
+    _add_entries(
+        company_id, datetime(2026, 5, 2, 9), datetime(2026, 5, 30, 18), datetime(2026, 7, 1)
+    )
+    _add_entries(other_id, datetime(2026, 6, 15))
+
+    from app.core.database import engine
+    from app.services.activity_archive import archive_expired_activity_logs
+
+    manifests = archive_expired_activity_logs(engine, today=date(2026, 10, 10))
+
+    assert [manifest["month"] for manifest in manifests] == ["2026-05", "2026-06"]
+    assert _remaining(company_id) == [datetime(2026, 7, 1)]
+    assert _remaining(other_id) == []
+    manifest = json.loads((tmp_path / "2026-05" / "manifest.json").read_text())
+    files = manifest["companies"][str(company_id)]["files"]
+    assert manifest["entries"] == 2 and [item["entries"] for item in files] == [2]
+    with gzip.open(tmp_path / "2026-05" / files[0]["file"], "rt") as handle:
+        assert [json.loads(line)["created_at"] for line in handle] == [
+            "2026-05-02T09:00:00",
+            "2026-05-30T18:00:00",
+        ]
+
+    months = client.get("/activity/archive/months", headers=headers).json()
+    assert [(item["month"], item["entries"]) for item in months] == [("2026-05", 2)]
+    streamed = client.get("/activity/archive", params={"month": "2026-05"}, headers=headers)
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    entries = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [entry["description"] for entry in entries] == [
+        "at 2026-05-02T09:00:00",
+        "at 2026-05-30T18:00:00",
+    ]
+    assert {entry["company_id"] for entry in entries} == {company_id}
+    # Months are scoped to the caller's company and validated before touching the filesystem.
+    assert (
+        client.get("/activity/archive", params={"month": "2026-06"}, headers=headers).status_code
+        == 404
+    )
+    assert (
+        client.get("/activity/archive", params={"month": "../x"}, headers=headers).status_code
+        == 422
+    )
+
+    # A late row for an archived month is appended as another file, not overwriting the first.
+    _add_entries(company_id, datetime(2026, 5, 31))
+    archive_expired_activity_logs(engine, today=date(2026, 10, 10))
+    streamed = client.get("/activity/archive", params={"month": "2026-05"}, headers=headers)
+    assert len(streamed.text.splitlines()) == 3
+    assert archive_expired_activity_logs(engine, today=date(2026, 10, 10)) == []
+
+
+def test_rows_are_dropped_only_after_the_archive_is_synced(monkeypatch, tmp_path) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "activity_archive_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "activity_log_retention_months", 3)
+    client = _create_client(monkeypatch, "./test_activity_archive_sync.db")
+    headers = _login_headers(client, "owner@example.com", "Archive Co")
+    company_id = client.get("/companies/me", headers=headers).json()["id"]
+    _add_entries(company_id, datetime(2026, 5, 2, 9))
+
+    from app.core.database import engine
+    from app.services import activity_archive
+
+    def failing_manifest(path, payload) -> None:
+        raise OSError("disk full")
+
+    write_manifest = activity_archive._write_json_atomic
+    monkeypatch.setattr(activity_archive, "_write_json_atomic", failing_manifest)
+    with pytest.raises(OSError):
+        activity_archive.archive_expired_activity_logs(engine, today=date(2026, 10, 10))
+    # Without a durable manifest the month stays in the database.
+    assert _remaining(company_id) == [datetime(2026, 5, 2, 9)]
+    monkeypatch.setattr(activity_archive, "_write_json_atomic", write_manifest)
+
+    synced: list[int] = []
+    real_fsync = activity_archive.os.fsync
+    real_drop = activity_archive.drop_month
+
+    def recording_fsync(fd: int) -> None:
+        synced.append(fd)
+        real_fsync(fd)
+
+    def checked_drop(connection, month) -> None:
+        assert (tmp_path / "2026-05" / "manifest.json").is_file()
+        assert not list(tmp_path.glob("2026-05/*.tmp"))
+        # Data file, month directory (twice) and manifest are all synced first.
+        assert len(synced) >= 4
+        real_drop(connection, month)
+
+    monkeypatch.setattr(activity_archive.os, "fsync", recording_fsync)
+    monkeypatch.setattr(activity_archive, "drop_month", checked_drop)
+    activity_archive.archive_expired_activity_logs(engine, today=date(2026, 10, 10))
+    assert _remaining(company_id) == []
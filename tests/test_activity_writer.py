@@ -0,0 +1,147 @@
+import importlib
+import time
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Writer Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _company_id() -> int:
+    from app.core.api_keys import issue_api_key
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.company import Company
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        company = Company(name="Writer Co")
+        issue_api_key(company)
+        session.add(company)
+        session.commit()
+        return company.id
+
+
+def _activity_actions() -> list[str]:
+    from app.core.database import SessionLocal
+    from app.models.activity_log import ActivityLog
+
+    with SessionLocal() as session:
+        return list(session.scalars(select(ActivityLog.action).order_by(ActivityLog.id)))
+
+
+def _entry(company_id: int | None, action: str | None) -> dict:
+    return {
+        "action": action,
+        "entity_type": "lead",
+        "entity_id": 1,
+        "company_id": company_id,
+        "user_id": None,
+        "description": None,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _writer(batch_size: int, interval: float):
+    from app.services.activity_writer import ActivityLogWriter
+
+    return ActivityLogWriter(
+        mode="memory", batch_size=batch_size, flush_interval_seconds=interval, max_buffered=100
+    )
+
+
+def test_buffered_entries_are_bulk_inserted_on_flush() -> None:
+    company_id = _company_id()
+    writer = _writer(batch_size=100, interval=60)
+    for action in ("create", "update", "delete"):
+        writer.write(_entry(company_id, action))
+
+    assert writer.pending() == 3
+    assert _activity_actions() == []
+    assert writer.flush() == 3
+    assert writer.pending() == 0
+    assert _activity_actions() == ["create", "update", "delete"]
+    writer.close()
+
+
+def test_full_batch_wakes_the_flusher() -> None:
+    company_id = _company_id()
+    writer = _writer(batch_size=2, interval=60)
+    writer.write(_entry(company_id, "create"))
+    writer.write(_entry(company_id, "update"))
+
+    deadline = time.monotonic() + 5
+    while writer.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.close()
+    assert _activity_actions() == ["create", "update"]
+
+
+def test_bad_rows_are_dropped_without_losing_the_batch() -> None:
+    company_id = _company_id()
+    writer = _writer(batch_size=100, interval=60)
+    writer.write(_entry(company_id, "create"))
+    writer.write(_entry(company_id, None))
+    writer.write(_entry(None, "orphan"))
+    writer.write(_entry(company_id, "update"))
+
+    writer.close()
+    assert _activity_actions() == ["create", "update"]
+
+
+def test_buffered_mode_halves_lead_create_commits(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_activity_writer.db")
+    headers = _login_headers(client)
+
+    from app.core.database import engine
+    from app.services.activity_writer import activity_writer
+
+    commits: list[int] = []
+
+    def _record(_conn) -> None:
+        commits.append(1)
+
+    def _create(name: str) -> int:
+        commits.clear()
+        event.listen(engine, "commit", _record)
+        try:
+            response = client.post(
+                "/leads", json={"name": name, "email": f"{name}@example.com"}, headers=headers
+            )
+        finally:
+            event.remove(engine, "commit", _record)
+        assert response.status_code == 201
+        return len(commits)
+
+    sync_commits = _create("sync")
+    monkeypatch.setattr(activity_writer, "mode", "memory")
+    buffered_commits = _create("buffered")
+    activity_writer.close()
+
+    assert buffered_commits == sync_commits - 1
+    assert _activity_actions() == ["create", "create"]
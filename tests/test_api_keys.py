@@ -0,0 +1,75 @@
+import importlib
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Key Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _post_lead(client: TestClient, api_key: str, index: int) -> int:
+    return client.post(
+        "/public/lead",
+        json={"name": f"Lead {index}", "email": f"lead{index}@example.com"},
+        headers={"X-Company-Key": api_key},
+    ).status_code
+
+
+def test_api_keys_resolve_by_hash_from_cache_and_rotate(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_api_keys.db")
+    headers = _login_headers(client)
+    company = client.get("/companies/me", headers=headers).json()
+    old_key = company["api_key"]
+
+    from app.core.api_keys import hash_api_key
+    from app.core.database import SessionLocal, engine
+    from app.models.company import Company
+
+    with SessionLocal() as session:
+        stored = session.get(Company, company["id"])
+        assert stored.api_key_prefix == old_key[:8]
+        assert stored.api_key_hash == hash_api_key(old_key)
+
+    lookups: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        if "FROM companies" in statement:
+            lookups.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        assert [_post_lead(client, old_key, index) for index in range(3)] == [201, 201, 201]
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    assert len(lookups) == 1
+    assert "api_key_prefix" in lookups[0]
+
+    assert _post_lead(client, "not-a-real-key", 9) == 401
+    new_key = client.post("/companies/me/rotate-key", headers=headers).json()["api_key"]
+    assert new_key != old_key
+    assert _post_lead(client, old_key, 10) == 401
+    assert _post_lead(client, new_key, 11) == 201
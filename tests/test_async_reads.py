@@ -0,0 +1,97 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Async Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_read_routes_on_async_session(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_async_reads.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    lead = client.post(
+        "/leads", json={"name": "Ana", "email": "ana@example.com"}, headers=headers
+    ).json()
+    for subject in ("Pricing question", "Invoice copy"):
+        client.post(
+            "/webhook/email",
+            json={"from_email": "ana@example.com", "subject": subject, "body": "Details inside"},
+            headers=company_key,
+        )
+
+    assert [item["id"] for item in client.get("/leads", headers=headers).json()] == [lead["id"]]
+    assert client.get(f"/leads/{lead['id']}", headers=headers).json()["status"] == "contacted"
+    assert client.get("/leads/999999", headers=headers).status_code == 404
+    lead_emails = client.get(f"/leads/{lead['id']}/emails", headers=headers).json()
+    assert {email["subject"] for email in lead_emails} == {"Pricing question", "Invoice copy"}
+
+    emails = client.get("/emails", headers=headers).json()
+    assert {email["category"] for email in emails} == {"Lead", "Billing"}
+    thread = client.get(f"/emails/{emails[0]['id']}", headers=headers).json()
+    assert thread["email"]["id"] == emails[0]["id"]
+
+    summary = client.get("/dashboard/summary", headers=headers).json()
+    assert summary["kpis"]["total_leads"] == 1
+    assert summary["kpis"]["emails_processed_30d"] == 2
+    stats = client.get("/dashboard/stats", headers=headers).json()
+    assert stats["emails_today"] == 2
+    overview = client.get("/analytics/overview", headers=headers).json()
+    assert overview["emails_processed"] == 2
+    assert overview["leads_generated"] == 1
+    client.post(f"/emails/{emails[0]['id']}/generate-reply", headers=headers)
+    urgent = client.get("/dashboard/urgent", headers=headers).json()["items"]
+    assert urgent[0]["detail"] == "1 replies queued"
+    assert client.get("/dashboard/activity", headers=headers).status_code == 200
+
+
+def test_dashboard_summary_reads_one_snapshot_in_few_round_trips(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_async_reads.db")
+    headers = _login_headers(client)
+    client.post("/leads", json={"name": "Ana", "email": "ana@example.com"}, headers=headers)
+
+    from sqlalchemy import event
+
+    from app.core.database import async_engine
+
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement.split(None, 1)[0].upper())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        summary = client.get("/dashboard/summary", headers=headers).json()
+        stats = client.get("/dashboard/stats", headers=headers).json()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+
+    assert summary["kpis"]["total_leads"] == 1 and summary["kpis"]["leads_today"] == 1
+    assert stats == {"total_leads": 1, "leads_today": 1, "emails_today": 0, "replies_sent": 0}
+    # The user was cached by the earlier request, so no lookups.
+    # Summary: BEGIN, KPI counts, rollup, activity. Stats: counts.
+    assert statements == ["BEGIN", "SELECT", "SELECT", "SELECT", "SELECT"]
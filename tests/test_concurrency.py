@@ -0,0 +1,130 @@
+import importlib
+from urllib.request import urlopen
+
+from fastapi.testclient import TestClient
+
+from app.core.concurrency import AdaptiveConcurrencyLimiter
+from app.core.config import settings
+from app.core.metrics import registry, start_metrics_server
+
+
+def _limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    options = {
+        "initial_limit": 2,
+        "min_limit": 1,
+        "max_limit": 8,
+        "latency_target_seconds": 60.0,
+        "backoff_ratio": 0.5,
+    }
+    options.update(overrides)
+    return AdaptiveConcurrencyLimiter("test", **options)
+
+
+def test_rejects_when_limit_reached() -> None:
+    limiter = _limiter()
+
+    first = limiter.try_acquire()
+    second = limiter.try_acquire()
+
+    assert first is not None and second is not None
+    assert limiter.try_acquire() is None
+    limiter.release(first)
+    assert limiter.try_acquire() is not None
+
+
+def test_grows_when_saturated_and_backs_off_on_errors() -> None:
+    limiter = _limiter(initial_limit=4)
+
+    for _ in range(20):
+        permits = [limiter.try_acquire() for _ in range(limiter.limit)]
+        for permit in permits:
+            limiter.release(permit)
+    assert limiter.limit > 4
+
+    grown = limiter.limit
+    failing = [limiter.try_acquire() for _ in range(3)]
+    for permit in failing:
+        limiter.release(permit, error=True)
+
+    # Calls that started before the backoff must not shrink the limit again.
+    assert limiter.limit == max(1, int(grown * 0.5))
+
+
+def test_slow_calls_count_as_overload() -> None:
+    limiter = _limiter(initial_limit=4, latency_target_seconds=0.0)
+
+    permit = limiter.try_acquire()
+    limiter.release(permit)
+
+    assert limiter.limit == 2
+    assert "llm_concurrency_limit" in registry.render()
+
+
+def test_metrics_server_serves_registry() -> None:
+    _limiter(initial_limit=3)
+    server = start_metrics_server(0, host="127.0.0.1")
+    try:
+        with urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'llm_concurrency_limit{limiter="test"} 3' in body
+
+
+def test_cancelled_permit_frees_the_slot_without_adjusting() -> None:
+    limiter = _limiter(initial_limit=1)
+
+    permit = limiter.try_acquire()
+    limiter.cancel(permit)
+
+    assert limiter.snapshot()["inflight"] == 0 and limiter.limit == 1
+    assert limiter.try_acquire() is not None
+
+
+def test_draft_deferrals_are_bounded_and_fall_back_to_a_held_draft(monkeypatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///./test_draft_deferrals.db")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+    from app import main, tasks
+
+    importlib.reload(main)
+    client = TestClient(main.app)
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Busy Co",
+        },
+    )
+    token = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post(
+        "/templates",
+        json={"trigger_type": "email", "subject_template": "Re: {subject}", "body_template": "Hi"},
+        headers=headers,
+    )
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+
+    full = _limiter(initial_limit=1)
+    full.try_acquire()
+    monkeypatch.setattr(tasks, "draft_limiter", full)
+    monkeypatch.setattr(settings, "llm_concurrency_max_deferrals", 2)
+    monkeypatch.setattr(settings, "llm_concurrency_retry_seconds", 0)
+    email = client.post(
+        "/webhook/email",
+        json={"from_email": "ana@example.com", "subject": "Pricing", "body": "Send pricing"},
+        headers=company_key,
+    ).json()["email"]
+
+    replies = client.get(f"/emails/{email['id']}", headers=headers).json()["email"]["replies"]
+    # The LLM is never called: the fallback draft waits for approval instead of being sent.
+    assert [(reply["body"], reply["send_status"]) for reply in replies] == [
+        (tasks.FALLBACK_REPLY, "pending")
+    ]
+    assert full.snapshot()["inflight"] == 1
@@ -0,0 +1,150 @@
+import importlib
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Rollup Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _counters(include_transitions: bool = True) -> dict[tuple[str, str], int]:
+    from app.core.database import SessionLocal
+    from app.models.daily_company_stat import DailyCompanyStat
+    from app.services.daily_stats_service import LEAD_STATUS_TRANSITIONS
+
+    with SessionLocal() as session:
+        rows = session.execute(
+            select(DailyCompanyStat.metric, DailyCompanyStat.dimension, DailyCompanyStat.value)
+        ).all()
+    return {
+        (metric, dimension): value
+        for metric, dimension, value in rows
+        if value and (include_transitions or metric != LEAD_STATUS_TRANSITIONS)
+    }
+
+
+def test_rollup_tracks_ingest_and_matches_rebuild(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_daily_stats.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    lead = client.post(
+        "/leads", json={"name": "Ana", "email": "ana@example.com"}, headers=headers
+    ).json()
+    client.post("/leads", json={"name": "Ben", "email": "ben@example.com"}, headers=headers)
+    for subject, body in (("Pricing question", "Urgent quote"), ("Invoice copy", "Thanks")):
+        client.post(
+            "/webhook/email",
+            json={"from_email": "ana@example.com", "subject": subject, "body": body},
+            headers=company_key,
+        )
+    client.patch(f"/leads/{lead['id']}/status", json={"status": "qualified"}, headers=headers)
+    email_id = client.get("/emails", headers=headers).json()[0]["id"]
+    client.post(f"/emails/{email_id}/generate-reply", headers=headers)
+
+    from app.tasks import rebuild_daily_stats_task, send_email_reply_task
+
+    thread = client.get(f"/emails/{email_id}", headers=headers).json()
+    send_email_reply_task.run(thread["email"]["replies"][0]["id"])
+
+    counters = _counters()
+    assert counters[("leads_created", "")] == 2
+    assert counters[("emails_by_category", "Lead")] == 1
+    assert counters[("emails_by_category", "Billing")] == 1
+    assert counters[("emails_by_priority", "high")] == 1
+    assert counters[("replies_by_status", "failed")] == 1
+    assert ("replies_by_status", "pending") not in counters
+    assert counters[("replies_by_origin", "ai")] == 1
+    assert counters[("lead_status_transitions", "new>contacted")] == 1
+    assert counters[("lead_status_transitions", "contacted>qualified")] == 1
+
+    summary = client.get("/dashboard/summary", headers=headers).json()
+    funnel = {item["status"]: item["count"] for item in summary["charts"]["lead_status_funnel"]}
+    assert funnel["new"] == 1 and funnel["qualified"] == 1 and funnel["contacted"] == 0
+    assert summary["kpis"]["total_leads"] == 2
+    assert summary["kpis"]["pending_actions"] == 2
+    assert summary["kpis"]["leads_generated_30d"] == 2
+    assert sum(point["count"] for point in summary["charts"]["lead_trend"]) == 2
+    overview = client.get("/analytics/overview", headers=headers).json()
+    assert overview["emails_processed"] == 2
+    assert overview["emails_auto_replied"] == 1
+
+    rebuild_daily_stats_task.run()
+    assert _counters(include_transitions=False) == {
+        key: value for key, value in counters.items() if key[0] != "lead_status_transitions"
+    }
+    assert client.get("/dashboard/summary", headers=headers).json() == summary
+    assert client.get("/analytics/overview", headers=headers).json() == overview
+
+
+def test_rebuild_waits_for_ingest_and_keeps_stored_classification(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_daily_stats_rebuild.db")
+    headers = _login_headers(client)
+    company_id = client.get("/companies/me", headers=headers).json()["id"]
+
+    from app.core.database import SessionLocal
+    from app.models.email_message import EmailMessage
+    from app.services.daily_stats_service import rebuild_company_stats, record_email_received
+
+    def email(subject: str, body: str, **stored: str) -> EmailMessage:
+        return EmailMessage(
+            company_id=company_id, from_email="x@example.com", subject=subject, body=body, **stored
+        )
+
+    with SessionLocal() as session:
+        # A stored (e.g. corrected) classification wins over what the text would give.
+        session.add(email("Invoice copy", "Thanks", category="Support", priority="low"))
+        session.add(email("Pricing question", "Urgent quote"))
+        session.commit()
+
+    ingest = SessionLocal()
+    pending = email("Refund", "Card charged twice", category="Billing", priority="medium")
+    ingest.add(pending)
+    ingest.flush()
+    record_email_received(ingest, pending)
+
+    def rebuild() -> None:
+        with SessionLocal() as session:
+            rebuild_company_stats(session, company_id)
+
+    worker = threading.Thread(target=rebuild)
+    worker.start()
+    time.sleep(0.3)
+    ingest.commit()
+    ingest.close()
+    worker.join(timeout=10)
+
+    counters = _counters(include_transitions=False)
+    assert {key: value for key, value in counters.items() if key[0] != "leads_created"} == {
+        ("emails_by_category", "Support"): 1,
+        ("emails_by_category", "Lead"): 1,
+        ("emails_by_category", "Billing"): 1,
+        ("emails_by_priority", "low"): 1,
+        ("emails_by_priority", "high"): 1,
+        ("emails_by_priority", "medium"): 1,
+    }
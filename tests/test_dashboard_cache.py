@@ -0,0 +1,133 @@
+import asyncio
+import importlib
+
+from fastapi.testclient import TestClient
+
+from app.schemas.dashboard import DashboardStats
+from app.services.dashboard_cache import cached_dashboard_response, invalidate_dashboard_cache
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Cache Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _stats(total_leads: int) -> DashboardStats:
+    return DashboardStats(total_leads=total_leads, leads_today=0, emails_today=0, replies_sent=0)
+
+
+def test_concurrent_misses_share_one_computation() -> None:
+    calls = 0
+
+    async def compute() -> DashboardStats:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _stats(calls)
+
+    async def scenario() -> list[DashboardStats]:
+        first = await asyncio.gather(
+            *(cached_dashboard_response(7, "stats", DashboardStats, compute) for _ in range(10))
+        )
+        cached = await cached_dashboard_response(7, "stats", DashboardStats, compute)
+        invalidate_dashboard_cache(7)
+        refreshed = await cached_dashboard_response(7, "stats", DashboardStats, compute)
+        return [*first, cached, refreshed]
+
+    responses = asyncio.run(scenario())
+
+    assert calls == 2
+    assert [response.total_leads for response in responses] == [1] * 11 + [2]
+
+
+def test_failed_computation_is_not_cached() -> None:
+    async def failing() -> DashboardStats:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+
+    async def healthy() -> DashboardStats:
+        return _stats(3)
+
+    async def scenario() -> tuple[list, DashboardStats]:
+        results = await asyncio.gather(
+            *(cached_dashboard_response(8, "stats", DashboardStats, failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+        return results, await cached_dashboard_response(8, "stats", DashboardStats, healthy)
+
+    results, recovered = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert recovered.total_leads == 3
+
+
+def test_dashboard_responses_are_invalidated_by_writes(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_dashboard_cache.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    client.post("/leads", json={"name": "Ana", "email": "ana@example.com"}, headers=headers)
+
+    assert client.get("/dashboard/stats", headers=headers).json()["total_leads"] == 1
+
+    from app.core.database import SessionLocal
+    from app.models.lead import Lead
+
+    with SessionLocal() as session:
+        company_id = session.query(Lead.company_id).scalar()
+        # A write that skips the service layer is only visible once the entry expires.
+        session.add(Lead(name="Raw", email="raw@example.com", company_id=company_id))
+        session.commit()
+    assert client.get("/dashboard/stats", headers=headers).json()["total_leads"] == 1
+
+    client.post("/leads", json={"name": "Ben", "email": "ben@example.com"}, headers=headers)
+    assert client.get("/dashboard/stats", headers=headers).json()["total_leads"] == 3
+
+    summary = client.get("/dashboard/summary", headers=headers).json()
+    client.post(
+        "/webhook/email",
+        json={"from_email": "ana@example.com", "subject": "Pricing", "body": "Quote please"},
+        headers=company_key,
+    )
+    refreshed = client.get("/dashboard/summary", headers=headers).json()
+    assert refreshed["kpis"]["emails_processed"] == summary["kpis"]["emails_processed"] + 1
+
+
+def test_zero_ttl_disables_the_cache(monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "dashboard_cache_ttl_seconds", 0.0)
+    calls = 0
+
+    async def compute() -> DashboardStats:
+        nonlocal calls
+        calls += 1
+        return _stats(calls)
+
+    async def scenario() -> None:
+        for _ in range(3):
+            await cached_dashboard_response(9, "stats", DashboardStats, compute)
+
+    asyncio.run(scenario())
+    assert calls == 3
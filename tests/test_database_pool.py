@@ -0,0 +1,20 @@
+from sqlalchemy import text
+
+from app.core.database import engine, pool_checkouts, pool_status
+from app.core.metrics import registry
+
+
+def test_sqlite_connections_use_wal_and_tuned_pragmas() -> None:
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_pool_checkouts_are_measured() -> None:
+    before = pool_checkouts.value(pool="primary")
+    with engine.connect():
+        assert pool_status()["primary"]["checked_out"] == 1
+    assert pool_checkouts.value(pool="primary") == before + 1
+    assert pool_status()["primary"]["checked_out"] == 0
+    assert 'db_pool_connections{pool="primary",state="size"}' in registry.render()
@@ -0,0 +1,155 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Batch Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_batch_webhook_ingests_array_in_one_insert(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_email_batch.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    lead = client.post(
+        "/leads", json={"name": "Ana", "email": "ana@example.com"}, headers=headers
+    ).json()
+
+    from app.core.database import engine
+
+    inserts: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        if statement.startswith("INSERT INTO email_messages"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.post(
+            "/webhook/email/batch",
+            json=[
+                {"from_email": "ana@example.com", "subject": "Pricing", "body": "Send pricing"},
+                {"from_email": "not-an-email", "subject": "Hi", "body": "Hello"},
+                {"from_email": "ana@example.com", "subject": "Again", "body": "Any news?"},
+                {"from_email": "new@example.com", "subject": "Hello", "body": "Question"},
+            ],
+            headers=company_key,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["rejected"]) == (3, 1)
+    assert [item["status"] for item in body["items"]] == [
+        "accepted",
+        "rejected",
+        "accepted",
+        "accepted",
+    ]
+    assert [item["lead_id"] for item in body["items"]] == [lead["id"], None, lead["id"], None]
+    assert body["items"][1]["errors"][0]["field"] == "from_email"
+    assert len(inserts) == 1
+
+    assert client.get(f"/leads/{lead['id']}", headers=headers).json()["status"] == "contacted"
+    stored = {email["id"] for email in client.get("/emails", headers=headers).json()}
+    assert stored == {item["email_id"] for item in body["items"] if item["email_id"]}
+
+
+def test_batch_webhook_accepts_ndjson_and_limits_size(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_email_batch.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    lines = [
+        json.dumps({"from_email": "one@example.com", "subject": "One", "body": "First"}),
+        "{not json",
+        "",
+        json.dumps({"from_email": "two@example.com", "subject": "Two", "body": "Second"}),
+    ]
+    response = client.post(
+        "/webhook/email/batch",
+        content="\n".join(lines).encode(),
+        headers={**company_key, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == ["accepted", "rejected", "accepted"]
+    assert items[1]["errors"][0]["type"] == "json_invalid"
+
+    not_a_list = client.post(
+        "/webhook/email/batch", json={"from_email": "one@example.com"}, headers=company_key
+    )
+    assert not_a_list.status_code == 400
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "webhook_email_batch_max_items", 1)
+    too_many = client.post("/webhook/email/batch", json=[{}, {}], headers=company_key)
+    assert too_many.status_code == 413
+    monkeypatch.setattr(settings, "webhook_email_batch_max_bytes", 16)
+    too_big = client.post(
+        "/webhook/email/batch", content=b"[" + b" " * 32 + b"]", headers=company_key
+    )
+    assert too_big.status_code == 413
+    unauthenticated = client.post("/webhook/email/batch", json=[], headers={})
+    assert unauthenticated.status_code == 401
+
+
+def test_ndjson_batch_stops_reading_once_too_many_items(monkeypatch) -> None:
+    from app.core.config import settings
+    from app.routes.public import _email_batch_items
+
+    monkeypatch.setattr(settings, "webhook_email_batch_max_items", 2)
+    monkeypatch.setattr(settings, "webhook_email_batch_max_bytes", 1024)
+    line = json.dumps({"from_email": "a@example.com", "subject": "S", "body": "B"}).encode()
+    chunks = [line + b"\n"] * 50
+    sent: list[bytes] = []
+
+    async def receive() -> dict:
+        sent.append(chunks[len(sent)])
+        return {"type": "http.request", "body": sent[-1], "more_body": len(sent) < len(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", b"application/x-ndjson")],
+    }
+    with pytest.raises(HTTPException) as too_many:
+        asyncio.run(_email_batch_items(Request(scope, receive)))
+    # The body is never read to the end (it would also exceed the byte limit).
+    assert too_many.value.status_code == 413 and len(sent) == 3
+
+    sent.clear()
+    monkeypatch.setattr(settings, "webhook_email_batch_max_items", 100)
+    with pytest.raises(HTTPException) as too_big:
+        asyncio.run(_email_batch_items(Request(scope, receive)))
+    assert too_big.value.status_code == 413 and "bytes" in too_big.value.detail
+    assert len(sent) < len(chunks)
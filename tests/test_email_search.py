@@ -0,0 +1,103 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient, email: str, company_name: str) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "StrongPassword1!", "company_name": company_name},
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": email, "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _receive(client: TestClient, headers: dict[str, str], sender: str, subject: str, body: str):
+    company_key = client.get("/companies/me", headers=headers).json()["api_key"]
+    return client.post(
+        "/webhook/email",
+        json={"from_email": sender, "subject": subject, "body": body},
+        headers={"X-Company-Key": company_key},
+    )
+
+
+def _subjects(client: TestClient, headers: dict[str, str], **params) -> list[str]:
+    response = client.get("/emails/search", params=params, headers=headers)
+    assert response.status_code == 200
+    return [email["subject"] for email in response.json()]
+
+
+def test_email_search_matches_text_and_filters(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_email_search.db")
+    headers = _login_headers(client, "owner@example.com", "Inbox Co")
+    other_headers = _login_headers(client, "other@example.com", "Other Co")
+    _receive(client, headers, "ana@acme.io", "Invoice overdue", "Please resend the invoice asap")
+    _receive(client, headers, "ben@globex.com", "Demo request", "Can we book a pricing demo?")
+    _receive(client, headers, "cara@acme.io", "Thanks", "All good here")
+    _receive(client, other_headers, "ana@acme.io", "Invoice copy", "Other company invoice")
+
+    assert _subjects(client, headers, q="invoice") == ["Invoice overdue"]
+    assert _subjects(client, headers, q="acme") == ["Thanks", "Invoice overdue"]
+    assert _subjects(client, headers, q="pric dem") == ["Demo request"]
+    assert _subjects(client, headers, category="Billing") == ["Invoice overdue"]
+    assert _subjects(client, headers, priority="high") == ["Invoice overdue"]
+    assert _subjects(client, headers, q="acme", category="Other") == ["Thanks"]
+
+    email = client.get("/emails/search", params={"q": "demo"}, headers=headers).json()[0]
+    assert email["category"] == "Lead" and email["priority"] == "low"
+    client.post(f"/emails/{email['id']}/generate-reply", headers=headers)
+    assert _subjects(client, headers, processed=True) == ["Demo request"]
+    assert _subjects(client, headers, processed=False, q="acme") == ["Thanks", "Invoice overdue"]
+
+    received_at = email["received_at"]
+    assert _subjects(client, headers, received_from=received_at) == ["Thanks", "Demo request"]
+    assert _subjects(client, headers, received_to=received_at) == ["Invoice overdue"]
+
+    response = client.get("/emails/search", params={"q": "acme", "limit": 1}, headers=headers)
+    assert response.headers["X-Total-Count"] == "2"
+    second = client.get(
+        "/emails/search",
+        params={"q": "acme", "limit": 1, "cursor": response.headers["X-Next-Cursor"]},
+        headers=headers,
+    )
+    assert [item["subject"] for item in second.json()] == ["Invoice overdue"]
+    assert client.get("/emails/search", params={"q": "??"}, headers=headers).status_code == 400
+
+
+def test_listed_emails_show_stored_classification(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_email_search_stored.db")
+    headers = _login_headers(client, "owner@example.com", "Stored Co")
+    response = _receive(client, headers, "ana@acme.io", "Invoice", "Please send it")
+    email_id = response.json()["email"]["id"]
+
+    from app.core.database import SessionLocal
+    from app.models.email_message import EmailMessage
+
+    with SessionLocal() as session:
+        # A stored value (e.g. a manual correction) is what filters use, so reads show it too.
+        stored = session.get(EmailMessage, email_id)
+        stored.category, stored.priority = "Support", "high"
+        session.commit()
+
+    for path in ("/emails", "/emails/search"):
+        email = client.get(path, headers=headers).json()[0]
+        assert (email["category"], email["priority"], email["confidence"]) == (
+            "Support",
+            "high",
+            88,
+        )
+    assert _subjects(client, headers, category="Support") == ["Invoice"]
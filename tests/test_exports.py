@@ -0,0 +1,109 @@
+import csv
+import gzip
+import importlib
+import io
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Export Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_exports_stream_filtered_csv_and_gzipped_ndjson(monkeypatch) -> None:
+    from app.services import exports
+
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    client = _create_client(monkeypatch, "./test_exports.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    for index in range(5):
+        client.post(
+            "/leads",
+            json={"name": f"Lead {index}", "email": f"lead{index}@example.com", "tags": ["a"]},
+            headers=headers,
+        )
+    email_ids = [
+        client.post(
+            "/webhook/email",
+            json={"from_email": f"lead{index}@example.com", "subject": f"S{index}", "body": "B"},
+            headers=company_key,
+        ).json()["email"]["id"]
+        for index in range(3)
+    ]
+
+    from app.core.database import SessionLocal
+    from app.models.email_reply import EmailReply
+    from app.models.lead import Lead
+
+    with SessionLocal() as session:
+        session.query(Lead).filter(Lead.email == "lead0@example.com").update(
+            {Lead.created_at: datetime(2020, 1, 1)}
+        )
+        for subject in ("First", "Second"):
+            session.add(
+                EmailReply(email_id=email_ids[1], company_id=1, subject=subject, body="Thanks")
+            )
+        session.commit()
+
+    leads = client.get("/exports/leads", params={"created_from": "2021-01-01"}, headers=headers)
+    assert leads.status_code == 200
+    assert leads.headers["content-type"].startswith("text/csv")
+    assert "attachment" in leads.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(leads.text)))
+    assert sorted(row["email"] for row in rows) == [
+        f"lead{index}@example.com" for index in (1, 2, 3, 4)
+    ]
+    assert rows[0]["tags"] == "a"
+
+    emails = client.get(
+        "/exports/emails", params={"format": "ndjson", "gzip": "true"}, headers=headers
+    )
+    assert emails.headers["content-type"] == "application/gzip"
+    records = [json.loads(line) for line in gzip.decompress(emails.content).splitlines()]
+    assert [record["id"] for record in records] == email_ids
+    assert [reply["subject"] for reply in records[1]["replies"]] == ["First", "Second"]
+    assert records[0]["replies"] == []
+
+    flat = list(csv.DictReader(io.StringIO(client.get("/exports/emails", headers=headers).text)))
+    assert [(row["id"], row["reply_subject"]) for row in flat] == [
+        (str(email_ids[0]), ""),
+        (str(email_ids[1]), "First"),
+        (str(email_ids[1]), "Second"),
+        (str(email_ids[2]), ""),
+    ]
+
+    activity = client.get("/exports/activity", params={"format": "ndjson"}, headers=headers)
+    entries = [json.loads(line) for line in activity.text.splitlines()]
+    assert {entry["entity_type"] for entry in entries} >= {"lead", "email"}
+    bad_range = client.get(
+        "/exports/leads",
+        params={"created_from": "2022-01-01", "created_to": "2021-01-01"},
+        headers=headers,
+    )
+    assert bad_range.status_code == 400
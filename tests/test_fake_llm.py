@@ -0,0 +1,52 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.devtools.fake_llm import FakeLLMConfig, FakeLLMServer
+from app.services.llm_service import LLMServiceError, request_ai_reply
+
+
+def test_request_ai_reply_uses_http_path(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "ai_api_key", "fake-key")
+    with FakeLLMServer(FakeLLMConfig(completion_tokens=12, seed=7)) as server:
+        monkeypatch.setattr(settings, "ai_base_url", server.base_url)
+
+        first = request_ai_reply("Hello")
+        second = request_ai_reply("Hello")
+
+    assert len(first.split()) == 12
+    assert first != second
+    with FakeLLMServer(FakeLLMConfig(completion_tokens=12, seed=7)) as server:
+        monkeypatch.setattr(settings, "ai_base_url", server.base_url)
+        assert request_ai_reply("Hello") == first
+
+
+def test_rate_limited_requests_raise(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "ai_api_key", "fake-key")
+    with FakeLLMServer(FakeLLMConfig(rate_limit_rate=1.0)) as server:
+        monkeypatch.setattr(settings, "ai_base_url", server.base_url)
+
+        with pytest.raises(LLMServiceError):
+            request_ai_reply("Hello")
+
+        assert server.stats["rate_limited"] == 1
+
+
+def test_streaming_completion_emits_chunks() -> None:
+    with FakeLLMServer(FakeLLMConfig(completion_tokens=9, stream_chunk_tokens=4)) as server:
+        chunks = []
+        with httpx.stream(
+            "POST",
+            f"{server.base_url}/chat/completions",
+            json={"model": "fake", "stream": True, "messages": [{"role": "user", "content": "Hi"}]},
+        ) as response:
+            for line in response.iter_lines():
+                if line.startswith("data: ") and line != "data: [DONE]":
+                    chunks.append(json.loads(line[len("data: ") :]))
+
+    content = "".join(chunk["choices"][0]["delta"].get("content", "") for chunk in chunks)
+    assert len(chunks) == 4
+    assert len(content.split()) == 9
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
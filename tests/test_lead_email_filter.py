@@ -0,0 +1,104 @@
+import importlib
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _company_key(client: TestClient, email: str, company_name: str) -> str:
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "StrongPassword1!", "company_name": company_name},
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": email, "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    return client.get("/companies/me", headers=headers).json()["api_key"]
+
+
+def _receive(client: TestClient, api_key: str, from_email: str) -> dict:
+    response = client.post(
+        "/webhook/email",
+        headers={"X-Company-Key": api_key},
+        json={"from_email": from_email, "subject": "Hello", "body": "Question"},
+    )
+    assert response.status_code == 200
+    return response.json()["email"]
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    from app.services.lead_email_filter import BloomFilter
+
+    bloom = BloomFilter(1000)
+    emails = [f"lead{index}@example.com" for index in range(1000)]
+    for email in emails:
+        bloom.add(email)
+
+    assert all(email in bloom for email in emails)
+    false_positives = sum(f"other{index}@example.com" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+def test_inbound_email_matches_only_company_leads(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_lead_email_filter.db")
+    first_key = _company_key(client, "first@example.com", "First Co")
+    second_key = _company_key(client, "second@example.com", "Second Co")
+    created = client.post(
+        "/public/lead",
+        json={"name": "Known", "email": "known@example.com"},
+        headers={"X-Company-Key": first_key},
+    )
+    assert created.status_code == 201
+
+    lead_id = created.json()["lead"]["id"]
+    assert _receive(client, first_key, "known@example.com")["lead_id"] == lead_id
+    assert _receive(client, second_key, "known@example.com")["lead_id"] is None
+
+    from app.core.database import engine
+
+    lead_queries: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        if "FROM leads" in statement:
+            lead_queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        assert _receive(client, first_key, "stranger@example.com")["lead_id"] is None
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    assert lead_queries == []
+
+
+def test_filter_catches_up_with_leads_created_elsewhere(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_lead_email_filter.db")
+    api_key = _company_key(client, "owner@example.com", "Catch Up Co")
+    assert _receive(client, api_key, "late@example.com")["lead_id"] is None
+
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.models.company import Company
+    from app.models.lead import Lead
+
+    # Another worker's insert never touches this process's filter.
+    with SessionLocal() as session:
+        company_id = session.query(Company.id).scalar()
+        lead = Lead(name="Late", email="late@example.com", company_id=company_id)
+        session.add(lead)
+        session.commit()
+        lead_id = lead.id
+
+    monkeypatch.setattr(settings, "lead_email_filter_sync_seconds", 0.0)
+    assert _receive(client, api_key, "late@example.com")["lead_id"] == lead_id
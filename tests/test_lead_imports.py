@@ -0,0 +1,135 @@
+import importlib
+import json
+
+from fastapi.testclient import TestClient
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Import Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _configure(monkeypatch, tmp_path) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "lead_import_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "lead_import_chunk_size", 2)
+
+
+def test_csv_import_dedupes_reports_errors_and_indexes_leads(monkeypatch, tmp_path) -> None:
+    _configure(monkeypatch, tmp_path)
+    client = _create_client(monkeypatch, "./test_lead_imports.db")
+    headers = _login_headers(client)
+    client.post("/leads", json={"name": "Old", "email": "old@example.com"}, headers=headers)
+    content = (
+        "\ufeffName,Email,Phone,Tags\n"
+        "Ana,ana@example.com,,\"VIP, hot\"\n"
+        "Ana again,ana@example.com,,\n"
+        "Bad,not-an-email,,\n"
+        "Old,old@example.com,,\n"
+        '"Bo, Jr.",bo@example.com,"+1 555",vip\n'
+    ).encode()
+
+    response = client.post(
+        "/leads/imports", files={"file": ("leads.csv", content, "text/csv")}, headers=headers
+    )
+    assert response.status_code == 202
+    lead_import = client.get(f"/leads/imports/{response.json()['id']}", headers=headers).json()
+    assert lead_import["status"] == "completed"
+    assert lead_import["progress"] == 1.0
+    assert (
+        lead_import["rows_processed"],
+        lead_import["created_count"],
+        lead_import["duplicate_count"],
+        lead_import["error_count"],
+    ) == (5, 2, 2, 1)
+
+    errors = client.get(f"/leads/imports/{lead_import['id']}/errors", headers=headers)
+    lines = [json.loads(line) for line in errors.text.splitlines()]
+    assert [line["row"] for line in lines] == [3]
+    assert lines[0]["errors"][0]["field"] == "email"
+
+    tagged = client.get("/leads", params={"tag": "vip"}, headers=headers).json()
+    assert sorted(lead["name"] for lead in tagged) == ["Ana", "Bo, Jr."]
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    email = client.post(
+        "/webhook/email",
+        json={"from_email": "bo@example.com", "subject": "Hi", "body": "Hello"},
+        headers=company_key,
+    ).json()["email"]
+    assert email["lead_id"] is not None
+
+
+def test_failed_ndjson_import_resumes_after_last_chunk(monkeypatch, tmp_path) -> None:
+    _configure(monkeypatch, tmp_path)
+    client = _create_client(monkeypatch, "./test_lead_imports.db")
+    headers = _login_headers(client)
+    rows = [
+        json.dumps({"name": f"Lead {index}", "email": f"lead{index}@example.com"})
+        for index in range(5)
+    ]
+    rows.insert(1, "{not json")
+    content = ("\n".join(rows) + "\n").encode()
+
+    from app.services import lead_import as lead_import_service
+
+    create_leads_bulk = lead_import_service.create_leads_bulk
+    calls = []
+
+    def _fail_second_chunk(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("worker lost")
+        return create_leads_bulk(*args, **kwargs)
+
+    monkeypatch.setattr(lead_import_service, "create_leads_bulk", _fail_second_chunk)
+    response = client.post(
+        "/leads/imports",
+        files={"file": ("leads.jsonl", content, "application/x-ndjson")},
+        headers=headers,
+    )
+    failed = client.get(f"/leads/imports/{response.json()['id']}", headers=headers).json()
+    assert failed["status"] == "failed"
+    assert failed["error_message"] == "worker lost"
+    assert (failed["rows_processed"], failed["created_count"], failed["error_count"]) == (2, 1, 1)
+
+    resumed = client.post(f"/leads/imports/{failed['id']}/resume", headers=headers)
+    assert resumed.status_code == 202
+    done = client.get(f"/leads/imports/{failed['id']}", headers=headers).json()
+    assert done["status"] == "completed"
+    assert (done["rows_processed"], done["created_count"], done["error_count"]) == (6, 5, 1)
+    errors = client.get(f"/leads/imports/{failed['id']}/errors", headers=headers).text
+    assert [json.loads(line)["row"] for line in errors.splitlines()] == [2]
+
+    emails = [lead["email"] for lead in client.get("/leads", headers=headers).json()]
+    assert sorted(emails) == [f"lead{index}@example.com" for index in range(5)]
+    again = client.post(f"/leads/imports/{failed['id']}/resume", headers=headers)
+    assert again.status_code == 409
+    unknown = client.post(
+        "/leads/imports",
+        files={"file": ("leads.xlsx", b"x", "application/octet-stream")},
+        headers=headers,
+    )
+    assert unknown.status_code == 400
@@ -0,0 +1,99 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient, email: str, company_name: str) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "StrongPassword1!", "company_name": company_name},
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": email, "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _search(client: TestClient, headers: dict[str, str], **params) -> list[str]:
+    response = client.get("/leads/search", params=params, headers=headers)
+    assert response.status_code == 200
+    return [lead["name"] for lead in response.json()]
+
+
+def test_search_ranks_matches_and_tracks_updates(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_lead_search.db")
+    headers = _login_headers(client, "owner@example.com", "Search Co")
+    other_headers = _login_headers(client, "other@example.com", "Other Co")
+    client.post(
+        "/leads",
+        json={"name": "Pricing Partner", "email": "partner@acme.io", "tags": ["pricing"]},
+        headers=headers,
+    )
+    mention = client.post(
+        "/leads",
+        json={"name": "Dana", "email": "dana@globex.com", "message": "Asked about pricing"},
+        headers=headers,
+    ).json()
+    client.post(
+        "/leads",
+        json={"name": "Eve", "email": "eve@initech.com", "phone": "+1 555 0100"},
+        headers=headers,
+    )
+    client.post(
+        "/leads",
+        json={"name": "Pricing Rival", "email": "rival@other.io", "message": "pricing"},
+        headers=other_headers,
+    )
+
+    # Name and tag hits outrank a message mention; other companies never leak in.
+    assert _search(client, headers, q="pric") == ["Pricing Partner", "Dana"]
+    assert _search(client, headers, q="acme") == ["Pricing Partner"]
+    assert _search(client, headers, q="dana@globex.com") == ["Dana"]
+    assert _search(client, headers, q="555") == ["Eve"]
+    assert _search(client, headers, q="pricing globex") == ["Dana"]
+
+    client.put(f"/leads/{mention['id']}", json={"message": "Wants a demo"}, headers=headers)
+    assert _search(client, headers, q="pricing") == ["Pricing Partner"]
+    assert _search(client, headers, q="demo") == ["Dana"]
+
+    assert client.get("/leads/search", params={"q": "!!"}, headers=headers).status_code == 400
+    assert (
+        client.get("/leads/search", params={"q": "x", "cursor": "bad"}, headers=headers).status_code
+        == 400
+    )
+
+
+def test_search_pages_with_score_cursor(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_lead_search.db")
+    headers = _login_headers(client, "owner@example.com", "Search Co")
+    for index in range(5):
+        client.post(
+            "/leads",
+            json={"name": f"Lead {index}", "email": f"lead{index}@example.com", "tags": ["vip"]},
+            headers=headers,
+        )
+
+    seen: list[str] = []
+    params = {"q": "vip", "limit": 2}
+    while True:
+        response = client.get("/leads/search", params=params, headers=headers)
+        seen.extend(lead["name"] for lead in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    # Equal scores fall back to newest id first.
+    assert seen == [f"Lead {index}" for index in reversed(range(5))]
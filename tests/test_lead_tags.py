@@ -0,0 +1,76 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient, email: str, company_name: str) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "StrongPassword1!", "company_name": company_name},
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": email, "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _names(client: TestClient, headers: dict[str, str], **params) -> list[str]:
+    response = client.get("/leads", params=params, headers=headers)
+    assert response.status_code == 200
+    return [lead["name"] for lead in response.json()]
+
+
+def test_tags_are_indexed_filtered_and_counted(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_lead_tags.db")
+    headers = _login_headers(client, "owner@example.com", "Tag Co")
+    other_headers = _login_headers(client, "other@example.com", "Other Co")
+    ana = client.post(
+        "/leads",
+        json={"name": "Ana", "email": "ana@example.com", "tags": ["VIP", "hot", "vip "]},
+        headers=headers,
+    ).json()
+    client.post(
+        "/leads", json={"name": "Ben", "email": "ben@example.com", "tags": ["vip"]}, headers=headers
+    )
+    client.post("/leads", json={"name": "Cy", "email": "cy@example.com"}, headers=headers)
+    client.post(
+        "/leads",
+        json={"name": "Rival", "email": "rival@example.com", "tags": ["vip"]},
+        headers=other_headers,
+    )
+
+    assert ana["tags"] == ["VIP", "hot", "vip"]
+    assert _names(client, headers, tag="Vip") == ["Ben", "Ana"]
+    assert _names(client, headers, tag="hot") == ["Ana"]
+    assert _names(client, headers, tag="cold") == []
+    counts = client.get("/leads/tags", headers=headers).json()
+    assert counts == [{"tag": "vip", "count": 2}, {"tag": "hot", "count": 1}]
+
+    page = client.get("/leads", params={"tag": "vip", "limit": 1}, headers=headers)
+    cursor = page.headers["X-Next-Cursor"]
+    assert _names(client, headers, tag="vip", limit=1, cursor=cursor) == ["Ana"]
+
+    client.put(f"/leads/{ana['id']}", json={"tags": ["cold"]}, headers=headers)
+    assert _names(client, headers, tag="vip") == ["Ben"]
+    assert _names(client, headers, tag="cold") == ["Ana"]
+    client.put(f"/leads/{ana['id']}", json={"status": "qualified"}, headers=headers)
+    assert _names(client, headers, tag="cold") == ["Ana"]
+    client.put(f"/leads/{ana['id']}", json={"tags": []}, headers=headers)
+    assert client.get("/leads/tags", headers=headers).json() == [{"tag": "vip", "count": 1}]
+
+    first = client.get("/leads", params={"tag": "vip", "limit": 1}, headers=other_headers)
+    assert first.headers["X-Total-Count"] == "1"
+    assert [lead["name"] for lead in first.json()] == ["Rival"]
+    assert "X-Next-Cursor" not in first.headers
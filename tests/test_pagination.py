@@ -0,0 +1,80 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Paging Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _collect(client: TestClient, path: str, headers: dict[str, str]) -> list[list[int]]:
+    pages = []
+    params = {"limit": 2}
+    while True:
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+        params = {"limit": 2, "cursor": cursor}
+
+
+def test_keyset_pages_cover_every_row_once(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_pagination.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    lead_ids = [
+        client.post(
+            "/leads", json={"name": f"Lead {i}", "email": "same@example.com"}, headers=headers
+        ).json()["id"]
+        for i in range(5)
+    ]
+    for i in range(3):
+        client.post(
+            "/webhook/email",
+            json={"from_email": "same@example.com", "subject": f"Hi {i}", "body": "Hello"},
+            headers=company_key,
+        )
+
+    lead_pages = _collect(client, "/leads", headers)
+    assert [len(page) for page in lead_pages] == [2, 2, 1]
+    assert [lead_id for page in lead_pages for lead_id in page] == sorted(lead_ids, reverse=True)
+
+    email_pages = _collect(client, "/emails", headers)
+    assert [len(page) for page in email_pages] == [2, 1]
+    lead_email_pages = _collect(client, f"/leads/{lead_ids[0]}/emails", headers)
+    assert sum(email_pages, []) == sum(lead_email_pages, [])
+
+    counted = client.get("/leads", params={"limit": 2}, headers=headers)
+    assert counted.headers["X-Total-Count"] == "5"
+    uncounted = client.get("/leads", params={"limit": 2, "include_total": False}, headers=headers)
+    assert "X-Total-Count" not in uncounted.headers
+
+    assert client.get("/templates", headers=headers).json() == []
+    assert client.get("/integrations/email/status", headers=headers).headers["X-Total-Count"] == "0"
+    invalid = client.get("/leads", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert invalid.status_code == 400
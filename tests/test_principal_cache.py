@@ -0,0 +1,82 @@
+import importlib
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient, email: str) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": "StrongPassword1!", "company_name": "Acme"},
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": email, "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+class _UserQueries:
+    def __init__(self) -> None:
+        from app.core.database import async_engine, engine
+
+        self.engines = [engine, async_engine.sync_engine]
+        self.count = 0
+
+    def _record(self, _conn, _cursor, statement, *_args) -> None:
+        if "FROM users" in statement:
+            self.count += 1
+
+    def __enter__(self) -> "_UserQueries":
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+
+
+def test_principals_are_cached_until_the_user_changes(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_principal_cache.db")
+    admin_headers = _login_headers(client, "admin@example.com")
+    operator_headers = _login_headers(client, "operator@example.com")
+
+    assert client.get("/companies/me", headers=operator_headers).status_code == 403
+    with _UserQueries() as queries:
+        for _ in range(3):
+            assert client.get("/leads", headers=operator_headers).status_code == 200
+            assert client.get("/dashboard/stats", headers=operator_headers).status_code == 200
+    assert queries.count == 0
+
+    from app.core.database import SessionLocal
+    from app.models.user import User
+
+    with SessionLocal() as session:
+        operator_id = session.query(User.id).filter(User.email == "operator@example.com").scalar()
+    client.patch(f"/users/{operator_id}/role", json={"role": "admin"}, headers=admin_headers)
+    assert client.get("/companies/me", headers=operator_headers).status_code == 200
+
+    client.put(
+        "/users/me/password", json={"password": "NewStrongPassword2!"}, headers=operator_headers
+    )
+    with _UserQueries() as queries:
+        client.get("/leads", headers=operator_headers)
+        client.get("/leads", headers=operator_headers)
+    assert queries.count == 1
+
+    with SessionLocal() as session:
+        session.delete(session.get(User, operator_id))
+        session.commit()
+    assert client.get("/leads", headers=operator_headers).status_code == 401
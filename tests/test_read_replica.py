@@ -0,0 +1,76 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.read_replica import ReadReplicaRouter
+
+
+def _router(max_lag_seconds: float = 5.0, check_interval_seconds: float = 60.0):
+    primary_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    replica_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    router = ReadReplicaRouter(
+        async_sessionmaker(primary_engine),
+        replica_engine,
+        max_lag_seconds=max_lag_seconds,
+        check_interval_seconds=check_interval_seconds,
+    )
+    return router, primary_engine, replica_engine
+
+
+async def _bound_engine(router: ReadReplicaRouter):
+    session = await router.session()
+    try:
+        return session.bind
+    finally:
+        await session.close()
+
+
+def test_fresh_replica_serves_reads() -> None:
+    router, _, replica_engine = _router()
+
+    assert asyncio.run(_bound_engine(router)) is replica_engine
+
+
+def test_lagging_or_failing_replica_falls_back_to_primary(monkeypatch) -> None:
+    router, primary_engine, _ = _router(check_interval_seconds=0.0)
+
+    async def lagging() -> float:
+        return 30.0
+
+    monkeypatch.setattr(router, "measure_lag", lagging)
+    assert asyncio.run(_bound_engine(router)) is primary_engine
+
+    async def unreachable() -> float:
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(router, "measure_lag", unreachable)
+    assert asyncio.run(_bound_engine(router)) is primary_engine
+
+
+def test_lag_checks_are_rate_limited(monkeypatch) -> None:
+    router, _, replica_engine = _router(check_interval_seconds=60.0)
+    calls = []
+
+    async def measure() -> float:
+        calls.append(1)
+        return 0.0
+
+    monkeypatch.setattr(router, "measure_lag", measure)
+
+    async def read_twice():
+        return [await _bound_engine(router), await _bound_engine(router)]
+
+    assert asyncio.run(read_twice()) == [replica_engine, replica_engine]
+    assert len(calls) == 1
+
+
+def test_without_replica_reads_use_primary() -> None:
+    primary_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    router = ReadReplicaRouter(
+        async_sessionmaker(primary_engine),
+        None,
+        max_lag_seconds=5.0,
+        check_interval_seconds=10.0,
+    )
+
+    assert asyncio.run(_bound_engine(router)) is primary_engine
@@ -0,0 +1,155 @@
+import importlib
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.template_cache import SafeDict, _compile_format, _render
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Template Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "Hi {name}, thanks for {message}",
+        "{name!r:>12} / {missing}",
+        "No fields at all {{literal}}",
+        "{count:05d} items",
+    ],
+)
+def test_compiled_render_matches_format_map(source: str) -> None:
+    context = SafeDict(name="Sam", message="writing", count=7)
+
+    assert _render(source, _compile_format(source), context) == source.format_map(context)
+
+
+def test_positional_fields_keep_format_map_errors() -> None:
+    assert _compile_format("Hello {}") is None
+    with pytest.raises(ValueError):
+        _render("Hello {}", None, SafeDict())
+
+
+def test_public_lead_sees_template_changes(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_template_cache.db")
+    headers = _login_headers(client)
+    api_key = client.get("/companies/me", headers=headers).json()["api_key"]
+    lead = {"name": "Ana", "email": "ana@example.com"}
+
+    created = client.post(
+        "/templates",
+        json={
+            "trigger_type": "lead",
+            "subject_template": "Welcome {name}",
+            "body_template": "We will email {email}",
+        },
+        headers=headers,
+    )
+    first = client.post("/public/lead", json=lead, headers={"X-Company-Key": api_key})
+    assert first.json()["auto_reply"]["subject"] == "Welcome Ana"
+
+    client.put(
+        f"/templates/{created.json()['id']}",
+        json={"subject_template": "Hello again {name}"},
+        headers=headers,
+    )
+    second = client.post("/public/lead", json=lead, headers={"X-Company-Key": api_key})
+    assert second.json()["auto_reply"]["subject"] == "Hello again Ana"
+
+    client.delete(f"/templates/{created.json()['id']}", headers=headers)
+    third = client.post("/public/lead", json=lead, headers={"X-Company-Key": api_key})
+    assert third.json()["auto_reply"] is None
+
+
+def test_bulk_render_streams_ndjson(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_template_render.db")
+    headers = _login_headers(client)
+    template = client.post(
+        "/templates",
+        json={
+            "trigger_type": "campaign",
+            "subject_template": "Offer for {name}",
+            "body_template": "Hi {name}, status {status}",
+        },
+        headers=headers,
+    ).json()
+    lead_ids = []
+    for name in ("Ana", "Ben", "Cy"):
+        lead = client.post(
+            "/leads", json={"name": name, "email": f"{name.lower()}@example.com"}, headers=headers
+        ).json()
+        lead_ids.append(lead["id"])
+    client.patch(f"/leads/{lead_ids[1]}/status", json={"status": "qualified"}, headers=headers)
+
+    by_ids = client.post(
+        f"/templates/{template['id']}/render",
+        json={"lead_ids": [lead_ids[0], lead_ids[2], 999999]},
+        headers=headers,
+    )
+    rows = [json.loads(line) for line in by_ids.text.splitlines()]
+    assert by_ids.headers["content-type"].startswith("application/x-ndjson")
+    assert [row["subject"] for row in rows] == ["Offer for Ana", "Offer for Cy"]
+
+    by_filter = client.post(
+        f"/templates/{template['id']}/render",
+        json={"filter": {"status": "qualified"}},
+        headers=headers,
+    )
+    rows = [json.loads(line) for line in by_filter.text.splitlines()]
+    assert rows == [
+        {
+            "lead_id": lead_ids[1],
+            "email": "ben@example.com",
+            "subject": "Offer for Ben",
+            "body": "Hi Ben, status qualified",
+        }
+    ]
+
+    invalid = client.post(f"/templates/{template['id']}/render", json={}, headers=headers)
+    assert invalid.status_code == 422
+
+
+def test_worker_requires_shared_cache_outside_development(monkeypatch, caplog) -> None:
+    from app.core.config import settings
+    from app.tasks import _check_cache_backend
+
+    monkeypatch.setattr(settings, "celery_task_always_eager", False)
+    monkeypatch.setattr(settings, "cache_backend", "memory")
+    monkeypatch.setattr(settings, "environment", "production")
+    # Template edits made by the API would never invalidate this worker's cache.
+    with pytest.raises(SystemExit):
+        _check_cache_backend()
+
+    monkeypatch.setattr(settings, "environment", "development")
+    with caplog.at_level("WARNING", logger="app.tasks"):
+        _check_cache_backend()
+    assert "worker.cache.process_local" in caplog.messages
+
+    monkeypatch.setattr(settings, "environment", "production")
+    monkeypatch.setattr(settings, "cache_backend", "redis")
+    _check_cache_backend()
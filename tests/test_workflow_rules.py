@@ -0,0 +1,169 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.devtools.fake_llm import FakeLLMConfig, FakeLLMServer
+from app.schemas.workflow_rule import WorkflowActions, WorkflowConditions
+from app.services.workflow_engine import RuleSpec, build_email_facts, compile_rules
+
+
+def _create_client(monkeypatch, db_path: str) -> TestClient:
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("SECRET_KEY", "test-secret")
+
+    from app import main
+
+    importlib.reload(main)
+    return TestClient(main.app)
+
+
+def _login_headers(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/auth/register",
+        json={
+            "email": "owner@example.com",
+            "password": "StrongPassword1!",
+            "company_name": "Workflow Co",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        data={"username": "owner@example.com", "password": "StrongPassword1!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def _rule(rule_id: int, priority: int = 100, stop: bool = False, **fields) -> RuleSpec:
+    actions = fields.pop("actions", {})
+    return RuleSpec(
+        id=rule_id,
+        name=f"rule-{rule_id}",
+        priority=priority,
+        stop_processing=stop,
+        conditions=WorkflowConditions(**fields),
+        actions=WorkflowActions(**actions),
+    )
+
+
+def test_compiled_rules_merge_by_priority() -> None:
+    ruleset = compile_rules(
+        [
+            _rule(1, priority=50, categories=["Billing"], actions={"tags": ["billing"]}),
+            _rule(
+                2,
+                priority=10,
+                sender_domains=["acme.com"],
+                keywords=["refund", "charged twice"],
+                actions={"delivery": "hold_for_approval", "route_to": "finance"},
+            ),
+            _rule(3, priority=90, lead_statuses=["none"], actions={"skip_ai": True}),
+            _rule(4, priority=20, stop=True, priorities=["high"], actions={"tags": ["urgent"]}),
+        ]
+    )
+
+    facts = build_email_facts(
+        from_email="ann@eu.acme.com",
+        subject="Invoice question",
+        body="I was charged twice this month",
+        lead_status="qualified",
+    )
+    decision = ruleset.evaluate(facts)
+    assert decision.matched_rules == (2, 1)
+    assert decision.auto_send is False
+    assert decision.route_to == "finance"
+    assert decision.tags == ("billing",)
+    assert decision.skip_ai is False
+
+    urgent = build_email_facts(
+        from_email="bob@other.io", subject="URGENT outage", body="", lead_status=None
+    )
+    assert ruleset.evaluate(urgent).matched_rules == (4,)
+
+    other = build_email_facts(
+        from_email="bob@other.io", subject="Hello", body="Just saying hi", lead_status="new"
+    )
+    assert ruleset.evaluate(other).matched_rules == ()
+
+
+def test_webhook_applies_rules_and_dry_run(monkeypatch) -> None:
+    client = _create_client(monkeypatch, "./test_workflow_rules.db")
+    headers = _login_headers(client)
+    company_key = {"X-Company-Key": client.get("/companies/me", headers=headers).json()["api_key"]}
+    lead = client.post(
+        "/leads", json={"name": "Ana", "email": "ana@vip.example.com"}, headers=headers
+    ).json()
+    client.post(
+        "/templates",
+        json={"trigger_type": "email", "subject_template": "Re: {subject}", "body_template": "Hi"},
+        headers=headers,
+    )
+    for rule in (
+        {
+            "name": "VIP pricing",
+            "conditions": {"sender_domains": ["example.com"], "keywords": ["pricing"]},
+            "actions": {"skip_ai": True, "tags": ["vip"], "route_to": "sales"},
+        },
+        {
+            "name": "Hold unknown senders",
+            "conditions": {"lead_statuses": ["none"]},
+            "actions": {"delivery": "hold_for_approval"},
+        },
+    ):
+        assert client.post("/workflows/rules", json=rule, headers=headers).status_code == 201
+
+    monkeypatch.setattr(settings, "ai_api_key", "fake-key")
+    with FakeLLMServer(FakeLLMConfig(completion_tokens=5)) as server:
+        monkeypatch.setattr(settings, "ai_base_url", server.base_url)
+        vip = client.post(
+            "/webhook/email",
+            json={"from_email": lead["email"], "subject": "Pricing", "body": "Send pricing"},
+            headers=company_key,
+        ).json()["email"]
+        stranger = client.post(
+            "/webhook/email",
+            json={"from_email": "stranger@else.com", "subject": "Hi", "body": "Hello"},
+            headers=company_key,
+        ).json()["email"]
+
+    assert vip["routed_to"] == "sales" and stranger["routed_to"] is None
+    routed = client.get("/emails/search", params={"routed_to": "sales"}, headers=headers).json()
+    assert [item["id"] for item in routed] == [vip["id"]]
+    assert client.get(f"/leads/{lead['id']}", headers=headers).json()["tags"] == ["vip"]
+    tagged = client.get("/leads", params={"tag": "vip"}, headers=headers).json()
+    assert [item["id"] for item in tagged] == [lead["id"]]
+    assert client.get(f"/emails/{vip['id']}", headers=headers).json()["email"]["replies"] == []
+    replies = client.get(f"/emails/{stranger['id']}", headers=headers).json()["email"]["replies"]
+    assert [reply["send_status"] for reply in replies] == ["pending"]
+
+    stored = client.post("/workflows/rules/dry-run", json={}, headers=headers).json()
+    assert stored["evaluated"] == 2
+    assert stored["matched"] == 2
+    assert stored["action_counts"] == {
+        "hold_for_approval": 1,
+        "skip_ai": 1,
+        "tagged": 1,
+        "routed": 1,
+    }
+
+    draft = client.post(
+        "/workflows/rules/dry-run",
+        json={
+            "rules": [
+                {"name": "Everything urgent", "conditions": {"keywords": ["urgent"]}},
+                {"name": "Greetings", "conditions": {"keywords": ["hello"]}},
+            ]
+        },
+        headers=headers,
+    ).json()
+    matched = {result["from_email"]: result["matched_rules"] for result in draft["results"]}
+    assert matched == {"stranger@else.com": [2], lead["email"]: []}
+
+    # A keyword without letters or digits could never match, so it is rejected up front.
+    invalid = client.post(
+        "/workflows/rules",
+        json={"name": "Money", "conditions": {"keywords": ["refund", "$$$"]}},
+        headers=headers,
+    )
+    assert invalid.status_code == 422